@@ -0,0 +1,90 @@
+"""Shared pipeline stage counts for the funnel/pipeline analytics endpoints.
+
+All stage counts come from one conditional-aggregate scan of Application
+and are cached per tenant. Cache keys embed a per-tenant version number
+that is bumped once a transaction saving or deleting an application
+commits, so stale entries are never read and simply expire. A version
+key that is missing (never set, or evicted) is seeded with a fresh
+timestamp rather than 1, so an old ``v1`` entry can never be read again.
+
+The cache alias is settings.ANALYTICS_CACHE (locmem by default, Redis
+when CACHE_URL is set).
+"""
+from __future__ import annotations
+
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Q
+
+STAGES = ['NEW', 'SCREENING', 'INTERVIEW', 'OFFER', 'HIRED', 'REJECTED']
+
+CACHE_TIMEOUT = 300  # seconds; versioning handles freshness, this only bounds memory
+
+
+def _cache():
+    return caches[getattr(settings, 'ANALYTICS_CACHE', 'default')]
+
+
+def _tenant_key(company_id: int | None) -> str:
+    return 'all' if company_id is None else str(company_id)
+
+
+def _version_key(company_id: int | None) -> str:
+    return f'analytics:stage-counts:version:{_tenant_key(company_id)}'
+
+
+def _counts_key(company_id: int | None, version: int) -> str:
+    return f'analytics:stage-counts:{_tenant_key(company_id)}:v{version}'
+
+
+def _new_version() -> int:
+    # Never repeats a version an evicted key may have had
+    return time.time_ns()
+
+
+def invalidate(company_id: int | None) -> None:
+    """Bump the cache version for a tenant and for the cross-tenant view."""
+    cache = _cache()
+    for key in {_version_key(company_id), _version_key(None)}:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # No version (never set or evicted): start from a fresh one.
+            cache.add(key, _new_version(), timeout=None)
+
+
+def invalidate_on_commit(company_id: int | None) -> None:
+    """invalidate() once the current transaction commits.
+
+    Bumping earlier would let a concurrent reader cache the pre-commit
+    counts under the new version.
+    """
+    transaction.on_commit(partial(invalidate, company_id))
+
+
+def compute_stage_counts(company_id: int | None = None) -> dict[str, int]:
+    """Count applications per stage plus the total in a single query."""
+    from pipeline.models import Application
+
+    queryset = Application.objects.all()
+    if company_id is not None:
+        queryset = queryset.filter(job__company_id=company_id)
+    aggregates = {stage: Count('pk', filter=Q(stage=stage)) for stage in STAGES}
+    return queryset.aggregate(**aggregates, total=Count('pk'))
+
+
+def stage_counts(company=None) -> dict[str, int]:
+    """Cached per-stage application counts for ``company`` (None = all tenants)."""
+    company_id = company.pk if company is not None else None
+    cache = _cache()
+    version = cache.get_or_set(_version_key(company_id), _new_version, timeout=None)
+    key = _counts_key(company_id, version)
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute_stage_counts(company_id)
+        cache.set(key, counts, CACHE_TIMEOUT)
+    return counts
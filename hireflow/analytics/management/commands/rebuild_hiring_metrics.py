@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute HiringMetric and RecruitmentFunnel rollups from applications and stage history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=5000,
+            help='Number of source rows aggregated per query (default: 5000).',
+        )
+
+    def handle(self, *args, **options):
+        stats = rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt hiring metrics from {stats['applications']} applications "
+            f"and {stats['transitions']} stage transitions."
+        ))
@@ -0,0 +1,50 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('jobs', '0002_job_company'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HiringMetric',
+            fields=[
+                ('date', models.DateField()),
+                ('applications_count', models.IntegerField(default=0)),
+                ('screening_count', models.IntegerField(default=0)),
+                ('interview_count', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+                ('hire_count', models.IntegerField(default=0)),
+                ('rejection_count', models.IntegerField(default=0)),
+                ('pk', models.CompositePrimaryKey('job', 'date', blank=True, editable=False,
+                    primary_key=True, serialize=False)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                    related_name='metrics', to='jobs.Job')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RecruitmentFunnel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('applications_received', models.IntegerField(default=0)),
+                ('screened', models.IntegerField(default=0)),
+                ('interviewed', models.IntegerField(default=0)),
+                ('offered', models.IntegerField(default=0)),
+                ('hired', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('recruiter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE,
+                    related_name='funnel_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('recruiter', 'week_start')},
+            },
+        ),
+    ]
@@ -8,10 +8,23 @@ from __future__ import annotations
 from django.db import models
 from django.conf import settings
 
+from tenants.managers import TenantQuerySet
+
+
+class HiringMetricQuerySet(TenantQuerySet):
+    tenant_lookup = 'job__company'
+
+
+class RecruitmentFunnelQuerySet(TenantQuerySet):
+    tenant_lookup = 'recruiter__membership__company'
+
 
 class HiringMetric(models.Model):
     """Recruitment metrics aggregated by job and date.
 
+    Maintained incrementally by analytics.rollups; each counter is the number
+    of applications that entered the stage on that date.
+
     Django 5.2: CompositePrimaryKey on (job, date) — no surrogate PK needed.
     """
     job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name='metrics')
@@ -21,6 +34,9 @@ class HiringMetric(models.Model):
     interview_count = models.IntegerField(default=0)
     offer_count = models.IntegerField(default=0)
     hire_count = models.IntegerField(default=0)
+    rejection_count = models.IntegerField(default=0)
+
+    objects = HiringMetricQuerySet.as_manager()
 
     # Django 5.2: composite PK replaces the implicit auto-increment id
     try:
@@ -35,7 +51,10 @@ class HiringMetric(models.Model):
 
 
 class RecruitmentFunnel(models.Model):
-    """Funnel conversion rates per recruiter and week."""
+    """Funnel conversion rates per recruiter (job poster) and week.
+
+    Maintained incrementally by analytics.rollups.
+    """
     recruiter = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -47,6 +66,9 @@ class RecruitmentFunnel(models.Model):
     interviewed = models.IntegerField(default=0)
     offered = models.IntegerField(default=0)
     hired = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+
+    objects = RecruitmentFunnelQuerySet.as_manager()
 
     class Meta:
         unique_together = [('recruiter', 'week_start')]
@@ -0,0 +1,207 @@
+"""Incremental rollups for HiringMetric and RecruitmentFunnel.
+
+Every new Application and every StageHistory row bumps two counters:
+the per-(job, date) HiringMetric row and the per-(recruiter, week)
+RecruitmentFunnel row, where the recruiter is the user who posted the job.
+Counters are bumped with F() expressions so concurrent transitions never
+lose an update, and missing rows are created on first use.
+
+The rebuild_hiring_metrics management command recomputes both tables
+from Application/StageHistory when the incremental path has drifted.
+"""
+from __future__ import annotations
+
+import datetime
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import HiringMetric, RecruitmentFunnel
+
+# Stage entered -> counter column bumped on each rollup table.
+# NEW is counted as a received application, not as a transition.
+METRIC_FIELDS = {
+    'NEW': 'applications_count',
+    'SCREENING': 'screening_count',
+    'INTERVIEW': 'interview_count',
+    'OFFER': 'offer_count',
+    'HIRED': 'hire_count',
+    'REJECTED': 'rejection_count',
+}
+
+FUNNEL_FIELDS = {
+    'NEW': 'applications_received',
+    'SCREENING': 'screened',
+    'INTERVIEW': 'interviewed',
+    'OFFER': 'offered',
+    'HIRED': 'hired',
+    'REJECTED': 'rejected',
+}
+
+# Keyed deltas: {(job_id, date): Counter({'hire_count': 2})}
+MetricDeltas = dict[tuple[int, datetime.date], Counter[str]]
+FunnelDeltas = dict[tuple[int, datetime.date], Counter[str]]
+
+
+def week_start(day: datetime.date) -> datetime.date:
+    """Monday of the ISO week containing ``day``."""
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def _upsert(model, lookup: dict[str, object], increments: Counter[str]) -> None:
+    """Atomically add ``increments`` to the row matching ``lookup``.
+
+    UPDATE first (the common case), then INSERT; if a concurrent writer
+    inserted the row in between, the IntegrityError falls back to UPDATE.
+    """
+    increments = Counter({field: n for field, n in increments.items() if n})
+    if not increments:
+        return
+    updates = {field: F(field) + n for field, n in increments.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **increments)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**updates)
+
+
+def apply_deltas(metrics: MetricDeltas, funnels: FunnelDeltas) -> None:
+    """Flush accumulated counter deltas to the rollup tables."""
+    for (job_id, day), increments in metrics.items():
+        _upsert(HiringMetric, {'job_id': job_id, 'date': day}, increments)
+    for (recruiter_id, week), increments in funnels.items():
+        _upsert(RecruitmentFunnel, {'recruiter_id': recruiter_id, 'week_start': week}, increments)
+
+
+def _accumulate(
+    metrics: MetricDeltas,
+    funnels: FunnelDeltas,
+    job_id: int,
+    recruiter_id: int | None,
+    day: datetime.date,
+    stage: str,
+    count: int = 1,
+) -> None:
+    if stage not in METRIC_FIELDS:
+        return
+    metrics[(job_id, day)][METRIC_FIELDS[stage]] += count
+    if recruiter_id is not None:
+        funnels[(recruiter_id, week_start(day))][FUNNEL_FIELDS[stage]] += count
+
+
+def _new_deltas() -> tuple[MetricDeltas, FunnelDeltas]:
+    return defaultdict(Counter), defaultdict(Counter)
+
+
+def record_application(application) -> None:
+    """Count a newly created application.
+
+    An application created directly in a later stage (imports, admin) also
+    counts as having entered that stage on the same day.
+    """
+    record_applications([application])
+
+
+def record_applications(applications: Iterable) -> None:
+    """Count many newly created applications with one UPDATE per key."""
+    metrics, funnels = _new_deltas()
+    for application in applications:
+        day = timezone.localdate(application.applied_at)
+        recruiter_id = application.job.posted_by_id
+        _accumulate(metrics, funnels, application.job_id, recruiter_id, day, 'NEW')
+        if application.stage != 'NEW':
+            _accumulate(metrics, funnels, application.job_id, recruiter_id, day, application.stage)
+    apply_deltas(metrics, funnels)
+
+
+def record_transitions(history_entries: Iterable) -> None:
+    """Count one or more StageHistory rows.
+
+    Entries are grouped per key first, so a batch of N transitions on the
+    same job and day costs one UPDATE instead of N.
+    """
+    metrics, funnels = _new_deltas()
+    for entry in history_entries:
+        job = entry.application.job
+        day = timezone.localdate(entry.changed_at)
+        _accumulate(metrics, funnels, job.pk, job.posted_by_id, day, entry.to_stage)
+    apply_deltas(metrics, funnels)
+
+
+def _pk_ranges(queryset: QuerySet, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """Yield half-open [start, end) primary-key ranges covering ``queryset``."""
+    bounds = queryset.aggregate(lo=Min('pk'), hi=Max('pk'))
+    if bounds['lo'] is None:
+        return
+    for start in range(bounds['lo'], bounds['hi'] + 1, chunk_size):
+        yield start, start + chunk_size
+
+
+def rebuild(chunk_size: int = 5000) -> dict[str, int]:
+    """Recompute both rollup tables from scratch.
+
+    Source rows are aggregated by the database one primary-key range at a
+    time, so memory stays bounded by ``chunk_size`` regardless of table size.
+    The whole rebuild runs in one transaction; readers see either the old
+    or the new counters, never an empty table.
+    """
+    from pipeline.models import Application, StageHistory
+
+    first_from_stage = StageHistory.objects.filter(
+        application=OuterRef('pk'),
+    ).order_by('changed_at', 'pk').values('from_stage')[:1]
+
+    stats = {'applications': 0, 'transitions': 0}
+    with transaction.atomic():
+        HiringMetric.objects.all().delete()
+        RecruitmentFunnel.objects.all().delete()
+
+        for start, end in _pk_ranges(Application.objects.all(), chunk_size):
+            rows = (
+                Application.objects.filter(pk__gte=start, pk__lt=end)
+                .annotate(
+                    day=TruncDate('applied_at'),
+                    recruiter_id=F('job__posted_by_id'),
+                    initial_stage=Coalesce(Subquery(first_from_stage), F('stage')),
+                )
+                .values('job_id', 'recruiter_id', 'day', 'initial_stage')
+                .annotate(n=Count('pk'))
+                .order_by()
+            )
+            metrics, funnels = _new_deltas()
+            for row in rows:
+                args = (metrics, funnels, row['job_id'], row['recruiter_id'], row['day'])
+                _accumulate(*args, 'NEW', row['n'])
+                if row['initial_stage'] != 'NEW':
+                    _accumulate(*args, row['initial_stage'], row['n'])
+                stats['applications'] += row['n']
+            apply_deltas(metrics, funnels)
+
+        for start, end in _pk_ranges(StageHistory.objects.all(), chunk_size):
+            rows = (
+                StageHistory.objects.filter(pk__gte=start, pk__lt=end)
+                .annotate(
+                    day=TruncDate('changed_at'),
+                    job_id=F('application__job_id'),
+                    recruiter_id=F('application__job__posted_by_id'),
+                )
+                .values('job_id', 'recruiter_id', 'day', 'to_stage')
+                .annotate(n=Count('pk'))
+                .order_by()
+            )
+            metrics, funnels = _new_deltas()
+            for row in rows:
+                _accumulate(
+                    metrics, funnels, row['job_id'], row['recruiter_id'],
+                    row['day'], row['to_stage'], row['n'],
+                )
+                stats['transitions'] += row['n']
+            apply_deltas(metrics, funnels)
+
+    return stats
@@ -0,0 +1,51 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobs.models import Job
+from pipeline.models import Application, StageHistory
+from pipeline.signals import applications_created, applications_transitioned
+
+from .funnel import invalidate_on_commit
+from .rollups import record_application, record_applications, record_transitions
+
+
+@receiver(post_save, sender=Application)
+def on_application_created(sender, instance, created, **kwargs):
+    """Count new applications in the HiringMetric/RecruitmentFunnel rollups."""
+    if created:
+        record_application(instance)
+
+
+@receiver(post_save, sender=StageHistory)
+def on_stage_history_created(sender, instance, created, **kwargs):
+    """Count stage transitions in the HiringMetric/RecruitmentFunnel rollups."""
+    if created:
+        record_transitions([instance])
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def on_application_changed(sender, instance, **kwargs):
+    """Invalidate cached stage counts for the application's tenant."""
+    try:
+        company_id = instance.job.company_id
+    except Job.DoesNotExist:
+        # Cascade delete of the job itself: only the cross-tenant entry is known.
+        company_id = None
+    invalidate_on_commit(company_id)
+
+
+@receiver(applications_transitioned)
+def on_applications_transitioned(sender, history, **kwargs):
+    """Count a bulk transition in the rollups and invalidate its tenants' stage counts."""
+    record_transitions(history)
+    for company_id in {entry.application.job.company_id for entry in history}:
+        invalidate_on_commit(company_id)
+
+
+@receiver(applications_created)
+def on_applications_created(sender, applications, **kwargs):
+    """Count bulk-created applications in the rollups and invalidate their tenants' stage counts."""
+    record_applications(applications)
+    for company_id in {application.job.company_id for application in applications}:
+        invalidate_on_commit(company_id)
@@ -1,12 +1,14 @@
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Avg, Q
+from django.db.models import Sum
 from django.utils import timezone
 from datetime import timedelta
-from pipeline.models import Application
-from jobs.models import Job
 from candidates.models import Candidate
+from .funnel import stage_counts
+from .models import HiringMetric, RecruitmentFunnel
+from .rollups import week_start
 
 
 class PipelineStatsView(APIView):
@@ -14,58 +16,93 @@ class PipelineStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        stats = Application.objects.values('stage').annotate(
-            count=Count('id')
-        ).order_by('stage')
-
-        result = {item['stage']: item['count'] for item in stats}
-        result['total'] = Application.objects.count()
-        return Response(result)
+        return Response(stage_counts(getattr(request, 'company', None)))
 
 
 class JobStatsView(APIView):
-    """Analytics: applications per job with stage breakdown."""
+    """Analytics: applications per job with stage breakdown.
+
+    Reads the precomputed HiringMetric rollups (one row per job and day)
+    instead of scanning the Application table.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        jobs = Job.objects.annotate(
-            total_applications=Count('applications'),
-            hired_count=Count('applications', filter=Q(applications__stage='HIRED')),
-            rejected_count=Count('applications', filter=Q(applications__stage='REJECTED')),
-            in_progress_count=Count(
-                'applications',
-                filter=~Q(applications__stage__in=['HIRED', 'REJECTED'])
-            ),
+        jobs = HiringMetric.objects.for_company(getattr(request, 'company', None)).values(
+            'job_id', 'job__title',
+        ).annotate(
+            total_applications=Sum('applications_count'),
+            hired_count=Sum('hire_count'),
+            rejected_count=Sum('rejection_count'),
         ).filter(total_applications__gt=0).order_by('-total_applications')
 
         data = []
         for job in jobs:
+            total = job['total_applications']
             data.append({
-                'job_id': job.id,
-                'title': job.title,
-                'total_applications': job.total_applications,
-                'hired': job.hired_count,
-                'rejected': job.rejected_count,
-                'in_progress': job.in_progress_count,
+                'job_id': job['job_id'],
+                'title': job['job__title'],
+                'total_applications': total,
+                'hired': job['hired_count'],
+                'rejected': job['rejected_count'],
+                'in_progress': total - job['hired_count'] - job['rejected_count'],
                 'conversion_rate': (
-                    round(job.hired_count / job.total_applications * 100, 1)
-                    if job.total_applications > 0 else 0
+                    round(job['hired_count'] / total * 100, 1) if total > 0 else 0
                 ),
             })
         return Response(data)
 
 
+class RecruiterFunnelView(APIView):
+    """Analytics: weekly funnel per recruiter from RecruitmentFunnel rollups.
+
+    Optional ?recruiter=<id> and ?weeks=<n> (default 12) narrow the window.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            weeks = int(request.query_params.get('weeks', 12))
+        except ValueError:
+            return Response({'error': 'weeks must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        recruiter = request.query_params.get('recruiter')
+        if recruiter:
+            try:
+                recruiter = int(recruiter)
+            except ValueError:
+                return Response({'error': 'recruiter must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        since = week_start(timezone.localdate()) - timedelta(weeks=max(weeks, 1) - 1)
+        rows = RecruitmentFunnel.objects.for_company(getattr(request, 'company', None)).filter(
+            week_start__gte=since,
+        ).order_by('recruiter_id', 'week_start')
+        if recruiter:
+            rows = rows.filter(recruiter_id=recruiter)
+
+        return Response([
+            {
+                'recruiter_id': row.recruiter_id,
+                'week_start': row.week_start,
+                'applications_received': row.applications_received,
+                'screened': row.screened,
+                'interviewed': row.interviewed,
+                'offered': row.offered,
+                'hired': row.hired,
+                'rejected': row.rejected,
+                'screen_rate': round(row.screen_rate * 100, 1),
+                'hire_rate': round(row.hire_rate * 100, 1),
+            }
+            for row in rows
+        ])
+
+
 class RecruitingFunnelView(APIView):
     """Analytics: conversion rates between pipeline stages."""
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         stages = ['NEW', 'SCREENING', 'INTERVIEW', 'OFFER', 'HIRED']
-        counts = {}
-        for stage in stages:
-            counts[stage] = Application.objects.filter(stage=stage).count()
-
-        rejected = Application.objects.filter(stage='REJECTED').count()
+        counts = stage_counts(getattr(request, 'company', None))
 
         funnel = []
         for i, stage in enumerate(stages):
@@ -80,7 +117,7 @@ class RecruitingFunnelView(APIView):
 
         return Response({
             'funnel': funnel,
-            'rejected_total': rejected,
+            'rejected_total': counts['REJECTED'],
         })
 
 
@@ -90,8 +127,9 @@ class CandidateSourceView(APIView):
 
     def get(self, request):
         thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_count = Candidate.objects.filter(created_at__gte=thirty_days_ago).count()
-        total_count = Candidate.objects.count()
+        candidates = Candidate.objects.for_company(getattr(request, 'company', None))
+        recent_count = candidates.filter(created_at__gte=thirty_days_ago).count()
+        total_count = candidates.count()
 
         return Response({
             'total_candidates': total_count,
@@ -0,0 +1,6 @@
+"""Micro-benchmarks. Run from the hireflow/ directory, e.g.::
+
+    python -m benchmarks.bench_similarity
+
+They are not collected by pytest.
+"""
@@ -0,0 +1,69 @@
+"""Candidate matching: exact brute-force top-k vs the IVF index.
+
+Builds candidates.ann.IVFIndex over clustered synthetic unit vectors
+(real profile embeddings cluster by role and seniority), then reports
+per-query latency and recall@k against exact search for each nprobe::
+
+    python -m benchmarks.bench_ann
+    python -m benchmarks.bench_ann --sizes 10000 --dims 256 --nprobe 1 4 16
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from candidates import similarity
+from candidates.ann import IVFIndex
+
+
+def clustered(rng, size, dims, clusters, spread):
+    centers = rng.standard_normal((clusters, dims))
+    points = centers[rng.integers(clusters, size=size)] + spread * rng.standard_normal((size, dims))
+    return similarity.normalize(points)
+
+
+def _per_query(fn, queries):
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--dims', type=int, default=1536)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('--spread', type=float, default=1.0, help='within-cluster noise; higher is harder')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32])
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        data = clustered(rng, size + args.queries, args.dims, args.clusters, args.spread)
+        vectors, queries = data[:size], data[size:]
+
+        start = time.perf_counter()
+        index = IVFIndex.build(np.arange(size), vectors)
+        build = time.perf_counter() - start
+
+        exact_time, exact = _per_query(
+            lambda q, vectors=vectors: set(similarity.top_k(similarity.one_to_many(q, vectors), args.k)[0].tolist()), queries,
+        )
+        print(f'{size} candidates, {args.dims} dims, nlist={index.nlist}, build {build:.2f}s')
+        print(f"{'method':>12} {'latency':>11} {'speedup':>8} {f'recall@{args.k}':>10}")
+        print(f"{'exact':>12} {exact_time * 1e3:>9.3f}ms {1:>7.1f}x {1:>10.3f}")
+        for nprobe in args.nprobe:
+            ivf_time, found = _per_query(lambda q, index=index, nprobe=nprobe: index.search(q, k=args.k, nprobe=nprobe), queries)
+            recall = np.mean([
+                len(truth & {i for i, _ in hits}) / args.k for truth, hits in zip(exact, found, strict=True)
+            ])
+            print(f"{f'nprobe={nprobe}':>12} {ivf_time * 1e3:>9.3f}ms {exact_time / ivf_time:>7.1f}x {recall:>10.3f}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Interview availability: one-query sweep line vs per-interviewer queries.
+
+Creates a throwaway test database and seeds a calendar of --interviews
+interviews (default 10k). They are spread over --interviewers
+interviewers and 8 weeks of working hours, with some double-bookings.
+Then, for several panel sizes and window lengths, it times:
+
+- sweep: interviews.availability.find_availability (one range query, one sweep)
+- per-interviewer: one query per interviewer, then the same sweep
+- api: GET /api/interviews/availability/ end to end, serialization included
+
+Run from the project directory::
+
+    python -m benchmarks.bench_availability
+    DATABASE_URL=postgres://... python -m benchmarks.bench_availability --interviews 50000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from datetime import timedelta
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def seed(interviews, interviewers, weeks=8):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from candidates.models import Candidate
+    from interviews.models import Interview
+    from jobs.models import Job
+    from pipeline.models import Application
+
+    User = get_user_model()
+    rng = random.Random(0)
+    users = User.objects.bulk_create([User(username=f'interviewer{i}') for i in range(interviewers)])
+    job = Job.objects.create(title='Engineer', description='', location='Remote', posted_by=users[0])
+    candidates = Candidate.objects.bulk_create([
+        Candidate(first_name='C', last_name=str(i), email=f'c{i}@example.com') for i in range(200)
+    ])
+    applications = Application.objects.bulk_create([Application(candidate=c, job=job) for c in candidates])
+
+    monday = timezone.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    monday -= timedelta(days=monday.weekday())
+    rows = []
+    for _ in range(interviews):
+        day = rng.randrange(weeks * 7)
+        if day % 7 >= 5:
+            day -= 2  # weekdays only
+        start = monday + timedelta(days=day, minutes=30 * rng.randrange(16))
+        duration = rng.choice([30, 45, 60, 90])
+        rows.append(Interview(
+            application=rng.choice(applications), interviewer=rng.choice(users),
+            scheduled_at=start, duration_minutes=duration,
+            ends_at=start + timedelta(minutes=duration), completed=rng.random() < 0.1,
+        ))
+    Interview.objects.bulk_create(rows, batch_size=1000)
+    return users, monday
+
+
+def run(args):
+    from rest_framework.test import APIClient
+
+    from interviews.availability import busy_intervals, find_availability, free_slots
+
+    users, monday = seed(args.interviews, args.interviewers)
+    client = APIClient()
+    client.force_authenticate(users[0])
+    duration = timedelta(minutes=60)
+
+    print(f'{args.interviews} interviews, {args.interviewers} interviewers')
+    print(f"{'panel':>6} {'window':>7} {'sweep':>10} {'per-interviewer':>16} {'api':>10} {'slots':>6}")
+    url = '/api/interviews/availability/'
+    for panel_size in args.panels:
+        panel = [user.pk for user in users[:panel_size]]
+        for weeks in args.weeks:
+            start, end = monday, monday + timedelta(weeks=weeks)
+            slots = find_availability(panel, start, end, duration)
+            sweep = _best_of(
+                lambda panel=panel, start=start, end=end: find_availability(panel, start, end, duration), args.repeat,
+            )
+            per_interviewer = _best_of(lambda panel=panel, start=start, end=end: free_slots(
+                [interval for pk in panel for interval in busy_intervals([pk], start, end)],
+                start, end, duration,
+            ), args.repeat)
+            params = {
+                'interviewers': ','.join(map(str, panel)),
+                'start': start.isoformat(), 'end': end.isoformat(), 'duration_minutes': 60,
+            }
+            api = _best_of(lambda params=params: client.get(url, params), args.repeat)
+            print(
+                f'{panel_size:>6} {weeks:>6}w {sweep * 1e3:>8.2f}ms {per_interviewer * 1e3:>14.2f}ms '
+                f'{api * 1e3:>8.2f}ms {len(slots):>6}'
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--interviews', type=int, default=10_000)
+    parser.add_argument('--interviewers', type=int, default=200)
+    parser.add_argument('--panels', type=int, nargs='+', default=[1, 5, 20, 50])
+    parser.add_argument('--weeks', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hireflow.settings')
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        run(args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
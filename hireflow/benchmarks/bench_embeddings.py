@@ -0,0 +1,84 @@
+"""Embedding providers: batch size and concurrency, fully offline.
+
+Part 1 runs the scoring pipeline on the local hashing provider: embed
+N candidate profiles plus one job, normalize, score with one_to_many.
+No network and no database are used.
+
+Part 2 wraps the local provider in a simulated remote provider with a
+fixed latency per request (default 150 ms). It shows how batch size and
+max_concurrency change the wall time to embed N texts::
+
+    python -m benchmarks.bench_embeddings
+    python -m benchmarks.bench_embeddings --texts 5000 --latency-ms 300
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from candidates import similarity
+from candidates.providers import EmbeddingProvider, HashingProvider
+
+
+class SimulatedRemoteProvider(EmbeddingProvider):
+    """Local vectors behind a fixed per-request delay, like an HTTP API."""
+
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.local = HashingProvider(batch_size=self.batch_size)
+        self.name = 'simulated-remote'
+
+    def embed_batch(self, texts):
+        time.sleep(self.latency)
+        return self.local.embed_batch(texts)
+
+
+def profile_texts(count):
+    roles = ['Python developer', 'Data engineer', 'Product designer', 'Nurse', 'Accountant', 'SRE']
+    return [
+        f"Candidate {i} Lastname{i % 97}\nEmail: c{i}@example.com\n"
+        f"LinkedIn: https://linkedin.com/in/c{i} {roles[i % len(roles)]}"
+        for i in range(count)
+    ]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--texts', type=int, default=2_000)
+    parser.add_argument('--dims', type=int, default=512)
+    parser.add_argument('--latency-ms', type=float, default=150)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args(argv)
+
+    texts = profile_texts(args.texts)
+    job = 'Senior Python developer\nBuild our Django APIs\nLocation: Remote'
+
+    local = HashingProvider(dimensions=args.dims)
+    embed_time, matrix = _timed(lambda: similarity.normalize(local.embed(texts)))
+    score_time, _ = _timed(lambda: similarity.one_to_many(similarity.normalize(local.embed([job]))[0], matrix))
+    print(f'local pipeline, {args.texts} candidates, {args.dims} dims')
+    print(f'  embed {embed_time * 1e3:.1f}ms ({args.texts / embed_time:,.0f} texts/s), score {score_time * 1e3:.2f}ms')
+
+    print(f'\nsimulated remote, {args.latency_ms:.0f}ms per request, {args.texts} texts')
+    print(f"{'batch':>7} " + ' '.join(f"{f'conc={c}':>10}" for c in args.concurrency))
+    for batch_size in args.batch_sizes:
+        cells = []
+        for concurrency in args.concurrency:
+            provider = SimulatedRemoteProvider(
+                args.latency_ms / 1e3, batch_size=batch_size, max_concurrency=concurrency,
+            )
+            elapsed, _ = _timed(lambda provider=provider: provider.embed(texts))
+            cells.append(f'{elapsed:>9.2f}s')
+        print(f'{batch_size:>7} ' + ' '.join(cells))
+
+
+if __name__ == '__main__':
+    main()
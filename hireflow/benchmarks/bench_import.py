@@ -0,0 +1,95 @@
+"""Bulk candidate import: throughput and memory of candidates.importer.
+
+Writes a CSV of --rows candidates (default 200k) to a temporary file,
+with a share of invalid rows and of emails already in the database. It
+then imports the file into a throwaway test database, applying every
+candidate to one job, and reports rows/s and the growth in peak RSS. A
+second run imports the same file again, which is the all-existing path.
+
+On SQLite the test database lives in memory, so the first run's RSS
+growth includes the imported rows themselves; the reimport's shows the
+importer's own footprint.
+
+Run from the project directory::
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --rows 1000000 --chunk-size 2000
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import random
+import resource
+import tempfile
+import time
+
+
+def write_csv(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['first_name', 'last_name', 'email', 'phone', 'linkedin_url'])
+        for n in range(rows):
+            email = f'c{n}@example.com' if rng.random() > 0.01 else 'not-an-email'
+            writer.writerow(['Candidate', f'Number {n}', email, '+1 555 0100', f'https://linkedin.com/in/c{n}'])
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(args, path):
+    from django.contrib.auth import get_user_model
+
+    from candidates.importer import import_candidates, read_rows
+    from candidates.models import Candidate
+    from jobs.models import Job
+
+    user = get_user_model().objects.create(username='recruiter')
+    job = Job.objects.create(title='Engineer', description='', location='Remote', posted_by=user)
+    Candidate.objects.bulk_create(
+        [Candidate(first_name='Old', last_name=str(n), email=f'c{n}@example.com') for n in range(0, args.rows, 10)],
+        batch_size=1000,
+    )
+
+    print(f'{args.rows} rows, chunk size {args.chunk_size}')
+    print(f"{'run':<10} {'seconds':>8} {'rows/s':>10} {'created':>9} {'existing':>9} {'failed':>7} {'rss +MB':>8}")
+    for label in ('first', 'reimport'):
+        rss = _peak_rss_mb()
+        start = time.perf_counter()
+        with open(path, 'rb') as stream:
+            report = import_candidates(read_rows(stream, 'csv'), job=job, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        print(
+            f'{label:<10} {elapsed:>8.1f} {report.rows / elapsed:>10,.0f} {report.created:>9} '
+            f'{report.existing:>9} {report.failed:>7} {_peak_rss_mb() - rss:>8.1f}'
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hireflow.settings')
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'candidates.csv')
+        write_csv(path, args.rows)
+        try:
+            run(args, path)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
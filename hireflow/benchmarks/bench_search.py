@@ -0,0 +1,125 @@
+"""Candidate search: the search index (candidates.search) vs icontains scans.
+
+Seeds --candidates candidates (default 1M) over --companies companies in
+a throwaway test database, with names drawn from a few thousand first
+and last names, then times a set of queries both ways:
+
+- ``search``: candidates.search.search(), ranked, fuzzy fallback on;
+- ``list``: a page of the candidate list filtered by
+  candidates.search.filter_candidates, as ?q= and ?search= do;
+- ``icontains``: the same page with the former icontains filter.
+
+Queries run per company (the API always scopes to one) and unscoped.
+
+Run from the project directory::
+
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --candidates 100000 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+
+SYLLABLES = ['an', 'bel', 'cor', 'da', 'el', 'fra', 'gio', 'han', 'is', 'jo', 'ka', 'lo', 'mar', 'ne',
+             'ol', 'pe', 'qui', 'ro', 'sa', 'ti', 'ul', 'vi', 'wen', 'xa', 'yu', 'zo']
+
+QUERIES = [
+    ('prefix', 'mar'),
+    ('full name', 'marlo bel'),
+    ('email', 'example42'),
+    ('fuzzy', 'marlowenn'),
+    ('no match', 'qqqq'),
+]
+
+
+def _names(rng, count):
+    return sorted({
+        ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize() for _ in range(count)
+    })
+
+
+def seed(candidates, companies, seed=0):
+    from candidates.models import Candidate
+    from tenants.models import Company
+
+    rng = random.Random(seed)
+    first_names, last_names = _names(rng, 2000), _names(rng, 5000)
+    company_ids = [
+        company.pk for company in Company.objects.bulk_create(
+            [Company(name=f'Company {n}', slug=f'company-{n}') for n in range(companies)]
+        )
+    ]
+    for start in range(0, candidates, 10_000):
+        Candidate.objects.bulk_create([
+            Candidate(
+                first_name=rng.choice(first_names), last_name=rng.choice(last_names),
+                email=f'c{n}@example{n % 5000}.com', company_id=company_ids[n % companies],
+            )
+            for n in range(start, min(start + 10_000, candidates))
+        ])
+    return Company.objects.get(pk=company_ids[0])
+
+
+def _best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _icontains(queryset, text):
+    from django.db.models import Q
+
+    return queryset.filter(Q(first_name__icontains=text) | Q(last_name__icontains=text) | Q(email__icontains=text))
+
+
+def run(args):
+    from candidates import search
+    from candidates.models import Candidate
+
+    start = time.perf_counter()
+    company = seed(args.candidates, args.companies)
+    print(f'seeded {args.candidates} candidates in {time.perf_counter() - start:.0f}s; best of {args.repeat}, ms')
+    print(f"{'query':<11} {'scope':<8} {'hits':>5} {'search':>8} {'list':>8} {'icontains':>10}")
+    for label, text in QUERIES:
+        for scope, tenant in (('company', company), ('all', None)):
+            queryset = Candidate.objects.for_company(tenant).order_by('-created_at')
+            hits = len(search.search(text, company=tenant))
+            timings = [
+                _best_of(args.repeat, lambda text=text, tenant=tenant: search.search(text, company=tenant)),
+                _best_of(args.repeat, lambda queryset=queryset, text=text: list(search.filter_candidates(queryset, text)[:20])),
+                _best_of(args.repeat, lambda queryset=queryset, text=text: list(_icontains(queryset, text)[:20])),
+            ]
+            print(f'{label:<11} {scope:<8} {hits:>5} ' + ' '.join(
+                f'{timing:>{width}.1f}' for timing, width in zip(timings, (8, 8, 10), strict=True)
+            ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=1_000_000)
+    parser.add_argument('--companies', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hireflow.settings')
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        run(args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""List serialization: ModelSerializer instances vs values() rows.
+
+Creates a throwaway test database, seeds --rows candidates, jobs and
+applications (default 5000 each, every application with --history stage
+changes) and times building the list payload of each endpoint, query
+included, three ways:
+
+- model: ModelSerializer(many=True) on the viewset's queryset (for
+  applications, with prefetch_related('history'))
+- model (n+1): applications only, the history of each application read
+  by its own query, as the list did before
+- values: the ``list_serializer_class`` path, dicts built from
+  ``.values()`` rows with the history read in one grouped query
+
+Times are per 1k rows. Run from the project directory::
+
+    python -m benchmarks.bench_serializers
+    python -m benchmarks.bench_serializers --rows 20000 --history 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+
+
+def _best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def seed(rows, history):
+    from django.contrib.auth import get_user_model
+
+    from candidates.models import Candidate
+    from jobs.models import Job
+    from pipeline.models import Application, StageHistory
+
+    rng = random.Random(0)
+    user = get_user_model().objects.create(username='recruiter')
+    jobs = Job.objects.bulk_create([
+        Job(title=f'Job {i}', description='Backend role', location='Remote', posted_by=user,
+            salary_min=50000 + i, salary_max=90000 + i)
+        for i in range(rows)
+    ], batch_size=1000)
+    candidates = Candidate.objects.bulk_create([
+        Candidate(first_name='C', last_name=str(i), email=f'c{i}@example.com', phone='555-0100',
+                  resume=f'resumes/{i:02x}/cv{i}.pdf' if i % 2 else '')
+        for i in range(rows)
+    ], batch_size=1000)
+    applications = Application.objects.bulk_create([
+        Application(candidate=candidate, job=rng.choice(jobs), stage=Application.Stage.INTERVIEW)
+        for candidate in candidates
+    ], batch_size=1000)
+    stages = Application.Stage.values
+    StageHistory.objects.bulk_create([
+        StageHistory(application=application, from_stage=stages[i], to_stage=stages[i + 1], changed_by=user)
+        for application in applications for i in range(history)
+    ], batch_size=1000)
+
+
+def strategies(name, viewset, rows):
+    from rest_framework.test import APIRequestFactory
+
+    from candidates import providers
+    from pipeline.views import annotate_scores
+
+    request = APIRequestFactory().get(f'/api/{name}/')
+    context = {'request': request}
+    queryset = viewset.queryset.all()
+    if name == 'applications':
+        queryset = annotate_scores(queryset, providers.get_provider().name)
+    queryset = queryset[:rows]
+    serializer_class, list_serializer_class = viewset.serializer_class, viewset.list_serializer_class
+
+    def values():
+        serializer = list_serializer_class(context)
+        return serializer.serialize(list(queryset.prefetch_related(None).values(*serializer.values())))
+
+    timed = {
+        'model': lambda: serializer_class(queryset, many=True, context=context).data,
+        'values': values,
+    }
+    if queryset._prefetch_related_lookups:
+        timed['model (n+1)'] = lambda: serializer_class(
+            queryset.prefetch_related(None), many=True, context=context,
+        ).data
+    return timed
+
+
+def run(args):
+    from candidates.views import CandidateViewSet
+    from jobs.views import JobViewSet
+    from pipeline.views import ApplicationViewSet
+
+    seed(args.rows, args.history)
+    print(f'{args.rows} rows per endpoint, {args.history} history entries per application')
+    print(f"{'endpoint':<14} {'model (n+1)':>12} {'model':>10} {'values':>10} {'speedup':>8}")
+    for name, viewset in (('candidates', CandidateViewSet), ('jobs', JobViewSet), ('applications', ApplicationViewSet)):
+        per_1k = {
+            label: _best_of(args.repeat, fn) * 1000 / args.rows
+            for label, fn in strategies(name, viewset, args.rows).items()
+        }
+        n_plus_1 = f"{per_1k['model (n+1)']:>10.1f}ms" if 'model (n+1)' in per_1k else f"{'-':>12}"
+        print(
+            f"{name:<14} {n_plus_1} {per_1k['model']:>8.1f}ms "
+            f"{per_1k['values']:>8.1f}ms {per_1k['model'] / per_1k['values']:>7.1f}x"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000)
+    parser.add_argument('--history', type=int, default=3, help='stage changes per application')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hireflow.settings')
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        run(args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Cosine similarity: legacy pure-Python loop vs candidates.similarity.
+
+Scores one job vector against 1, 1k and 100k candidate vectors
+(1536 dimensions, the text-embedding-3-small size), then --jobs job
+vectors against the same pools with many_to_many, whole and chunked::
+
+    python -m benchmarks.bench_similarity
+    python -m benchmarks.bench_similarity --sizes 1 1000 --dims 256
+
+The legacy implementation is timed on at most --legacy-limit candidates
+and extrapolated linearly above that; it needs ~1 minute for 100k.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from candidates import similarity
+
+
+def legacy_cosine(a, b):
+    """The original candidates.tasks._cosine_similarity."""
+    dot = sum(x * y for x, y in zip(a, b, strict=True))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 1_000, 100_000])
+    parser.add_argument('--dims', type=int, default=1536)
+    parser.add_argument('--legacy-limit', type=int, default=2_000)
+    parser.add_argument('--jobs', type=int, default=64)
+    parser.add_argument('--chunk-size', type=int, default=16)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    job = rng.standard_normal(args.dims).astype(np.float32)
+    job_unit = similarity.normalize(job)[0]
+
+    pools = {
+        size: similarity.normalize(rng.standard_normal((size, args.dims)).astype(np.float32))
+        for size in args.sizes
+    }
+
+    print('one job vs N candidates')
+    print(f"{'candidates':>10} {'legacy':>13} {'numpy':>12} {'speedup':>9}")
+    for size, matrix in pools.items():
+        sample = min(size, args.legacy_limit)
+        job_list = job.tolist()
+        rows = [row.tolist() for row in matrix[:sample]]
+        legacy = _best_of(lambda rows=rows, job_list=job_list: [legacy_cosine(row, job_list) for row in rows], 1) * size / sample
+        vectorized = _best_of(lambda matrix=matrix: similarity.one_to_many(job_unit, matrix), args.repeat)
+        marker = '*' if sample < size else ' '
+        print(f"{size:>10} {legacy * 1e3:>11.2f}ms{marker}{vectorized * 1e3:>10.3f}ms {legacy / vectorized:>8.0f}x")
+    print('* extrapolated from --legacy-limit candidates')
+
+    jobs = similarity.normalize(rng.standard_normal((args.jobs, args.dims)).astype(np.float32))
+    print(f'\n{args.jobs} jobs vs N candidates (many_to_many)')
+    print(f"{'candidates':>10} {'whole':>12} {'chunked':>12}")
+    for size, matrix in pools.items():
+        whole = _best_of(lambda matrix=matrix: similarity.many_to_many(jobs, matrix), args.repeat)
+        chunked = _best_of(
+            lambda matrix=matrix: similarity.many_to_many(jobs, matrix, chunk_size=args.chunk_size), args.repeat,
+        )
+        print(f"{size:>10} {whole * 1e3:>10.2f}ms {chunked * 1e3:>10.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
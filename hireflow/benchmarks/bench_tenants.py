@@ -0,0 +1,148 @@
+"""Tenant-scoped queries: leading-company composite indexes vs none.
+
+Creates a throwaway test database and seeds --tenants companies (default
+100) with --candidates candidates each (default 10k), plus --jobs jobs
+and --applications applications per tenant. For one tenant it then times
+the queries behind the tenant-scoped endpoints:
+
+- candidates page: GET /api/candidates/ (company, newest first)
+- candidates count: CandidateSource analytics
+- open jobs page: GET /api/jobs/?is_active=true
+- stage counts: applications per stage (pipeline analytics)
+
+once with the (company, ...) indexes and once after dropping them, so the
+company filter has no index to use.
+
+Run from the project directory::
+
+    python -m benchmarks.bench_tenants
+    python -m benchmarks.bench_tenants --tenants 20 --candidates 5000
+    DATABASE_URL=postgres://... python -m benchmarks.bench_tenants
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def seed(tenants, candidates, jobs, applications):
+    from django.contrib.auth import get_user_model
+
+    from candidates.models import Candidate
+    from jobs.models import Job
+    from pipeline.models import Application
+    from tenants.models import Company
+
+    rng = random.Random(0)
+    user = get_user_model().objects.create(username='recruiter')
+    companies = Company.objects.bulk_create([Company(name=f'Tenant {i}', slug=f'tenant-{i}') for i in range(tenants)])
+    stages = Application.Stage.values
+    for company in companies:
+        tenant_jobs = Job.objects.bulk_create([
+            Job(title=f'Job {i}', description='', location='Remote', posted_by=user,
+                company=company, is_active=rng.random() < 0.7)
+            for i in range(jobs)
+        ])
+        tenant_candidates = Candidate.objects.bulk_create([
+            Candidate(first_name='C', last_name=str(i), email=f'c{company.pk}-{i}@example.com', company=company)
+            for i in range(candidates)
+        ], batch_size=1000)
+        Application.objects.bulk_create([
+            Application(candidate=candidate, job=rng.choice(tenant_jobs), stage=rng.choice(stages))
+            for candidate in rng.sample(tenant_candidates, min(applications, candidates))
+        ], batch_size=1000)
+    return companies
+
+
+def queries(company):
+    from django.db.models import Count
+
+    from candidates.models import Candidate
+    from jobs.models import Job
+    from pipeline.models import Application
+
+    return {
+        'candidates page': lambda: list(
+            Candidate.objects.for_company(company).order_by('-created_at', '-id')[:21]
+        ),
+        'candidates count': lambda: Candidate.objects.for_company(company).count(),
+        'open jobs page': lambda: list(
+            Job.objects.for_company(company).filter(is_active=True).order_by('-created_at', '-id')[:21]
+        ),
+        'stage counts': lambda: list(
+            Application.objects.for_company(company).values('stage').annotate(n=Count('id'))
+        ),
+    }
+
+
+def _tenant_indexes():
+    from candidates.models import Candidate
+    from jobs.models import Job
+
+    return [
+        (model, index)
+        for model in (Candidate, Job)
+        for index in model._meta.indexes
+        if index.fields[0] == 'company'
+    ]
+
+
+def run(args):
+    from django.db import connection
+
+    companies = seed(args.tenants, args.candidates, args.jobs, args.applications)
+    company = companies[len(companies) // 2]
+    print(f'{args.tenants} tenants x {args.candidates} candidates, {args.applications} applications each')
+
+    timings = {}
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    for label in ('indexed', 'no index'):
+        timings[label] = {name: _best_of(fn, args.repeat) for name, fn in queries(company).items()}
+        if label == 'indexed':
+            with connection.schema_editor() as editor:
+                for model, index in _tenant_indexes():
+                    editor.remove_index(model, index)
+
+    print(f"{'query':<18} {'indexed':>10} {'no index':>10} {'speedup':>8}")
+    for name, indexed in timings['indexed'].items():
+        unindexed = timings['no index'][name]
+        print(f'{name:<18} {indexed * 1e3:>8.2f}ms {unindexed * 1e3:>8.2f}ms {unindexed / indexed:>7.1f}x')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tenants', type=int, default=100)
+    parser.add_argument('--candidates', type=int, default=10_000, help='per tenant')
+    parser.add_argument('--jobs', type=int, default=50, help='per tenant')
+    parser.add_argument('--applications', type=int, default=2_000, help='per tenant')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hireflow.settings')
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        run(args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
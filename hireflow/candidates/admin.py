@@ -1,8 +1,22 @@
 from django.contrib import admin
-from .models import Candidate
+from .models import Candidate, CandidateScore, ResumeText
 
 
 @admin.register(Candidate)
 class CandidateAdmin(admin.ModelAdmin):
     list_display = ['first_name', 'last_name', 'email', 'phone', 'created_at']
     search_fields = ['first_name', 'last_name', 'email']
+
+
+@admin.register(CandidateScore)
+class CandidateScoreAdmin(admin.ModelAdmin):
+    list_display = ['candidate', 'job', 'model', 'score', 'scored_at']
+    list_filter = ['model']
+    raw_id_fields = ['candidate', 'job']
+
+
+@admin.register(ResumeText)
+class ResumeTextAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'kind', 'size', 'error', 'created_at']
+    list_filter = ['kind']
+    search_fields = ['sha256']
@@ -0,0 +1,265 @@
+"""In-process approximate nearest-neighbour (IVF) index over unit vectors.
+
+The index partitions vectors into ``nlist`` clusters with spherical
+k-means. Vectors are stored sorted by cluster, so each cluster is one
+contiguous slice. A query scores the centroids, then scans only the
+``nprobe`` closest clusters: about ``nprobe / nlist`` of the data.
+
+Incremental changes go to a small delta segment that is searched by
+brute force, plus a tombstone list for removed or replaced ids. Once the
+delta outgrows ``REBUILD_RATIO`` of the base, ``needs_rebuild`` tells the
+caller to re-cluster.
+
+On disk an index is a directory of .npy files per generation::
+
+    <root>/CURRENT                     -> "gen-000004"
+    <root>/gen-000004/{centroids,vectors,ids,offsets}.npy    (immutable)
+    <root>/gen-000004/DELTA            -> "delta-000007"
+    <root>/gen-000004/delta-000007/{delta_vectors,delta_ids,deleted}.npy
+
+The base arrays are opened with ``mmap_mode='r'``. Workers therefore
+share one page-cached copy, and a rebuild never blocks readers: CURRENT
+is swapped atomically to the new generation. Delta updates work the same
+way one level down: each one is written to a fresh delta directory and
+published by swapping DELTA, so a reader always sees the three delta
+arrays of a single update.
+
+This module only depends on NumPy, so it can be benchmarked without Django.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from .similarity import DTYPE, as_matrix, top_k
+
+BASE_FILES = ('centroids', 'vectors', 'ids', 'offsets')
+DELTA_FILES = ('delta_vectors', 'delta_ids', 'deleted')
+REBUILD_RATIO = 0.1
+MIN_REBUILD_DELTA = 1000
+
+
+def _read_pointer(path: Path) -> str | None:
+    try:
+        return path.read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_pointer(path: Path, target: str) -> None:
+    """Point ``path`` at ``target`` atomically (write to a temp file, then rename)."""
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.write_text(target)
+    os.replace(tmp, path)
+
+
+def _next_name(prefix: str, previous: str | None) -> str:
+    number = int(previous.split('-')[1]) + 1 if previous else 1
+    return f'{prefix}-{number:06d}'
+
+
+def current_version(root: Path | str) -> tuple[str, str | None] | None:
+    """``(generation, delta)`` currently published under ``root``, or None.
+
+    Changes whenever a rebuild or a delta update is published.
+    """
+    root = Path(root)
+    generation = _current_generation(root)
+    if generation is None:
+        return None
+    return generation, _read_pointer(root / generation / 'DELTA')
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+    """Index of the most similar centroid for every row, in bounded-memory chunks."""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_size):
+        block = vectors[start:start + chunk_size]
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on a sample of ``vectors`` (rows must be unit length)."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), max(nlist * 64, 10_000))
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # Re-seed clusters that lost all their points
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        norms[empty] = 1.0
+        centroids = (sums / norms).astype(DTYPE)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index mapping integer ids to unit float32 vectors."""
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        offsets: np.ndarray,
+        delta_vectors: np.ndarray | None = None,
+        delta_ids: np.ndarray | None = None,
+        deleted: np.ndarray | None = None,
+    ):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+        dims = vectors.shape[1] if vectors.ndim == 2 else centroids.shape[1]
+        self.delta_vectors = delta_vectors if delta_vectors is not None else np.empty((0, dims), DTYPE)
+        self.delta_ids = delta_ids if delta_ids is not None else np.empty(0, np.int64)
+        self.deleted = deleted if deleted is not None else np.empty(0, np.int64)
+        self.directory: Path | None = None
+
+    @classmethod
+    def build(cls, ids, vectors, nlist: int | None = None, iterations: int = 10, seed: int = 0) -> IVFIndex:
+        """Cluster ``vectors`` (unit rows) and lay them out list by list."""
+        vectors = as_matrix(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) != len(vectors):
+            raise ValueError('ids and vectors must have the same length')
+        if len(vectors) == 0:
+            raise ValueError('cannot build an index from zero vectors')
+        if nlist is None:
+            nlist = int(np.sqrt(len(vectors)))
+        nlist = max(1, min(nlist, len(vectors)))
+
+        centroids = train_centroids(vectors, nlist, iterations, seed)
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind='stable')
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(labels, minlength=nlist))
+        return cls(centroids, vectors[order], ids[order], offsets)
+
+    def __len__(self) -> int:
+        return len(self.ids) + len(self.delta_ids) - len(self.deleted)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        churn = len(self.delta_ids) + len(self.deleted)
+        return churn > max(MIN_REBUILD_DELTA, REBUILD_RATIO * len(self.ids))
+
+    def upsert(self, ids, vectors) -> None:
+        """Add or replace vectors; replaced base entries are tombstoned."""
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = as_matrix(vectors)
+        self.remove(ids)
+        self.delta_ids = np.concatenate([self.delta_ids, ids])
+        self.delta_vectors = np.concatenate([self.delta_vectors, vectors])
+
+    def remove(self, ids) -> None:
+        ids = np.asarray(ids, dtype=np.int64)
+        keep = ~np.isin(self.delta_ids, ids)
+        self.delta_ids = self.delta_ids[keep]
+        self.delta_vectors = self.delta_vectors[keep]
+        in_base = ids[np.isin(ids, self.ids)]
+        self.deleted = np.union1d(self.deleted, in_base)
+
+    def search(self, query, k: int = 10, nprobe: int = 8) -> list[tuple[int, float]]:
+        """Return up to ``k`` ``(id, similarity)`` pairs, most similar first."""
+        query = np.ascontiguousarray(query, dtype=DTYPE).reshape(-1)
+        probe, _ = top_k(self.centroids @ query, nprobe)
+
+        id_parts = [self.delta_ids]
+        score_parts = [self.delta_vectors @ query]
+        for cluster in probe:
+            start, end = self.offsets[cluster], self.offsets[cluster + 1]
+            if start == end:
+                continue
+            id_parts.append(self.ids[start:end])
+            score_parts.append(self.vectors[start:end] @ query)
+
+        ids = np.concatenate(id_parts)
+        scores = np.concatenate(score_parts)
+        if len(self.deleted):
+            # Tombstones only apply to base rows; delta rows are always live.
+            live = np.ones(len(ids), dtype=bool)
+            live[len(self.delta_ids):] = ~np.isin(ids[len(self.delta_ids):], self.deleted)
+            ids, scores = ids[live], scores[live]
+        order, best = top_k(scores, k)
+        return [(int(i), float(s)) for i, s in zip(ids[order], best, strict=True)]
+
+    # Persistence
+
+    def save(self, root: Path | str) -> None:
+        """Write a new generation under ``root`` and make it current."""
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        previous = _current_generation(root)
+        generation = _next_name('gen', previous)
+        directory = root / generation
+        directory.mkdir()
+        for name in BASE_FILES:
+            np.save(directory / f'{name}.npy', np.asarray(getattr(self, name)))
+        self._save_delta(directory)
+
+        _write_pointer(root / 'CURRENT', generation)
+        self.directory = directory
+        if previous:
+            shutil.rmtree(root / previous, ignore_errors=True)
+
+    def save_delta(self) -> None:
+        """Persist only the delta/tombstone arrays of the loaded generation."""
+        self._save_delta(self.directory)
+
+    def _save_delta(self, directory: Path) -> None:
+        """Write the delta arrays to a new delta directory and publish it."""
+        previous = _read_pointer(directory / 'DELTA')
+        name = _next_name('delta', previous)
+        (directory / name).mkdir()
+        for array_name in DELTA_FILES:
+            np.save(directory / name / f'{array_name}.npy', np.asarray(getattr(self, array_name)))
+        _write_pointer(directory / 'DELTA', name)
+        if previous:
+            shutil.rmtree(directory / previous, ignore_errors=True)
+
+    @classmethod
+    def load(cls, root: Path | str, mmap: bool = True, attempts: int = 3) -> IVFIndex | None:
+        """Open the current generation under ``root``, or None if there is none.
+
+        A writer removes the generation or delta it supersedes, so a load
+        that read a pointer just before a publish can find its files gone;
+        it then retries with the new pointers.
+        """
+        root = Path(root)
+        for attempt in range(attempts):
+            version = current_version(root)
+            if version is None:
+                return None
+            generation, delta = version
+            directory = root / generation
+            # Generations written before DELTA existed keep the arrays inline
+            delta_directory = directory / delta if delta else directory
+            try:
+                mode = 'r' if mmap else None
+                base = {name: np.load(directory / f'{name}.npy', mmap_mode=mode) for name in BASE_FILES}
+                arrays = {name: np.load(delta_directory / f'{name}.npy') for name in DELTA_FILES}
+            except FileNotFoundError:
+                if attempt == attempts - 1:
+                    raise
+                continue
+            index = cls(**base, **arrays)
+            index.directory = directory
+            return index
+        return None
+
+
+def _current_generation(root: Path) -> str | None:
+    return _read_pointer(root / 'CURRENT')
@@ -0,0 +1,103 @@
+"""Candidates grouped by pipeline stage (the recruiter board view).
+
+One query returns the (stage, candidate) pairs for every bucket, limited
+per stage with a ROW_NUMBER() window, and each distinct candidate is then
+loaded and serialized exactly once no matter how many buckets it sits in.
+
+Buckets are paginated independently: each one is ordered by candidate id
+(newest first) and its ``next_cursor`` is the last id returned. Passing
+``cursors={'SCREENING': 123}`` continues that bucket after candidate 123.
+"""
+from __future__ import annotations
+
+from django.db.models import Count, F, Q, QuerySet, Window
+from django.db.models.functions import RowNumber
+
+from .models import Candidate
+from .serializers import CandidateSerializer
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def parse_cursors(raw: str | None) -> dict[str, int]:
+    """Parse ``"SCREENING:123,INTERVIEW:45"`` into ``{'SCREENING': 123, ...}``.
+
+    Raises ValueError on malformed input.
+    """
+    cursors: dict[str, int] = {}
+    if not raw:
+        return cursors
+    for part in raw.split(','):
+        stage, sep, candidate_id = part.partition(':')
+        if not sep:
+            raise ValueError(f"Invalid cursor segment: {part!r}")
+        cursors[stage.strip().upper()] = int(candidate_id)
+    return cursors
+
+
+def candidates_by_stage(
+    applications: QuerySet,
+    stages: list[str],
+    limit: int = DEFAULT_LIMIT,
+    cursors: dict[str, int] | None = None,
+    context: dict | None = None,
+) -> dict[str, dict[str, object]]:
+    """Return ``{stage: {'results': [...], 'next_cursor': id | None}}``.
+
+    Args:
+        applications: Application queryset to group (already filtered).
+        stages: Stage values to return buckets for, in display order.
+        limit: Maximum candidates per bucket.
+        cursors: Per-stage candidate id to continue after.
+        context: Serializer context (request, view).
+    """
+    cursors = cursors or {}
+    bucket_filter = Q()
+    for stage in stages:
+        condition = Q(stage=stage)
+        if stage in cursors:
+            condition &= Q(candidate_id__lt=cursors[stage])
+        bucket_filter |= condition
+
+    # GROUP BY (stage, candidate) dedupes candidates with several applications
+    # in the same stage; the window then ranks candidates inside each stage.
+    pairs = (
+        applications.filter(bucket_filter)
+        .values('stage', 'candidate_id')
+        .annotate(applications=Count('pk'))
+        .annotate(rank=Window(
+            RowNumber(),
+            partition_by=F('stage'),
+            order_by=F('candidate_id').desc(),
+        ))
+        .filter(rank__lte=limit + 1)
+        .values_list('stage', 'candidate_id', 'rank')
+        .order_by()
+    )
+
+    buckets: dict[str, list[tuple[int, int]]] = {stage: [] for stage in stages}
+    for stage, candidate_id, rank in pairs:
+        buckets[stage].append((rank, candidate_id))
+
+    page_ids: dict[str, list[int]] = {}
+    next_cursors: dict[str, int | None] = {}
+    for stage, ranked in buckets.items():
+        ids = [candidate_id for _, candidate_id in sorted(ranked)]
+        page_ids[stage] = ids[:limit]
+        next_cursors[stage] = ids[limit - 1] if len(ids) > limit else None
+
+    unique_ids = {candidate_id for ids in page_ids.values() for candidate_id in ids}
+    candidates = Candidate.objects.filter(pk__in=unique_ids)
+    serialized = {
+        row['id']: row
+        for row in CandidateSerializer(candidates, many=True, context=context or {}).data
+    }
+
+    return {
+        stage: {
+            'results': [serialized[pk] for pk in page_ids[stage] if pk in serialized],
+            'next_cursor': next_cursors[stage],
+        }
+        for stage in stages
+    }
@@ -0,0 +1,131 @@
+"""Two-tier embedding cache keyed by (model, sha256(text)).
+
+Tier 1 is a per-process LRU of packed float32 vectors; tier 2 is the
+candidates.Embedding table, shared by every worker. Only texts missing
+from both tiers reach the embedding API, in a single batched call, so a
+job description is embedded once and then reused for every applicant,
+every retry and every re-score.
+
+Vectors are L2-normalized before they are stored, so cosine similarity
+is a dot product (see candidates.similarity), and are kept as contiguous
+float32 arrays (4 bytes per dimension) rather than Python float lists
+(~32 bytes per dimension).
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from .similarity import DTYPE, normalize
+
+EmbedFn = Callable[[list[str]], Sequence[Sequence[float]]]
+
+DEFAULT_LRU_SIZE = 4096
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def unpack(data: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(data), dtype=DTYPE)
+
+
+class LRUCache:
+    """Thread-safe bounded mapping with least-recently-used eviction."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> np.ndarray | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: tuple[str, str], value: np.ndarray) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_lru = LRUCache(getattr(settings, 'EMBEDDING_CACHE_SIZE', DEFAULT_LRU_SIZE))
+
+
+class EmbeddingStore:
+    """Look up embeddings for ``model``, computing misses with ``embed``.
+
+    Args:
+        model: Embedding model name; part of the cache key.
+        embed: Callable taking a list of texts and returning one vector per
+            text, in order. Only called with cache misses.
+    """
+
+    def __init__(self, model: str, embed: EmbedFn, lru: LRUCache | None = None):
+        self.model = model
+        self.embed = embed
+        self.lru = lru if lru is not None else _lru
+
+    def get(self, text: str) -> np.ndarray:
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> list[np.ndarray]:
+        """Return vectors for ``texts`` in order; duplicates are embedded once."""
+        from .models import Embedding
+
+        hashes = [text_hash(text) for text in texts]
+        found: dict[str, np.ndarray] = {}
+        for digest in set(hashes):
+            vector = self.lru.get((self.model, digest))
+            if vector is not None:
+                found[digest] = vector
+
+        missing = {digest for digest in hashes if digest not in found}
+        if missing:
+            rows = Embedding.objects.filter(
+                model=self.model, text_hash__in=missing,
+            ).values_list('text_hash', 'vector')
+            for digest, data in rows:
+                found[digest] = unpack(data)
+                self.lru.put((self.model, digest), found[digest])
+                missing.discard(digest)
+
+        if missing:
+            texts_by_hash = {digest: text for digest, text in zip(hashes, texts, strict=True)}
+            pending = sorted(missing)
+            vectors = normalize(self.embed([texts_by_hash[digest] for digest in pending]))
+            new_rows = []
+            for digest, vector in zip(pending, vectors, strict=True):
+                found[digest] = vector
+                self.lru.put((self.model, digest), vector)
+                new_rows.append(Embedding(
+                    model=self.model, text_hash=digest,
+                    dimensions=len(vector), vector=vector.tobytes(),
+                ))
+            # Another worker may have stored the same text concurrently.
+            Embedding.objects.bulk_create(new_rows, ignore_conflicts=True)
+
+        return [found[digest] for digest in hashes]
+
+    def get_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Return the vectors for ``texts`` stacked into one (n, d) float32 matrix."""
+        if not texts:
+            return np.empty((0, 0), dtype=DTYPE)
+        return np.stack(self.get_many(texts))
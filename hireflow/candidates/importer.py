@@ -0,0 +1,216 @@
+"""Bulk candidate import from CSV or NDJSON.
+
+Rows are read from the file as a stream and handled in chunks of
+``chunk_size`` (default 1000). Per chunk:
+
+- every row is validated with the Candidate model fields' own validators
+  (required names and email, lengths, email and URL format), no queries;
+- emails already in the database are found with one ``email__in`` query;
+- new candidates are written with one ``bulk_create``;
+- with a target job, the missing applications are written with one more
+  ``bulk_create``.
+
+Only the current chunk is held in memory, so a million-row file costs
+about a thousand round trips of each kind and constant memory. Importing
+the same file twice is safe: known emails count as ``existing`` (and are
+still attached to the job), never as new rows.
+
+Used by ``POST /api/candidates/import/`` (through the
+``import_candidates_file`` task) and ``manage.py import_candidates``.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .models import Candidate
+
+FORMATS = ('csv', 'ndjson')
+FIELDS = ('first_name', 'last_name', 'email', 'phone', 'linkedin_url')
+REQUIRED = {'first_name', 'last_name', 'email'}
+CHUNK_SIZE = 1000
+# Row errors kept in the report; later ones are only counted
+MAX_ERRORS = 1000
+
+# (line number, row dict or None, parse error or None)
+Row = tuple[int, dict | None, str | None]
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    existing: int = 0
+    duplicates: int = 0
+    applications: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, line: int, errors: dict) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({'row': line, 'errors': errors})
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def format_for(filename: str) -> str | None:
+    """Import format implied by a file name, or None."""
+    extension = filename.rsplit('.', 1)[-1].lower()
+    return {'csv': 'csv', 'ndjson': 'ndjson', 'jsonl': 'ndjson'}.get(extension)
+
+
+def read_rows(stream, file_format: str) -> Iterator[Row]:
+    """Parse ``stream`` (text or binary, UTF-8) lazily into rows."""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+            continue
+        if isinstance(row, dict):
+            yield line_number, row, None
+        else:
+            yield line_number, None, 'Expected a JSON object'
+
+
+def clean_row(raw: dict) -> tuple[dict, dict]:
+    """Validated Candidate fields of ``raw`` and the per-field errors."""
+    data, errors = {}, {}
+    for name in FIELDS:
+        value = raw.get(name)
+        value = '' if value is None else str(value).strip()
+        if not value:
+            if name in REQUIRED:
+                errors[name] = 'This field is required.'
+            continue
+        try:
+            data[name] = Candidate._meta.get_field(name).clean(value, None)
+        except ValidationError as e:
+            errors[name] = ' '.join(e.messages)
+    return data, errors
+
+
+def _chunks(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def import_candidates(
+    rows: Iterable[Row],
+    company=None,
+    job=None,
+    stage: str = 'NEW',
+    chunk_size: int = CHUNK_SIZE,
+    progress: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """Import parsed rows (see read_rows) chunk by chunk.
+
+    Args:
+        rows: (line, row, parse error) tuples.
+        company: Company the new candidates belong to; emails owned by
+            another company are reported as errors.
+        job: If given, every imported or existing candidate gets an
+            application for this job, in ``stage``.
+        chunk_size: Rows validated and written per transaction.
+        progress: Called with the report after every chunk.
+    """
+    report = ImportReport()
+    for chunk in _chunks(rows, chunk_size):
+        valid = {}
+        for line, raw, parse_error in chunk:
+            report.rows += 1
+            if parse_error:
+                report.add_error(line, {'row': parse_error})
+                continue
+            data, errors = clean_row(raw)
+            if errors:
+                report.add_error(line, errors)
+            elif data['email'] in valid:
+                report.duplicates += 1
+            else:
+                valid[data['email']] = (line, data)
+        if valid:
+            try:
+                _write_chunk(valid, report, company, job, stage)
+            except IntegrityError:
+                # A concurrent writer inserted one of the emails after the
+                # lookup; the retry's lookup sees it
+                _write_chunk(valid, report, company, job, stage)
+        if progress:
+            progress(report)
+    return report
+
+
+def _write_chunk(valid: dict, report: ImportReport, company, job, stage: str) -> None:
+    from pipeline.models import Application
+    from pipeline.signals import applications_created
+
+    from .matching import has_index
+    from .tasks import update_match_index
+
+    company_id = company.pk if company is not None else None
+    counts = {'existing': 0, 'created': 0, 'applications': 0}
+    errors = []
+    with transaction.atomic():
+        found = {
+            email: (pk, owner)
+            for email, pk, owner in Candidate.objects.filter(email__in=list(valid)).values_list(
+                'email', 'id', 'company_id',
+            )
+        }
+        candidate_ids, new = [], []
+        for email, (line, data) in valid.items():
+            if email not in found:
+                new.append(Candidate(company_id=company_id, **data))
+            elif company_id is not None and found[email][1] != company_id:
+                errors.append((line, {'email': 'A candidate with this email belongs to another company.'}))
+            else:
+                candidate_ids.append(found[email][0])
+        counts['existing'] = len(candidate_ids)
+
+        created = Candidate.objects.bulk_create(new)
+        counts['created'] = len(created)
+        created_ids = [candidate.pk for candidate in created]
+        candidate_ids += created_ids
+
+        if job is not None and candidate_ids:
+            applied = set(
+                Application.objects.filter(job=job, candidate_id__in=candidate_ids).values_list(
+                    'candidate_id', flat=True,
+                )
+            )
+            applications = Application.objects.bulk_create([
+                Application(job=job, candidate_id=pk, stage=stage) for pk in candidate_ids if pk not in applied
+            ])
+            counts['applications'] = len(applications)
+            if applications:
+                applications_created.send(sender=Application, applications=applications)
+
+        # bulk_create fires no post_save, so update the matching index here
+        if created_ids and has_index(company_id):
+            transaction.on_commit(lambda: update_match_index.delay(company_id, created_ids))
+
+    for name, count in counts.items():
+        setattr(report, name, getattr(report, name) + count)
+    for line, error in errors:
+        report.add_error(line, error)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from candidates import storage
+
+
+class Command(BaseCommand):
+    help = 'Delete resume files that no candidate has referenced for the grace period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=float,
+            help="Seconds a blob stays unreferenced before deletion (default: RESUME_STORAGE['GRACE_PERIOD']).",
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help="Blobs deleted per transaction (default: RESUME_STORAGE['GC_BATCH_SIZE']).",
+        )
+        parser.add_argument(
+            '--sweep', action='store_true',
+            help='Also walk the storage directory for files without a blob record.',
+        )
+
+    def handle(self, *args, **options):
+        stats = storage.collect_garbage(batch_size=options['batch_size'], grace=options['grace'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {stats['deleted']} blobs ({stats['freed_bytes']} bytes) in {stats['batches']} batches, "
+            f"repaired {stats['repaired']} reference counts."
+        ))
+        if options['sweep']:
+            removed = storage.sweep_orphans(grace=options['grace'], batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Swept {removed} orphaned files.'))
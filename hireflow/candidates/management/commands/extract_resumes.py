@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from candidates.models import Candidate
+from candidates.tasks import extract_resume_text
+
+
+class Command(BaseCommand):
+    help = 'Queue resume text extraction for candidates whose resume has not been extracted yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Also queue candidates already extracted (cached files are not parsed again).',
+        )
+        parser.add_argument(
+            '--sync', action='store_true',
+            help='Extract in this process instead of queueing tasks.',
+        )
+
+    def handle(self, *args, **options):
+        candidates = Candidate.objects.exclude(resume='').exclude(resume__isnull=True)
+        if not options['all']:
+            candidates = candidates.filter(resume_hash='')
+        candidate_ids = candidates.order_by('pk').values_list('pk', flat=True)
+
+        count = 0
+        for candidate_id in candidate_ids.iterator():
+            if options['sync']:
+                extract_resume_text(candidate_id)
+            else:
+                extract_resume_text.delay(candidate_id)
+            count += 1
+        verb = 'Extracted' if options['sync'] else 'Queued'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {count} resumes.'))
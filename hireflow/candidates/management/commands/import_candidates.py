@@ -0,0 +1,69 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from candidates.importer import CHUNK_SIZE, FORMATS, format_for, import_candidates, read_rows
+from jobs.models import Job
+from pipeline.models import Application
+from tenants.models import Company
+
+
+class Command(BaseCommand):
+    help = 'Bulk import candidates from a CSV or NDJSON file (use - for stdin).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - to read stdin.')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension.')
+        parser.add_argument('--company', help='Slug of the company the candidates belong to.')
+        parser.add_argument('--job', type=int, help='Also apply every candidate to this job.')
+        parser.add_argument(
+            '--stage', choices=Application.Stage.values, default=Application.Stage.NEW,
+            help='Stage of the applications created with --job (default: NEW).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help=f'Rows validated and written per transaction (default: {CHUNK_SIZE}).',
+        )
+        parser.add_argument(
+            '--show-errors', type=int, default=20,
+            help='Number of row errors to print (default: 20).',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or format_for(path)
+        if file_format is None:
+            raise CommandError('Cannot tell the file format from its name; pass --format.')
+        try:
+            company = Company.objects.get(slug=options['company']) if options['company'] else None
+            job = Job.objects.for_company(company).get(pk=options['job']) if options['job'] else None
+        except (Company.DoesNotExist, Job.DoesNotExist) as e:
+            raise CommandError(str(e)) from e
+
+        started = time.monotonic()
+
+        def progress(report):
+            elapsed = time.monotonic() - started
+            self.stderr.write(
+                f'{report.rows} rows, {report.created} created, {report.existing} existing, '
+                f'{report.failed} failed ({report.rows / max(elapsed, 1e-9):,.0f} rows/s)'
+            )
+
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            report = import_candidates(
+                read_rows(stream, file_format), company=company, job=job, stage=options['stage'],
+                chunk_size=options['chunk_size'], progress=progress,
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for error in report.errors[:options['show_errors']]:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {report.rows} rows in {time.monotonic() - started:.1f}s: {report.created} created, '
+            f'{report.existing} existing, {report.duplicates} duplicates, {report.failed} failed, '
+            f'{report.applications} applications.'
+        ))
@@ -0,0 +1,171 @@
+"""Per-company "best candidates for this job" matching on top of candidates.ann.
+
+Each tenant (tenants.Company) has its own IVF index of candidate profile
+embeddings under ``settings.MATCH_INDEX_ROOT/company_<id>``; candidates
+without a company share ``company_none``. Readers keep the memory-mapped
+index open per process and reopen it when another process publishes a
+new generation. Writers serialize on a per-index file lock. A build
+reads the candidates without holding the lock; updates arriving
+meanwhile are journaled and replayed on the new generation, so a build
+never loses them. Indexes are
+always built and queried with the primary embedding provider, never the
+rate-limit fallback, so an index holds a single embedding space.
+"""
+from __future__ import annotations
+
+import fcntl
+import logging
+import threading
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from .ann import IVFIndex, current_version
+
+logger = logging.getLogger(__name__)
+
+BUILD_CHUNK_SIZE = 1000
+DEFAULT_NPROBE = 8
+# Journal of ids updated while a build runs: <root>/pending-<build id>
+PENDING_PREFIX = 'pending-'
+
+_loaded: dict[Path, tuple[tuple[str, str | None], IVFIndex]] = {}
+_loaded_lock = threading.Lock()
+
+
+def index_root(company_id: int | None) -> Path:
+    root = Path(getattr(settings, 'MATCH_INDEX_ROOT', settings.BASE_DIR / 'var' / 'match_index'))
+    return root / f"company_{company_id if company_id is not None else 'none'}"
+
+
+@contextmanager
+def _write_lock(root: Path) -> Iterator[None]:
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / '.lock', 'w') as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _candidate_vectors(candidates) -> np.ndarray:
+    from .tasks import _candidate_texts, _store
+    return _store().get_matrix(_candidate_texts(list(candidates)))
+
+
+def _company_candidates(company_id: int | None):
+    from .models import Candidate
+    return Candidate.objects.filter(company_id=company_id).only(
+        'id', 'first_name', 'last_name', 'email', 'linkedin_url', 'resume_hash',
+    ).order_by('pk')
+
+
+def has_index(company_id: int | None) -> bool:
+    return (index_root(company_id) / 'CURRENT').exists()
+
+
+def get_index(company_id: int | None) -> IVFIndex | None:
+    """Return the current index for a company, reopening it after any update.
+
+    The cache key is the published generation and delta, which every
+    rebuild or delta update replaces.
+    """
+    root = index_root(company_id)
+    version = current_version(root)
+    if version is None:
+        return None
+    with _loaded_lock:
+        cached = _loaded.get(root)
+        if cached and cached[0] == version:
+            return cached[1]
+    index = IVFIndex.load(root)
+    if index is not None:
+        with _loaded_lock:
+            _loaded[root] = (version, index)
+    return index
+
+
+def build_index(company_id: int | None) -> int:
+    """(Re)build a company's index from scratch; returns the number of vectors.
+
+    Candidates updated while the build reads and embeds are recorded in
+    its journal by update_candidates and re-applied once the new
+    generation is current.
+    """
+    from .tasks import _chunks
+
+    root = index_root(company_id)
+    journal = root / f'{PENDING_PREFIX}{uuid.uuid4().hex}'
+    with _write_lock(root):
+        journal.touch()
+    try:
+        ids, blocks = [], []
+        for chunk in _chunks(_company_candidates(company_id).iterator(chunk_size=BUILD_CHUNK_SIZE), BUILD_CHUNK_SIZE):
+            ids.extend(candidate.pk for candidate in chunk)
+            blocks.append(_candidate_vectors(chunk))
+        if not ids:
+            return 0
+
+        index = IVFIndex.build(ids, np.concatenate(blocks))
+        with _write_lock(root):
+            index.save(root)
+            pending = sorted({int(line) for line in journal.read_text().split()})
+            journal.unlink()
+    finally:
+        with suppress(FileNotFoundError):
+            journal.unlink()
+    logger.info("Match index built: company=%s, candidates=%d, lists=%d", company_id, len(ids), index.nlist)
+    if pending:
+        update_candidates(company_id, pending)
+    return len(ids)
+
+
+def update_candidates(company_id: int | None, candidate_ids: list[int]) -> bool:
+    """Apply creates, edits and deletes of ``candidate_ids`` to a company's index.
+
+    Ids that no longer exist in the company are removed. The ids are also
+    journaled for every build in progress. A company without an index is
+    otherwise skipped, and its next build picks the candidates up.
+    Returns True when the delta segment has grown enough to warrant a rebuild.
+    """
+    root = index_root(company_id)
+    if not root.exists():
+        return False
+    with _write_lock(root):
+        for journal in root.glob(f'{PENDING_PREFIX}*'):
+            with open(journal, 'a') as handle:
+                handle.write(''.join(f'{pk}\n' for pk in candidate_ids))
+    if not has_index(company_id):
+        return False
+
+    current = list(_company_candidates(company_id).filter(pk__in=candidate_ids))
+    gone = sorted(set(candidate_ids) - {candidate.pk for candidate in current})
+    vectors = _candidate_vectors(current) if current else None
+    with _write_lock(root):
+        index = IVFIndex.load(root)
+        if gone:
+            index.remove(gone)
+        if current:
+            index.upsert([candidate.pk for candidate in current], vectors)
+        index.save_delta()
+    return index.needs_rebuild
+
+
+def match_candidates(job, k: int = 10, nprobe: int = DEFAULT_NPROBE) -> list[tuple[int, float]] | None:
+    """Top-``k`` ``(candidate_id, similarity)`` for ``job`` within its company.
+
+    Returns None when the company has no index yet, and no matches when
+    it has no candidates (build_index writes no index for those).
+    """
+    from .tasks import MAX_INPUT_CHARS, _job_text, _store
+
+    index = get_index(job.company_id)
+    if index is None:
+        return None if _company_candidates(job.company_id).exists() else []
+    query = _store().get(_job_text(job)[:MAX_INPUT_CHARS])
+    return index.search(query, k=k, nprobe=nprobe)
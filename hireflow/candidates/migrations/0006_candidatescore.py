@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0005_embedding'),
+        ('jobs', '0003_job_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('score', models.FloatField()),
+                ('scored_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='candidates.candidate')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_scores', to='jobs.job')),
+            ],
+            options={
+                'unique_together': {('candidate', 'job', 'model')},
+                'indexes': [models.Index(fields=['job', 'model', '-score'], name='score_job_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+from django.db import migrations
+
+PREFIX = 'ai_score_job_'
+BATCH_SIZE = 1000
+
+
+def _scored_candidates(Candidate):
+    # Portable pre-filter; the key prefix is checked in Python
+    return Candidate.objects.exclude(metadata={}).only('id', 'metadata').order_by('pk')
+
+
+def _job_id(key):
+    """Job id of an ``ai_score_job_<id>`` key, or None for a malformed key."""
+    suffix = key[len(PREFIX):]
+    return int(suffix) if suffix.isascii() and suffix.isdigit() else None
+
+
+def _score(result):
+    if not isinstance(result, dict):
+        return None
+    score = result.get('score')
+    return score if isinstance(score, (int, float)) and not isinstance(score, bool) else None
+
+
+def metadata_to_table(apps, schema_editor):
+    # metadata is free-form JSON: keys that don't parse are left in place,
+    # scores of deleted jobs and unusable values are dropped
+    Candidate = apps.get_model('candidates', 'Candidate')
+    CandidateScore = apps.get_model('candidates', 'CandidateScore')
+    Job = apps.get_model('jobs', 'Job')
+    job_ids = set(Job.objects.values_list('pk', flat=True))
+
+    scores, cleaned = [], []
+    for candidate in _scored_candidates(Candidate).iterator(chunk_size=BATCH_SIZE):
+        if not isinstance(candidate.metadata, dict):
+            continue
+        keys = [key for key in candidate.metadata if key.startswith(PREFIX) and _job_id(key) is not None]
+        if not keys:
+            continue
+        for key in keys:
+            result = candidate.metadata.pop(key)
+            job_id, score = _job_id(key), _score(result)
+            if job_id in job_ids and score is not None:
+                scores.append(CandidateScore(
+                    candidate_id=candidate.pk, job_id=job_id,
+                    model=str(result.get('model') or 'unknown')[:100], score=score,
+                ))
+        cleaned.append(candidate)
+        if len(cleaned) >= BATCH_SIZE:
+            CandidateScore.objects.bulk_create(scores, ignore_conflicts=True)
+            Candidate.objects.bulk_update(cleaned, ['metadata'])
+            scores, cleaned = [], []
+    CandidateScore.objects.bulk_create(scores, ignore_conflicts=True)
+    Candidate.objects.bulk_update(cleaned, ['metadata'])
+
+
+def table_to_metadata(apps, schema_editor):
+    Candidate = apps.get_model('candidates', 'Candidate')
+    CandidateScore = apps.get_model('candidates', 'CandidateScore')
+
+    by_candidate = {}
+    for row in CandidateScore.objects.order_by('scored_at').values('candidate_id', 'job_id', 'model', 'score'):
+        by_candidate.setdefault(row['candidate_id'], {})[f"{PREFIX}{row['job_id']}"] = {
+            'score': row['score'], 'model': row['model'],
+            'candidate_id': row['candidate_id'], 'job_id': row['job_id'],
+        }
+    candidates = list(Candidate.objects.filter(pk__in=by_candidate).only('id', 'metadata'))
+    for candidate in candidates:
+        candidate.metadata = {**candidate.metadata, **by_candidate[candidate.pk]}
+    Candidate.objects.bulk_update(candidates, ['metadata'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0006_candidatescore'),
+    ]
+
+    operations = [
+        migrations.RunPython(metadata_to_table, table_to_metadata),
+    ]
@@ -0,0 +1,26 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0007_move_metadata_scores'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['company', '-created_at', '-id'], name='cand_company_created_idx'),
+        ),
+        # The composite index leads with company, so the FK's own index is redundant
+        migrations.AlterField(
+            model_name='candidate',
+            name='company',
+            field=models.ForeignKey(
+                blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE,
+                related_name='candidates', to='tenants.company',
+            ),
+        ),
+    ]
@@ -0,0 +1,127 @@
+"""Full-text search structures for candidates (see candidates.search).
+
+SQLite: two FTS5 tables kept in sync by triggers, so bulk_create, update()
+and raw writes are indexed too:
+
+- candidates_candidate_fts: words of first_name, last_name and email
+  (external content, prefix indexes for 2 and 3 characters);
+- candidates_candidate_trgm: trigrams of "first_name last_name"
+  (contentless), for fuzzy matching, with candidates_candidate_trgm_vocab
+  exposing how many names contain each trigram.
+
+PostgreSQL: GIN expression indexes, maintained by the table itself: a
+tsvector over the same words, and a pg_trgm index over the name.
+
+Other databases get nothing; candidates.search falls back to prefix
+lookups there.
+"""
+from django.db import migrations
+
+SQLITE_TABLES = [
+    """
+    CREATE VIRTUAL TABLE candidates_candidate_fts USING fts5(
+        first_name, last_name, email,
+        content='candidates_candidate', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE candidates_candidate_trgm USING fts5(
+        name, content='', tokenize='trigram', detail='none'
+    )
+    """,
+    "CREATE VIRTUAL TABLE candidates_candidate_trgm_vocab USING fts5vocab(candidates_candidate_trgm, 'row')",
+]
+
+# Dropped with the table: a migration that rebuilds candidates_candidate
+# on SQLite runs these again
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER candidates_candidate_search_ai AFTER INSERT ON candidates_candidate BEGIN
+        INSERT INTO candidates_candidate_fts(rowid, first_name, last_name, email)
+            VALUES (new.id, new.first_name, new.last_name, new.email);
+        INSERT INTO candidates_candidate_trgm(rowid, name)
+            VALUES (new.id, new.first_name || ' ' || new.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER candidates_candidate_search_ad AFTER DELETE ON candidates_candidate BEGIN
+        INSERT INTO candidates_candidate_fts(candidates_candidate_fts, rowid, first_name, last_name, email)
+            VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+        INSERT INTO candidates_candidate_trgm(candidates_candidate_trgm, rowid, name)
+            VALUES ('delete', old.id, old.first_name || ' ' || old.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER candidates_candidate_search_au AFTER UPDATE OF first_name, last_name, email
+    ON candidates_candidate BEGIN
+        INSERT INTO candidates_candidate_fts(candidates_candidate_fts, rowid, first_name, last_name, email)
+            VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+        INSERT INTO candidates_candidate_trgm(candidates_candidate_trgm, rowid, name)
+            VALUES ('delete', old.id, old.first_name || ' ' || old.last_name);
+        INSERT INTO candidates_candidate_fts(rowid, first_name, last_name, email)
+            VALUES (new.id, new.first_name, new.last_name, new.email);
+        INSERT INTO candidates_candidate_trgm(rowid, name)
+            VALUES (new.id, new.first_name || ' ' || new.last_name);
+    END
+    """,
+]
+
+SQLITE_FORWARD = [
+    *SQLITE_TABLES,
+    *SQLITE_TRIGGERS,
+    # Index the existing rows
+    "INSERT INTO candidates_candidate_fts(candidates_candidate_fts) VALUES ('rebuild')",
+    """
+    INSERT INTO candidates_candidate_trgm(rowid, name)
+        SELECT id, first_name || ' ' || last_name FROM candidates_candidate
+    """,
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS candidates_candidate_search_ai',
+    'DROP TRIGGER IF EXISTS candidates_candidate_search_ad',
+    'DROP TRIGGER IF EXISTS candidates_candidate_search_au',
+    'DROP TABLE IF EXISTS candidates_candidate_trgm_vocab',
+    'DROP TABLE IF EXISTS candidates_candidate_fts',
+    'DROP TABLE IF EXISTS candidates_candidate_trgm',
+]
+
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    """
+    CREATE INDEX cand_search_fts_idx ON candidates_candidate USING GIN (
+        to_tsvector('simple'::regconfig,
+                    first_name || ' ' || last_name || ' ' || translate(email, '@.+_-', '     '))
+    )
+    """,
+    """
+    CREATE INDEX cand_search_trgm_idx ON candidates_candidate
+        USING GIN ((lower(first_name || ' ' || last_name)) gin_trgm_ops)
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    'DROP INDEX IF EXISTS cand_search_fts_idx',
+    'DROP INDEX IF EXISTS cand_search_trgm_idx',
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0008_candidate_company_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
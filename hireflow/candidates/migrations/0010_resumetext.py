@@ -0,0 +1,100 @@
+"""Extracted resume text (see candidates.resumes) and its search index.
+
+SQLite: an FTS5 table over candidates_resumetext.text kept in sync by
+triggers. Adding (and, backwards, removing) Candidate.resume_hash may
+rebuild candidates_candidate on SQLite, which drops the search triggers
+of 0009; they are recreated both ways.
+
+PostgreSQL: a GIN expression index on the text's tsvector.
+"""
+from importlib import import_module
+
+from django.db import migrations, models
+
+candidate_search = import_module('candidates.migrations.0009_candidate_search')
+
+SQLITE_CANDIDATE_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS candidates_candidate_search_ai',
+    'DROP TRIGGER IF EXISTS candidates_candidate_search_ad',
+    'DROP TRIGGER IF EXISTS candidates_candidate_search_au',
+    *candidate_search.SQLITE_TRIGGERS,
+]
+
+SQLITE_FORWARD = [
+    *SQLITE_CANDIDATE_TRIGGERS,
+    """
+    CREATE VIRTUAL TABLE candidates_resume_fts USING fts5(
+        text, content='candidates_resumetext', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER candidates_resumetext_search_ai AFTER INSERT ON candidates_resumetext BEGIN
+        INSERT INTO candidates_resume_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER candidates_resumetext_search_ad AFTER DELETE ON candidates_resumetext BEGIN
+        INSERT INTO candidates_resume_fts(candidates_resume_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER candidates_resumetext_search_au AFTER UPDATE OF text ON candidates_resumetext BEGIN
+        INSERT INTO candidates_resume_fts(candidates_resume_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO candidates_resume_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS candidates_resumetext_search_ai',
+    'DROP TRIGGER IF EXISTS candidates_resumetext_search_ad',
+    'DROP TRIGGER IF EXISTS candidates_resumetext_search_au',
+    'DROP TABLE IF EXISTS candidates_resume_fts',
+]
+
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX resume_search_fts_idx ON candidates_resumetext
+        USING GIN (to_tsvector('simple'::regconfig, text))
+    """,
+]
+
+POSTGRES_BACKWARD = [
+    'DROP INDEX IF EXISTS resume_search_fts_idx',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0009_candidate_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop,
+            candidate_search._run({'sqlite': SQLITE_CANDIDATE_TRIGGERS}),
+        ),
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('kind', models.CharField(max_length=10)),
+                ('size', models.PositiveBigIntegerField()),
+                ('text', models.TextField(blank=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            candidate_search._run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            candidate_search._run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,52 @@
+"""Content-addressed resume storage (candidates.storage) and its blob records.
+
+Altering Candidate.resume rebuilds candidates_candidate on SQLite, which
+drops the search triggers of 0009; they are recreated both ways.
+"""
+from importlib import import_module
+
+from django.db import migrations, models
+
+import candidates.storage
+
+candidate_search = import_module('candidates.migrations.0009_candidate_search')
+resume_text = import_module('candidates.migrations.0010_resumetext')
+recreate_triggers = candidate_search._run({'sqlite': resume_text.SQLITE_CANDIDATE_TRIGGERS})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0010_resumetext'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, recreate_triggers),
+        migrations.AlterField(
+            model_name='candidate',
+            name='resume',
+            field=models.FileField(
+                blank=True, null=True, storage=candidates.storage.resume_storage, upload_to='resumes/',
+            ),
+        ),
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.IntegerField(default=0)),
+                ('released_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(
+                        condition=models.Q(('ref_count__lte', 0)), fields=['released_at'],
+                        name='blob_unreferenced_idx',
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(recreate_triggers, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
+from tenants.managers import TenantQuerySet
 from tenants.models import Company
+from .storage import resume_storage
 
 
 class Candidate(models.Model):
@@ -8,12 +10,118 @@ class Candidate(models.Model):
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=20, blank=True)
     linkedin_url = models.URLField(blank=True)
-    resume = models.FileField(upload_to='resumes/%Y/%m/', blank=True, null=True)
+    # Content-addressed: identical files are stored once (candidates.storage)
+    resume = models.FileField(upload_to='resumes/', storage=resume_storage, blank=True, null=True)
+    # sha256 of the resume file once its text is extracted (see ResumeText)
+    resume_hash = models.CharField(max_length=64, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     # Multi-tenant isolation
-    company = models.ForeignKey(Company, null=True, blank=True, on_delete=models.CASCADE, related_name='candidates')
-    # AI scoring: {"ai_score_job_42": {"score": 87.3, "model": "text-embedding-3-small", ...}}
+    # Indexed as the leading column of cand_company_created_idx
+    company = models.ForeignKey(
+        Company, null=True, blank=True, on_delete=models.CASCADE, related_name='candidates', db_index=False,
+    )
+    # Free-form extra data; AI scores live in CandidateScore
     metadata = models.JSONField(default=dict, blank=True)
 
+    objects = TenantQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='cand_created_idx'),
+            models.Index(fields=['company', '-created_at', '-id'], name='cand_company_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Resume the row pointed at when loaded, for blob reference counting
+        if 'resume' in instance.__dict__:
+            instance._loaded_resume = instance.__dict__['resume'] or ''
+        return instance
+
+
+class Embedding(models.Model):
+    """Cached text embedding keyed by (model, sha256 of the embedded text).
+
+    Vectors are L2-normalized and stored as packed float32 bytes
+    (4 bytes per dimension), see candidates.embeddings.
+    """
+    model = models.CharField(max_length=100)
+    text_hash = models.CharField(max_length=64)
+    dimensions = models.PositiveIntegerField()
+    vector = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [('model', 'text_hash')]
+
+    def __str__(self):
+        return f"Embedding({self.model}, {self.text_hash[:12]})"
+
+
+class ResumeBlob(models.Model):
+    """A file in the content-addressed resume storage (candidates.storage).
+
+    ``ref_count`` is the number of candidates whose resume is this file;
+    once it is zero for the grace period the blob is garbage collected.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.IntegerField(default=0)
+    # When the blob was uploaded or last lost its last reference
+    released_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Garbage collection: unreferenced blobs, oldest first
+            models.Index(
+                fields=['released_at'], name='blob_unreferenced_idx', condition=models.Q(ref_count__lte=0),
+            ),
+        ]
+
+    def __str__(self):
+        return f"ResumeBlob({self.name}, refs={self.ref_count})"
+
+
+class ResumeText(models.Model):
+    """Text extracted from a resume file, keyed by sha256 of the file's bytes.
+
+    Shared by every candidate whose resume has the same content, so a
+    re-upload or a duplicate is never parsed twice; see candidates.resumes.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=10)
+    size = models.PositiveBigIntegerField()
+    text = models.TextField(blank=True)
+    # Why no text could be extracted; the same bytes are not retried
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"ResumeText({self.kind}, {self.sha256[:12]})"
+
+
+class CandidateScore(models.Model):
+    """AI fit score (0-100) of a candidate for a job, per embedding model.
+
+    Written in bulk by candidates.tasks; the (job, -score) index serves
+    "applicants of this job, best match first".
+    """
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='scores')
+    job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name='candidate_scores')
+    model = models.CharField(max_length=100)
+    score = models.FloatField()
+    scored_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [('candidate', 'job', 'model')]
+        indexes = [
+            models.Index(fields=['job', 'model', '-score'], name='score_job_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate} — {self.job}: {self.score} ({self.model})"
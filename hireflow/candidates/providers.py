@@ -0,0 +1,249 @@
+"""Embedding providers used by candidate scoring and matching.
+
+A provider turns a list of texts into one vector per text. It splits the
+input into batches of ``batch_size`` and sends up to ``max_concurrency``
+batches at once. Each provider's ``name`` is the cache key under which
+candidates.embeddings stores its vectors, so vectors from different
+providers are never mixed.
+
+Backends (``settings.EMBEDDINGS['PROVIDER']``, registered in PROVIDERS
+and built by their ``from_config``):
+
+- ``openai``: the OpenAI embeddings API. One pooled HTTP client per
+  process, sized to the concurrency limit.
+- ``local``: deterministic feature hashing of words and character
+  trigrams. It needs no network, so the scoring pipeline can run in tests
+  and benchmarks offline. It is also the optional fallback
+  (``EMBEDDINGS['FALLBACK']``) when the remote provider is rate-limited.
+"""
+from __future__ import annotations
+
+import functools
+import re
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.conf import settings
+
+from .similarity import DTYPE, as_matrix
+
+DEFAULTS = {
+    'PROVIDER': 'openai',
+    'MODEL': 'text-embedding-3-small',
+    'BATCH_SIZE': 256,
+    'MAX_CONCURRENCY': 4,
+    'TIMEOUT': 30.0,
+    'MAX_RETRIES': 2,
+    'FALLBACK': None,
+    'LOCAL_DIMENSIONS': 512,
+}
+
+
+class ProviderError(RuntimeError):
+    """The provider is misconfigured or failed to embed a batch."""
+
+
+class RateLimitedError(ProviderError):
+    """The provider rejected the request because of rate or quota limits."""
+
+
+class EmbeddingProvider(ABC):
+    """Base class: batching and bounded concurrency around ``embed_batch``."""
+
+    name = 'base'
+
+    def __init__(self, batch_size: int = DEFAULTS['BATCH_SIZE'], max_concurrency: int = DEFAULTS['MAX_CONCURRENCY']):
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> EmbeddingProvider:
+        """Instantiate from an EMBEDDINGS dict (with DEFAULTS applied)."""
+        return cls(batch_size=config['BATCH_SIZE'], max_concurrency=config['MAX_CONCURRENCY'])
+
+    @abstractmethod
+    def embed_batch(self, texts: list[str]) -> Sequence[Sequence[float]]:
+        """Embed at most ``batch_size`` texts in one request."""
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return an (n, d) float32 matrix, one row per text, in order."""
+        texts = list(texts)
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if not batches:
+            return np.empty((0, 0), dtype=DTYPE)
+        if len(batches) == 1 or self.max_concurrency == 1:
+            results = [self.embed_batch(batch) for batch in batches]
+        else:
+            results = list(self._pool().map(self.embed_batch, batches))
+        return np.concatenate([as_matrix(result) for result in results])
+
+    __call__ = embed
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix=f'embed-{self.name}',
+                )
+            return self._executor
+
+
+class OpenAIProvider(EmbeddingProvider):
+    """OpenAI embeddings API with one keep-alive connection pool per process."""
+
+    def __init__(
+        self,
+        model: str = DEFAULTS['MODEL'],
+        api_key: str | None = None,
+        timeout: float = DEFAULTS['TIMEOUT'],
+        max_retries: int = DEFAULTS['MAX_RETRIES'],
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.name = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> OpenAIProvider:
+        return cls(
+            model=config['MODEL'],
+            api_key=config.get('API_KEY'),
+            timeout=config['TIMEOUT'],
+            max_retries=config['MAX_RETRIES'],
+            batch_size=config['BATCH_SIZE'],
+            max_concurrency=config['MAX_CONCURRENCY'],
+        )
+
+    @property
+    def client(self):
+        """The shared OpenAI client, created on first use.
+
+        Raises ProviderError if no API key is configured or the openai
+        package is missing.
+        """
+        with self._client_lock:
+            if self._client is None:
+                if not self.api_key:
+                    raise ProviderError("OPENAI_API_KEY not configured — set it in .env")
+                try:
+                    import httpx
+                    import openai  # type: ignore[import]
+                except ImportError as exc:
+                    raise ProviderError("openai package not installed: pip install openai>=1.0") from exc
+                limits = httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                )
+                self._client = openai.OpenAI(
+                    api_key=self.api_key,
+                    timeout=self.timeout,
+                    max_retries=self.max_retries,
+                    http_client=httpx.Client(limits=limits, timeout=self.timeout),
+                )
+            return self._client
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        client = self.client
+        import openai  # type: ignore[import]
+
+        try:
+            response = client.embeddings.create(model=self.name, input=texts)
+        except openai.RateLimitError as exc:
+            raise RateLimitedError(f"{self.name} rate limited: {exc}") from exc
+        except openai.OpenAIError as exc:
+            raise ProviderError(f"{self.name} request failed: {exc}") from exc
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+class HashingProvider(EmbeddingProvider):
+    """Local embeddings via signed feature hashing.
+
+    Each word and each character trigram of a word (with boundary
+    markers) is hashed with CRC-32 into one of ``dimensions`` buckets, and
+    the hash picks the sign. Weights are sublinear term frequencies. The
+    result is deterministic across processes and releases, unlike
+    ``hash()``. Texts that share vocabulary or spelling score as similar;
+    it captures no semantics beyond that.
+    """
+
+    def __init__(self, dimensions: int = DEFAULTS['LOCAL_DIMENSIONS'], **kwargs):
+        kwargs.setdefault('max_concurrency', 1)  # CPU-bound; threads would only contend
+        super().__init__(**kwargs)
+        self.dimensions = dimensions
+        self.name = f'local-hash-{dimensions}'
+
+    @classmethod
+    def from_config(cls, config: dict) -> HashingProvider:
+        return cls(
+            dimensions=config['LOCAL_DIMENSIONS'],
+            batch_size=config['BATCH_SIZE'],
+            max_concurrency=config['MAX_CONCURRENCY'],
+        )
+
+    def _features(self, text: str) -> list[str]:
+        features = []
+        for word in _TOKEN_RE.findall(text.lower()):
+            features.append(word)
+            padded = f'<{word}>'
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=DTYPE)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            hashes = np.fromiter((zlib.crc32(f.encode('utf-8')) for f in features), np.uint32, len(features))
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(DTYPE)
+            np.add.at(matrix[row], hashes % self.dimensions, signs)
+        # Sublinear tf: repeated terms matter, but not linearly
+        return np.sign(matrix) * np.log1p(np.abs(matrix))
+
+
+PROVIDERS: dict[str, type[EmbeddingProvider]] = {
+    'openai': OpenAIProvider,
+    'local': HashingProvider,
+}
+
+
+def _config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'EMBEDDINGS', {})}
+
+
+def build_provider(backend: str, config: dict | None = None) -> EmbeddingProvider:
+    """Instantiate the provider registered as ``backend`` from an EMBEDDINGS dict."""
+    try:
+        provider_class = PROVIDERS[backend]
+    except KeyError:
+        raise ProviderError(f"Unknown embedding provider {backend!r}; choose from {sorted(PROVIDERS)}") from None
+    return provider_class.from_config({**DEFAULTS, **(config or {})})
+
+
+@functools.lru_cache(maxsize=1)
+def get_provider() -> EmbeddingProvider:
+    """The configured provider, shared by every task in this process."""
+    config = _config()
+    return build_provider(config['PROVIDER'], config)
+
+
+@functools.lru_cache(maxsize=1)
+def get_fallback_provider() -> EmbeddingProvider | None:
+    """The provider to use when the primary one is rate-limited, if any."""
+    config = _config()
+    if not config['FALLBACK'] or config['FALLBACK'] == config['PROVIDER']:
+        return None
+    return build_provider(config['FALLBACK'], config)
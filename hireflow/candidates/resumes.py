@@ -0,0 +1,202 @@
+"""Resume text extraction, cached by file content.
+
+``extract(candidate)`` looks the sha256 of the candidate's resume up in
+candidates.ResumeText: a re-upload or another candidate's identical file
+costs one query. The hash comes from the file name in content-addressed
+storage (candidates.storage), or from reading the file once otherwise.
+Only unseen files are parsed:
+
+- plain text, decoded incrementally as UTF-8;
+- DOCX, with the standard library: word/document.xml is read from the
+  archive as a stream and parsed with iterparse, paragraph by paragraph;
+- PDF, with pypdf (pure Python), page by page.
+
+Files are never read into memory whole, and parsing stops once
+RESUMES['MAX_TEXT_CHARS'] characters are extracted, so a huge or
+decompression-bomb file costs no more than a normal one.
+
+The stored text feeds the resume search index (see filter_resumes in
+candidates.search) and the candidate's embedding text (_candidate_texts
+in candidates.tasks). Extraction runs in the ``extract_resume_text`` task on
+its own worker queue (see CELERY_TASK_ROUTES).
+"""
+from __future__ import annotations
+
+import codecs
+import hashlib
+import logging
+import os
+import re
+import zipfile
+from collections.abc import Iterable, Iterator
+from xml.etree.ElementTree import iterparse
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Left
+
+from .models import ResumeText
+from .storage import sha256_of
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_TEXT_CHARS': 100_000,
+    'CHUNK_SIZE': 64 * 1024,
+}
+
+KINDS = ('text', 'pdf', 'docx')
+TEXT_EXTENSIONS = {'.txt', '.text', '.md'}
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_BLANKS_RE = re.compile(r'[^\S\n]+')
+
+
+class ExtractionError(Exception):
+    """The file's text could not be extracted (unsupported or malformed)."""
+
+
+def config(name: str):
+    return getattr(settings, 'RESUMES', {}).get(name, DEFAULTS[name])
+
+
+def file_hash(file) -> str:
+    """sha256 of a Django File's content, read in chunks."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks(config('CHUNK_SIZE')):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def kind_of(name: str, head: bytes) -> str:
+    """Resume kind from the file's first bytes, then its extension."""
+    extension = os.path.splitext(name)[1].lower()
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        if extension == '.docx':
+            return 'docx'
+        raise ExtractionError('Unsupported archive; only .docx is read')
+    if extension in TEXT_EXTENSIONS or b'\x00' not in head:
+        return 'text'
+    raise ExtractionError(f'Unsupported resume format {extension or "(no extension)"}')
+
+
+def _capped(pieces: Iterable[str], max_chars: int) -> str:
+    """Join ``pieces`` until ``max_chars``; later pieces are never produced."""
+    text, size = [], 0
+    for piece in pieces:
+        text.append(piece)
+        size += len(piece)
+        if size >= max_chars:
+            break
+    return ''.join(text)[:max_chars]
+
+
+def _text_pieces(file) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    for chunk in file.chunks(config('CHUNK_SIZE')):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def _docx_pieces(file) -> Iterator[str]:
+    try:
+        with zipfile.ZipFile(file) as archive, archive.open('word/document.xml') as document:
+            for _, element in iterparse(document):
+                if element.tag == f'{WORD_NS}t':
+                    yield element.text or ''
+                elif element.tag == f'{WORD_NS}tab':
+                    yield '\t'
+                elif element.tag in (f'{WORD_NS}br', f'{WORD_NS}cr'):
+                    yield '\n'
+                elif element.tag == f'{WORD_NS}p':
+                    yield '\n'
+                    element.clear()
+    except (zipfile.BadZipFile, KeyError, SyntaxError) as exc:
+        raise ExtractionError(f'Unreadable DOCX: {exc}') from exc
+
+
+def _pdf_pieces(file) -> Iterator[str]:
+    try:
+        import pypdf
+    except ImportError as exc:
+        raise ExtractionError('pypdf package not installed: pip install pypdf') from exc
+    try:
+        reader = pypdf.PdfReader(file)
+        if reader.is_encrypted and not reader.decrypt(''):
+            raise ExtractionError('Encrypted PDF')
+        for page in reader.pages:
+            yield page.extract_text() + '\n'
+    except ExtractionError:
+        raise
+    except Exception as exc:  # malformed PDFs fail in many different ways
+        raise ExtractionError(f'Unreadable PDF: {exc}') from exc
+
+
+EXTRACTORS = {
+    'text': _text_pieces,
+    'pdf': _pdf_pieces,
+    'docx': _docx_pieces,
+}
+
+
+def clean(text: str) -> str:
+    """Collapse runs of blanks and drop empty lines."""
+    lines = (_BLANKS_RE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def extract_text(file, kind: str, max_chars: int | None = None) -> str:
+    """Text of a Django File of ``kind``, at most ``max_chars`` characters.
+
+    Raises ExtractionError if the file cannot be read as ``kind``.
+    """
+    max_chars = max_chars or config('MAX_TEXT_CHARS')
+    return clean(_capped(EXTRACTORS[kind](file), max_chars))
+
+
+def extract(candidate) -> tuple[ResumeText | None, bool]:
+    """The candidate's resume text and whether it had to be extracted.
+
+    Returns (None, False) for a candidate without a resume. Files that
+    cannot be parsed get a ResumeText with an empty text and the error.
+    """
+    if not candidate.resume:
+        return None, False
+    with candidate.resume.open('rb') as file:
+        # Content-addressed names carry the hash already (candidates.storage)
+        sha256 = sha256_of(candidate.resume.name) or file_hash(file)
+        cached = ResumeText.objects.filter(sha256=sha256).first()
+        if cached is not None:
+            return cached, False
+
+        file.seek(0)
+        head = file.read(1024)
+        file.seek(0)
+        kind, text, error = '', '', ''
+        try:
+            kind = kind_of(candidate.resume.name, head)
+            text = extract_text(file, kind)
+        except ExtractionError as exc:
+            error = str(exc)[:255]
+            logger.warning('Resume extraction failed: candidate=%s, sha256=%s: %s', candidate.pk, sha256, exc)
+        size = candidate.resume.size
+
+    try:
+        with transaction.atomic():
+            return ResumeText.objects.create(sha256=sha256, kind=kind, size=size, text=text, error=error), True
+    except IntegrityError:
+        # Another worker extracted the same file meanwhile
+        return ResumeText.objects.get(sha256=sha256), False
+
+
+def texts(hashes: Iterable[str], max_chars: int) -> dict[str, str]:
+    """First ``max_chars`` characters of the resume text of each hash, in one query."""
+    hashes = {sha256 for sha256 in hashes if sha256}
+    if not hashes:
+        return {}
+    return dict(
+        ResumeText.objects.filter(sha256__in=hashes)
+        .annotate(head=Left('text', max_chars))
+        .values_list('sha256', 'head')
+    )
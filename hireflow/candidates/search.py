@@ -0,0 +1,289 @@
+"""Candidate full-text search on SQLite (FTS5) and PostgreSQL.
+
+The search structures are created by migrations 0009_candidate_search and
+0010_resumetext and maintained by the database itself (triggers on SQLite, expression indexes
+on PostgreSQL), so bulk_create, queryset.update() and raw SQL writes are
+searchable at once.
+
+A query is split into words; every word must match the start of a word of
+the candidate's first name, last name or email (``ada love`` finds
+``Ada Lovelace``, ``lovelace@`` finds the email). Matches are ranked by
+BM25 on SQLite and ts_rank on PostgreSQL, name columns weighing more
+than the email. Only the newest RANK_WINDOW matches are ranked, so a
+one-letter query costs no more than a precise one.
+
+Fuzzy matching tolerates typos: the name is indexed by trigrams
+(``lovelase`` shares ``lov``, ``ove``, ``vel``, ``ela``, ``las`` with
+``lovelace``) and candidates sharing the most trigrams with the query
+rank first, provided they share at least FUZZY_THRESHOLD of them. ``search`` only falls back to it when the prefix search finds
+fewer than ``limit`` candidates.
+
+- ``filter_candidates(queryset, text)`` narrows a queryset to the prefix
+  matches, unranked, for list endpoints (?q=, ?search=);
+- ``filter_resumes(queryset, text)`` does the same over the candidates'
+  extracted resume text (candidates.resumes, ?resume=);
+- ``search(text, ...)`` returns ranked matches with scores.
+
+On other databases both fall back to ``istartswith`` lookups.
+
+Note for migrations: on SQLite, Django rebuilds a table for some schema
+changes, which drops its triggers. A migration that rebuilds
+candidates_candidate must recreate them (as 0010_resumetext and
+0011_resumeblob do).
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# Words as the FTS5 unicode61 tokenizer and the tsvector expression split them
+WORD_RE = re.compile(r'[^\W_]+')
+MAX_WORDS = 8
+# Words shorter than a trigram cannot be fuzzy-matched
+MIN_FUZZY_LENGTH = 3
+# Share of the query's trigrams a fuzzy match must contain
+FUZZY_THRESHOLD = 0.5
+# Matches ranked per query, newest first: bounds the cost of broad
+# queries (``a`` matches most candidates) to a constant. Fuzzy matches
+# are scored over the same window.
+RANK_WINDOW = 2000
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+POSTGRES_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, "
+    "first_name || ' ' || last_name || ' ' || translate(email, '@.+_-', '     '))"
+)
+POSTGRES_NAME = "lower(first_name || ' ' || last_name)"
+POSTGRES_RESUME = "to_tsvector('simple'::regconfig, text)"
+
+
+@dataclass(frozen=True)
+class Match:
+    candidate_id: int
+    score: float
+    fuzzy: bool = False
+
+
+def words(text: str) -> list[str]:
+    return WORD_RE.findall(text.lower())[:MAX_WORDS]
+
+
+def _trigrams(word: str) -> list[str]:
+    return [word[i:i + 3] for i in range(len(word) - 2)]
+
+
+def _tenant_sql(company_id: int | None, alias: str) -> tuple[str, list]:
+    if company_id is None:
+        return '', []
+    return f' AND {alias}.company_id = %s', [company_id]
+
+
+def _fetch(sql: str, params: list) -> list[tuple]:
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+class SQLiteSearch:
+    # bm25 column weights: first_name, last_name, email
+    WEIGHTS = '10.0, 10.0, 3.0'
+
+    @staticmethod
+    def fts_query(terms: list[str]) -> str:
+        return ' AND '.join(f'"{term}"*' for term in terms)
+
+    def condition(self, terms: list[str]) -> Q:
+        return Q(pk__in=RawSQL(
+            'SELECT rowid FROM candidates_candidate_fts WHERE candidates_candidate_fts MATCH %s',
+            [self.fts_query(terms)],
+        ))
+
+    def resume_condition(self, terms: list[str]) -> Q:
+        return Q(resume_hash__in=RawSQL(
+            'SELECT sha256 FROM candidates_resumetext WHERE id IN ('
+            'SELECT rowid FROM candidates_resume_fts WHERE candidates_resume_fts MATCH %s)',
+            [self.fts_query(terms)],
+        ))
+
+    def ranked(self, terms: list[str], company_id: int | None, limit: int) -> list[Match]:
+        tenant, tenant_params = _tenant_sql(company_id, 'c')
+        # FTS5 yields matches in rowid order without sorting, so only the
+        # window's rows are scored
+        rows = _fetch(
+            'SELECT id, rank FROM ('
+            f'SELECT f.rowid AS id, bm25(candidates_candidate_fts, {self.WEIGHTS}) AS rank '
+            'FROM candidates_candidate_fts f JOIN candidates_candidate c ON c.id = f.rowid '
+            f'WHERE candidates_candidate_fts MATCH %s{tenant} ORDER BY f.rowid DESC LIMIT %s'
+            ') ORDER BY rank, id DESC LIMIT %s',
+            [self.fts_query(terms), *tenant_params, RANK_WINDOW, limit],
+        )
+        # bm25 is lower-is-better and negative
+        return [Match(pk, -rank) for pk, rank in rows]
+
+    def fuzzy(self, terms: list[str], company_id: int | None, limit: int) -> list[Match]:
+        """Names sharing at least FUZZY_THRESHOLD of the query's trigrams.
+
+        A name sharing ``needed`` of the ``n`` trigrams contains one of any
+        ``n - needed + 1`` of them, so only the rarest ones are looked up
+        (counts from the fts5vocab table). The newest RANK_WINDOW names
+        found are scored by the share of the query's trigrams they contain,
+        like pg_trgm's word_similarity.
+        """
+        trigrams = {trigram for term in terms for trigram in _trigrams(term)}
+        if not trigrams:
+            return []
+        needed = math.ceil(len(trigrams) * FUZZY_THRESHOLD)
+        counts = dict(_fetch(
+            'SELECT term, doc FROM candidates_candidate_trgm_vocab WHERE term IN ({})'.format(
+                ', '.join(['%s'] * len(trigrams)),
+            ),
+            sorted(trigrams),
+        ))
+        if len(counts) < needed:
+            return []
+        rarest = sorted(counts, key=counts.get)[:len(counts) - needed + 1]
+        tenant, tenant_params = _tenant_sql(company_id, 'c')
+        rows = _fetch(
+            'SELECT t.rowid, c.first_name, c.last_name '
+            'FROM candidates_candidate_trgm t JOIN candidates_candidate c ON c.id = t.rowid '
+            f'WHERE candidates_candidate_trgm MATCH %s{tenant} ORDER BY t.rowid DESC LIMIT %s',
+            [' OR '.join(f'"{trigram}"' for trigram in rarest), *tenant_params, RANK_WINDOW],
+        )
+        matches = []
+        for pk, first_name, last_name in rows:
+            shared = trigrams.intersection(_trigrams(f'{first_name} {last_name}'.lower()))
+            score = len(shared) / len(trigrams)
+            if score >= FUZZY_THRESHOLD:
+                matches.append(Match(pk, score, fuzzy=True))
+        matches.sort(key=lambda match: (-match.score, -match.candidate_id))
+        return matches[:limit]
+
+
+class PostgresSearch:
+    @staticmethod
+    def ts_query(terms: list[str]) -> str:
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def condition(self, terms: list[str]) -> Q:
+        return Q(pk__in=RawSQL(
+            f"SELECT id FROM candidates_candidate WHERE {POSTGRES_DOCUMENT} @@ to_tsquery('simple', %s)",
+            [self.ts_query(terms)],
+        ))
+
+    def resume_condition(self, terms: list[str]) -> Q:
+        return Q(resume_hash__in=RawSQL(
+            f"SELECT sha256 FROM candidates_resumetext WHERE {POSTGRES_RESUME} @@ to_tsquery('simple', %s)",
+            [self.ts_query(terms)],
+        ))
+
+    def ranked(self, terms: list[str], company_id: int | None, limit: int) -> list[Match]:
+        tenant, tenant_params = _tenant_sql(company_id, 'c')
+        rows = _fetch(
+            'SELECT id, rank FROM ('
+            f"SELECT c.id, ts_rank({POSTGRES_DOCUMENT}, q) AS rank "
+            "FROM candidates_candidate c, to_tsquery('simple', %s) q "
+            f"WHERE {POSTGRES_DOCUMENT} @@ q{tenant} ORDER BY c.id DESC LIMIT %s"
+            ') AS ranked ORDER BY rank DESC, id DESC LIMIT %s',
+            [self.ts_query(terms), *tenant_params, RANK_WINDOW, limit],
+        )
+        return [Match(pk, rank) for pk, rank in rows]
+
+    def fuzzy(self, terms: list[str], company_id: int | None, limit: int) -> list[Match]:
+        text = ' '.join(term for term in terms if len(term) >= MIN_FUZZY_LENGTH)
+        if not text:
+            return []
+        tenant, tenant_params = _tenant_sql(company_id, 'c')
+        rows = _fetch(
+            f"SELECT c.id, word_similarity(%s, {POSTGRES_NAME}) AS rank FROM candidates_candidate c "
+            f"WHERE %s <%% {POSTGRES_NAME}{tenant} ORDER BY rank DESC, c.id DESC LIMIT %s",
+            [text, text, *tenant_params, limit],
+        )
+        return [Match(pk, rank, fuzzy=True) for pk, rank in rows]
+
+
+class PrefixSearch:
+    """Fallback without a search index: istartswith on the searched fields."""
+
+    def condition(self, terms: list[str]) -> Q:
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(first_name__istartswith=term) | Q(last_name__istartswith=term) | Q(email__istartswith=term)
+            )
+        return condition
+
+    def resume_condition(self, terms: list[str]) -> Q:
+        from .models import ResumeText
+
+        resumes = ResumeText.objects.all()
+        for term in terms:
+            resumes = resumes.filter(text__icontains=term)
+        return Q(resume_hash__in=resumes.values('sha256'))
+
+    def ranked(self, terms: list[str], company_id: int | None, limit: int) -> list[Match]:
+        from .models import Candidate
+
+        queryset = Candidate.objects.filter(self.condition(terms))
+        if company_id is not None:
+            queryset = queryset.filter(company_id=company_id)
+        return [Match(pk, 1.0) for pk in queryset.order_by('-created_at').values_list('pk', flat=True)[:limit]]
+
+    def fuzzy(self, terms: list[str], company_id: int | None, limit: int) -> list[Match]:
+        return []
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearch,
+    'postgresql': PostgresSearch,
+}
+
+
+def backend():
+    return BACKENDS.get(connection.vendor, PrefixSearch)()
+
+
+def filter_candidates(queryset, text: str):
+    """``queryset`` narrowed to candidates matching every word of ``text``."""
+    terms = words(text)
+    if not terms:
+        return queryset
+    return queryset.filter(backend().condition(terms))
+
+
+def filter_resumes(queryset, text: str):
+    """``queryset`` narrowed to candidates whose resume text has every word of ``text``."""
+    terms = words(text)
+    if not terms:
+        return queryset
+    return queryset.filter(backend().resume_condition(terms))
+
+
+def search(text: str, company=None, limit: int = DEFAULT_LIMIT, fuzzy: bool = True) -> list[Match]:
+    """Best matches for ``text``: prefix matches by rank, then fuzzy ones.
+
+    Args:
+        text: Search text.
+        company: Restrict to this company's candidates (None: all).
+        limit: Maximum number of matches.
+        fuzzy: Fill up with typo-tolerant matches when the prefix search
+            finds fewer than ``limit``.
+    """
+    terms = words(text)
+    if not terms:
+        return []
+    search_backend = backend()
+    company_id = company.pk if company is not None else None
+    matches = search_backend.ranked(terms, company_id, limit)
+    if fuzzy and len(matches) < limit:
+        found = {match.candidate_id for match in matches}
+        for match in search_backend.fuzzy(terms, company_id, limit + len(matches)):
+            if match.candidate_id not in found and len(matches) < limit:
+                matches.append(match)
+                found.add(match.candidate_id)
+    return matches
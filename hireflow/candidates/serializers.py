@@ -1,8 +1,13 @@
 from rest_framework import serializers
+from hireflow.serializers import ValuesSerializer
+from tenants.serializers import TenantScopedFieldsMixin
+from jobs.models import Job
+from pipeline.models import Application
+from . import importer
 from .models import Candidate
 
 
-class CandidateSerializer(serializers.ModelSerializer):
+class CandidateSerializer(TenantScopedFieldsMixin, serializers.ModelSerializer):
     """Serializer for Candidate model.
 
     Note: fields='__all__' still in use — will be replaced with explicit
@@ -12,4 +17,29 @@ class CandidateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Candidate
         fields = '__all__'
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'resume_hash']
+
+
+class CandidateListSerializer(ValuesSerializer):
+    """CandidateSerializer output from values() rows, for the list."""
+    serializer_class = CandidateSerializer
+
+
+class CandidateImportSerializer(serializers.Serializer):
+    """Upload of POST /api/candidates/import/."""
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(
+        choices=importer.FORMATS, required=False, help_text='Defaults to the file extension',
+    )
+    job = serializers.IntegerField(required=False, help_text='Also apply every candidate to this job')
+    stage = serializers.ChoiceField(choices=Application.Stage.choices, default=Application.Stage.NEW)
+
+    def validate(self, attrs):
+        attrs.setdefault('file_format', importer.format_for(attrs['file'].name))
+        if attrs['file_format'] is None:
+            raise serializers.ValidationError({'file_format': 'Unknown file type; use .csv or .ndjson.'})
+        if 'job' in attrs:
+            company = self.context['request'].company
+            if not Job.objects.for_company(company).filter(pk=attrs['job']).exists():
+                raise serializers.ValidationError({'job': 'Job not found.'})
+        return attrs
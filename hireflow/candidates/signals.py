@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import storage
+from .matching import has_index
+from .models import Candidate
+from .tasks import extract_resume_text, update_match_index
+
+# Fields that feed the candidate's profile embedding
+PROFILE_FIELDS = {'first_name', 'last_name', 'email', 'linkedin_url', 'company'}
+
+
+@receiver(post_save, sender=Candidate)
+@receiver(post_delete, sender=Candidate)
+def on_candidate_changed(sender, instance, update_fields=None, **kwargs):
+    """Queue an incremental matching-index update for the candidate's company."""
+    if update_fields is not None and not PROFILE_FIELDS.intersection(update_fields):
+        return
+    company_id, candidate_id = instance.company_id, instance.pk
+    if not has_index(company_id):
+        return
+    transaction.on_commit(lambda: update_match_index.delay(company_id, [candidate_id]))
+
+
+@receiver(pre_save, sender=Candidate)
+def remember_resume(sender, instance, update_fields=None, **kwargs):
+    """Note the resume the row points at before the save overwrites it."""
+    if update_fields is not None and 'resume' not in update_fields:
+        return
+    if instance._state.adding:
+        instance._previous_resume = ''
+    elif hasattr(instance, '_loaded_resume'):
+        instance._previous_resume = instance._loaded_resume
+    else:
+        # Built by hand or loaded with the resume deferred
+        previous = Candidate.objects.filter(pk=instance.pk).values_list('resume', flat=True).first()
+        instance._previous_resume = previous or ''
+
+
+@receiver(post_save, sender=Candidate)
+def on_resume_saved(sender, instance, **kwargs):
+    """Move the blob reference and queue text extraction when the resume changed."""
+    previous = instance.__dict__.pop('_previous_resume', None)
+    if previous is None:
+        return
+    current = instance.resume.name or ''
+    instance._loaded_resume = current
+    if current == previous:
+        return
+    storage.retain(current)
+    storage.release([previous])
+    candidate_id = instance.pk
+    transaction.on_commit(lambda: extract_resume_text.delay(candidate_id))
+
+
+@receiver(post_delete, sender=Candidate)
+def on_candidate_deleted(sender, instance, **kwargs):
+    """Release the candidate's resume blob; collect_garbage reclaims it later."""
+    if instance.resume:
+        storage.release([instance.resume.name])
@@ -0,0 +1,99 @@
+"""Vectorized cosine similarity over float32 embedding matrices.
+
+Embeddings are L2-normalized once when they are stored (see
+candidates.embeddings), so cosine similarity is a plain dot product and
+scoring one job against N candidates is a single BLAS matrix-vector call.
+
+Functions accept anything ``np.asarray`` understands; inputs that are
+already contiguous float32 are used without copying.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import numpy as np
+
+DTYPE = np.float32
+
+
+def as_matrix(vectors) -> np.ndarray:
+    """Return ``vectors`` as a C-contiguous 2-D float32 array."""
+    matrix = np.ascontiguousarray(vectors, dtype=DTYPE)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    return matrix
+
+
+def normalize(vectors) -> np.ndarray:
+    """Scale each row to unit L2 norm; all-zero rows stay zero."""
+    matrix = as_matrix(vectors)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def cosine(a, b) -> float:
+    """Cosine similarity of two vectors that need not be normalized."""
+    a = np.asarray(a, dtype=DTYPE)
+    b = np.asarray(b, dtype=DTYPE)
+    denominator = float(np.linalg.norm(a) * np.linalg.norm(b))
+    if denominator == 0:
+        return 0.0
+    return float(a @ b) / denominator
+
+
+def one_to_many(query, matrix, normalized: bool = True) -> np.ndarray:
+    """Similarity of one query vector against every row of ``matrix``.
+
+    Pass ``normalized=False`` if the inputs are raw (un-normalized) vectors.
+    """
+    query = np.ascontiguousarray(query, dtype=DTYPE).reshape(-1)
+    matrix = as_matrix(matrix)
+    if not normalized:
+        query = normalize(query)[0]
+        matrix = normalize(matrix)
+    return matrix @ query
+
+
+def iter_many_to_many(a, b, chunk_size: int = 1024, normalized: bool = True) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield ``(row_offset, block)`` similarity blocks of ``a`` against ``b``.
+
+    Each block has at most ``chunk_size`` rows of ``a``, so peak memory is
+    ``chunk_size * len(b)`` floats instead of ``len(a) * len(b)``.
+    """
+    a = as_matrix(a)
+    b = as_matrix(b)
+    if not normalized:
+        a = normalize(a)
+        b = normalize(b)
+    for start in range(0, len(a), chunk_size):
+        yield start, a[start:start + chunk_size] @ b.T
+
+
+def many_to_many(a, b, chunk_size: int | None = None, normalized: bool = True) -> np.ndarray:
+    """Full ``len(a) x len(b)`` similarity matrix.
+
+    With ``chunk_size`` the product is computed block by block into a
+    preallocated result, bounding temporary memory.
+    """
+    a = as_matrix(a)
+    b = as_matrix(b)
+    if chunk_size is None:
+        if not normalized:
+            a = normalize(a)
+            b = normalize(b)
+        return a @ b.T
+    result = np.empty((len(a), len(b)), dtype=DTYPE)
+    for start, block in iter_many_to_many(a, b, chunk_size, normalized):
+        result[start:start + len(block)] = block
+    return result
+
+
+def top_k(scores, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Indices and values of the ``k`` highest scores, best first."""
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    order = candidates[np.argsort(-scores[candidates], kind='stable')]
+    return order, scores[order]
@@ -0,0 +1,246 @@
+"""Content-addressed, reference-counted resume storage.
+
+``ContentAddressedStorage`` names every file after the sha256 of its
+content: an upload to ``resumes/cv.pdf`` is stored as
+``resumes/<2 hex>/<sha256>.pdf``. The upload is copied to a temporary
+file in chunks while it is hashed, never held in memory, then renamed
+into place; identical uploads end up as one file.
+
+Each stored file has a candidates.ResumeBlob row whose ``ref_count``
+counts the candidates pointing at it, kept up to date by candidates.signals
+(upload, replacement, deletion, including cascades and bulk-delete).
+A blob whose count drops to zero is not deleted at once: after
+RESUME_STORAGE['GRACE_PERIOD'] seconds, ``collect_garbage`` (the hourly
+``collect_resume_blobs`` task) deletes it in batches, checking each batch
+against the candidates table first, so a count that drifted (e.g. after a
+queryset.update()) never costs a referenced file. ``sweep_orphans``
+removes files that have no row at all, such as uploads whose transaction
+rolled back.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import posixpath
+import re
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from contextlib import suppress
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import transaction
+from django.db.models import Case, F, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'GRACE_PERIOD': 3600,
+    'GC_BATCH_SIZE': 500,
+}
+
+CHUNK_SIZE = 64 * 1024
+TMP_DIR = '.tmp'
+_EXTENSION_RE = re.compile(r'\.[a-z0-9]{1,10}')
+_NAME_RE = re.compile(r'(?:^|/)([0-9a-f]{2})/(\1[0-9a-f]{62})(?:\.[a-z0-9]{1,10})?$')
+
+
+def config(name: str):
+    return getattr(settings, 'RESUME_STORAGE', {}).get(name, DEFAULTS[name])
+
+
+def resume_storage():
+    """Storage of Candidate.resume: the ``resumes`` alias of settings.STORAGES."""
+    return storages['resumes']
+
+
+def sha256_of(name: str) -> str | None:
+    """The content hash a content-addressed file name carries, or None."""
+    match = _NAME_RE.search(name or '')
+    return match.group(2) if match else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage naming files ``<dir>/<aa>/<sha256><ext>`` by content.
+
+    ``<dir>`` and ``<ext>`` come from the name the file was uploaded under
+    (the field's upload_to and the original extension).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Equal names mean equal content: never rename to avoid a collision
+        return name
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        if not _EXTENSION_RE.fullmatch(extension):
+            extension = ''
+
+        tmp_dir = self.path(TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            digest, size = hashlib.sha256(), 0
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(chunk)
+            sha256 = digest.hexdigest()
+            name = posixpath.join(directory, sha256[:2], sha256 + extension)
+            path = self.path(name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Row before file: a collection that already holds the row
+            # finishes (file deleted) before this rename puts it back
+            _touch(name, size)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+            raise
+        if self.file_permissions_mode is not None:
+            os.chmod(path, self.file_permissions_mode)
+        return name
+
+
+def _touch(name: str, size: int) -> None:
+    """Create the blob's row, or restart its grace period if it exists."""
+    from .models import ResumeBlob
+
+    ResumeBlob.objects.bulk_create(
+        [ResumeBlob(name=name, size=size, released_at=timezone.now())],
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=['released_at'],
+    )
+
+
+def retain(name: str) -> None:
+    """Count one more reference to the blob ``name`` (no-op for other files)."""
+    from .models import ResumeBlob
+
+    if name:
+        ResumeBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1, released_at=None)
+
+
+def release(names: Iterable[str]) -> None:
+    """Drop one reference per occurrence of each blob name, in one UPDATE per count."""
+    from .models import ResumeBlob
+
+    by_count = defaultdict(list)
+    for name, count in Counter(name for name in names if name).items():
+        by_count[count].append(name)
+    now = timezone.now()
+    for count, group in by_count.items():
+        ResumeBlob.objects.filter(name__in=group).update(
+            ref_count=F('ref_count') - count,
+            released_at=Case(When(ref_count__lte=count, then=now), default=F('released_at')),
+        )
+
+
+def collect_garbage(batch_size: int | None = None, grace: float | None = None,
+                    max_batches: int | None = None) -> dict[str, int]:
+    """Delete unreferenced blobs past the grace period, ``batch_size`` at a time.
+
+    Per batch: the blobs' rows are locked (skipping rows another collector
+    holds), the candidates still pointing at them are counted in one
+    query, blobs found referenced get their count repaired, and the rest
+    lose their file, their row and their cached resume text.
+    """
+    from .models import Candidate, ResumeBlob, ResumeText
+
+    batch_size = batch_size or config('GC_BATCH_SIZE')
+    grace = config('GRACE_PERIOD') if grace is None else grace
+    cutoff = timezone.now() - timedelta(seconds=grace)
+    storage = resume_storage()
+    stats = {'deleted': 0, 'repaired': 0, 'freed_bytes': 0, 'batches': 0}
+
+    while max_batches is None or stats['batches'] < max_batches:
+        with transaction.atomic():
+            blobs = list(
+                ResumeBlob.objects.select_for_update(skip_locked=True)
+                .filter(ref_count__lte=0, released_at__lte=cutoff)
+                .order_by('released_at')[:batch_size]
+            )
+            if not blobs:
+                break
+            stats['batches'] += 1
+            references = Counter(
+                Candidate.objects.filter(resume__in=[blob.name for blob in blobs]).values_list('resume', flat=True)
+            )
+            garbage = []
+            for blob in blobs:
+                if references[blob.name]:
+                    ResumeBlob.objects.filter(pk=blob.pk).update(ref_count=references[blob.name], released_at=None)
+                    stats['repaired'] += 1
+                else:
+                    garbage.append(blob)
+            for blob in garbage:
+                storage.delete(blob.name)
+                stats['freed_bytes'] += blob.size
+            ResumeBlob.objects.filter(pk__in=[blob.pk for blob in garbage]).delete()
+            stats['deleted'] += len(garbage)
+
+            hashes = {sha256_of(blob.name) for blob in garbage} - {None}
+            ResumeText.objects.filter(sha256__in=hashes).exclude(
+                sha256__in=Candidate.objects.filter(resume_hash__in=hashes).values('resume_hash'),
+            ).delete()
+
+    if stats['deleted'] or stats['repaired']:
+        logger.info(
+            "Resume blobs collected: deleted=%d, repaired=%d, freed=%d bytes",
+            stats['deleted'], stats['repaired'], stats['freed_bytes'],
+        )
+    return stats
+
+
+def sweep_orphans(directory: str = 'resumes', grace: float | None = None,
+                  batch_size: int | None = None) -> int:
+    """Delete stored files older than the grace period that have no blob row.
+
+    Walks the storage directory, so it is meant for occasional runs
+    (``manage.py collect_resume_blobs --sweep``), not every collection.
+    Also removes temporary files left by interrupted uploads.
+    """
+    from .models import ResumeBlob
+
+    grace = config('GRACE_PERIOD') if grace is None else grace
+    batch_size = batch_size or config('GC_BATCH_SIZE')
+    storage = resume_storage()
+    cutoff = time.time() - grace
+    removed = 0
+
+    tmp_dir = storage.path(TMP_DIR)
+    if os.path.isdir(tmp_dir):
+        for entry in os.scandir(tmp_dir):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                with suppress(FileNotFoundError):
+                    os.unlink(entry.path)
+                removed += 1
+
+    def flush(batch):
+        known = set(ResumeBlob.objects.filter(name__in=batch).values_list('name', flat=True))
+        for name in set(batch) - known:
+            storage.delete(name)
+        return len(set(batch) - known)
+
+    batch = []
+    root = storage.path(directory)
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            name = posixpath.join(directory, os.path.relpath(path, root).replace(os.sep, '/'))
+            if sha256_of(name) and os.stat(path).st_mtime < cutoff:
+                batch.append(name)
+            if len(batch) >= batch_size:
+                removed += flush(batch)
+                batch = []
+    if batch:
+        removed += flush(batch)
+    return removed
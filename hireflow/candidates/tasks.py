@@ -1,67 +1,127 @@
-"""Candidate AI scoring via OpenAI embeddings.
+"""Candidate AI scoring via text embeddings.
 
 Scores how well a candidate's CV/profile matches a job description
-using cosine similarity of OpenAI text-embedding-3-small vectors.
+using cosine similarity of embedding vectors. The embedding backend
+(OpenAI text-embedding-3-small by default, or a local hashing embedder)
+is configured in settings.EMBEDDINGS; see candidates.providers.
 
 Security notes:
 - OPENAI_API_KEY stored in .env, never hardcoded
 - AI scores are advisory only — not used for automated rejection
-- Scores stored in JSONField for auditability
+- Scores stored in candidates.CandidateScore, one row per
+  (candidate, job, model), for auditability and indexed sorting
 - Task is idempotent: re-running updates the score, doesn't duplicate
+- Embeddings are cached by (model, sha256(text)) in candidates.embeddings,
+  so a job description is embedded once for its whole applicant pool
+- When the provider is rate-limited, scoring switches to the configured
+  fallback provider, or raises so Celery retries with backoff
 """
 from __future__ import annotations
 
 import logging
-import os
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import TYPE_CHECKING, TypeVar
 
+import numpy as np
 from celery import shared_task
 
+from . import providers, similarity
+from .embeddings import EmbeddingStore
+from .providers import EmbeddingProvider, RateLimitedError
+
 if TYPE_CHECKING:
     pass
 
 logger = logging.getLogger(__name__)
 
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+MAX_INPUT_CHARS = 8000  # stay within token limit
+SCORING_CHUNK_SIZE = 500  # applicants embedded and written back per round trip
 
+T = TypeVar("T")
 
-def _get_embedding(text: str) -> list[float]:
-    """Get OpenAI text embedding for a string.
 
-    Raises RuntimeError if OPENAI_API_KEY is not set.
-    """
-    if not OPENAI_API_KEY:
-        raise RuntimeError("OPENAI_API_KEY not configured — set it in .env")
+def _store(provider: EmbeddingProvider | None = None) -> EmbeddingStore:
+    """Embedding cache for ``provider`` (default: the configured provider)."""
+    provider = provider or providers.get_provider()
+    return EmbeddingStore(provider.name, provider.embed)
+
 
+def _with_fallback(fn: Callable[[EmbeddingStore], T]) -> T:
+    """Run ``fn`` with the configured provider's store.
+
+    If the provider is rate-limited and EMBEDDINGS['FALLBACK'] is set,
+    run ``fn`` again from scratch with the fallback provider. Vectors
+    from different providers are never compared with each other.
+    """
     try:
-        import openai  # type: ignore[import]
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=text[:8000],  # stay within token limit
-        )
-        return response.data[0].embedding
-    except ImportError as exc:
-        raise RuntimeError("openai package not installed: pip install openai>=1.0") from exc
+        return fn(_store())
+    except RateLimitedError as exc:
+        fallback = providers.get_fallback_provider()
+        if fallback is None:
+            raise
+        logger.warning("Embedding provider rate limited, using %s: %s", fallback.name, exc)
+        return fn(_store(fallback))
+
 
+def _get_embedding(text: str) -> np.ndarray:
+    """Get the (cached) embedding for a string from the configured provider.
+
+    Raises RuntimeError (ProviderError) if the provider is not configured.
+    """
+    return _store().get(text[:MAX_INPUT_CHARS])
+
+
+def _candidate_text(candidate, resume: str = "") -> str:
+    text = (
+        f"{candidate.first_name} {candidate.last_name}\n"
+        f"Email: {candidate.email}\n"
+        f"LinkedIn: {candidate.linkedin_url or 'N/A'}"
+    )
+    return f"{text}\nResume:\n{resume}" if resume else text
+
+
+def _candidate_texts(candidates: list) -> list[str]:
+    """Embedding texts of ``candidates``, with their resume text (one query)."""
+    from . import resumes
+
+    resume_texts = resumes.texts((candidate.resume_hash for candidate in candidates), MAX_INPUT_CHARS)
+    return [
+        _candidate_text(candidate, resume_texts.get(candidate.resume_hash, ""))[:MAX_INPUT_CHARS]
+        for candidate in candidates
+    ]
+
+
+def _job_text(job) -> str:
+    return f"{job.title}\n{job.description}\nLocation: {job.location}"
+
+
+def _save_scores(job_id: int, model: str, scores: Iterable[tuple[int, float]]) -> None:
+    """Upsert ``(candidate_id, score)`` pairs for one job in a single INSERT."""
+    from candidates.models import CandidateScore
+
+    CandidateScore.objects.bulk_create(
+        [
+            CandidateScore(candidate_id=candidate_id, job_id=job_id, model=model, score=score)
+            for candidate_id, score in scores
+        ],
+        update_conflicts=True,
+        unique_fields=["candidate", "job", "model"],
+        update_fields=["score", "scored_at"],
+    )
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
-    """Compute cosine similarity between two embedding vectors."""
-    import math
 
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+def _chunks(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 
 @shared_task(autoretry_for=(Exception,), max_retries=3, retry_backoff=True)
 def score_candidate_for_job(candidate_id: int, job_id: int) -> dict[str, object]:
-    """Score a candidate's fit for a job using OpenAI embeddings.
+    """Score a candidate's fit for a job using text embeddings.
 
-    Stores the result in a CandidateScore record (JSONField: ai_score).
+    Stores the result in a CandidateScore record.
     This task is idempotent — re-running updates the existing score.
 
     Args:
@@ -82,36 +142,208 @@ def score_candidate_for_job(candidate_id: int, job_id: int) -> dict[str, object]
         return {"error": str(exc)}
 
     # Build text representations
-    candidate_text = (
-        f"{candidate.first_name} {candidate.last_name}\n"
-        f"Email: {candidate.email}\n"
-        f"LinkedIn: {candidate.linkedin_url or 'N/A'}"
-    )
-    job_text = f"{job.title}\n{job.description}\nLocation: {job.location}"
+    [candidate_text] = _candidate_texts([candidate])
+    job_text = _job_text(job)
+
+    def score_with(store: EmbeddingStore) -> tuple[str, float]:
+        candidate_embedding = store.get(candidate_text[:MAX_INPUT_CHARS])
+        job_embedding = store.get(job_text[:MAX_INPUT_CHARS])
+        # Stored embeddings are unit length: cosine similarity is the dot product
+        return store.model, round(float(candidate_embedding @ job_embedding) * 100, 2)
 
     try:
-        candidate_embedding = _get_embedding(candidate_text)
-        job_embedding = _get_embedding(job_text)
-        similarity = _cosine_similarity(candidate_embedding, job_embedding)
-        score = round(similarity * 100, 2)
+        model, score = _with_fallback(score_with)
+    except RateLimitedError:
+        raise  # let Celery retry with backoff
     except RuntimeError as exc:
         logger.warning("AI scoring skipped: %s", exc)
         return {"error": str(exc), "candidate_id": candidate_id, "job_id": job_id}
 
     # Store result — upsert pattern
+    _save_scores(job_id, model, [(candidate_id, score)])
     result = {
         "score": score,
-        "model": "text-embedding-3-small",
+        "model": model,
         "candidate_id": candidate_id,
         "job_id": job_id,
     }
 
-    # Update candidate metadata with AI score
-    candidate.metadata = {**candidate.metadata, f"ai_score_job_{job_id}": result}
-    candidate.save(update_fields=["metadata"])
-
     logger.info(
         "AI score: candidate=%d, job=%d, score=%.2f",
         candidate_id, job_id, score,
     )
     return result
+
+
+@shared_task(autoretry_for=(Exception,), max_retries=3, retry_backoff=True)
+def score_job_applicants(job_id: int, chunk_size: int = SCORING_CHUNK_SIZE) -> dict[str, object]:
+    """Score every applicant of a job in one pass.
+
+    Applicants are streamed in chunks of ``chunk_size``. Per chunk there is
+    one batched embeddings call (cache misses only), one matrix-vector
+    product for all similarities, and one bulk upsert for the scores. The
+    job description is embedded once for the whole pool.
+
+    Args:
+        job_id: PK of the Job whose applicants should be scored.
+        chunk_size: Applicants per embedding batch and bulk write.
+
+    Returns:
+        dict with the job ID, model and number of candidates scored.
+    """
+    from candidates.models import Candidate
+    from jobs.models import Job
+
+    try:
+        job = Job.objects.get(pk=job_id)
+    except Job.DoesNotExist as exc:
+        logger.error("score_job_applicants: %s", exc)
+        return {"error": str(exc)}
+
+    applicants = (
+        Candidate.objects.filter(applications__job_id=job_id)
+        .only("id", "first_name", "last_name", "email", "linkedin_url", "resume_hash")
+        .order_by("pk")
+    )
+    scored = 0
+
+    def score_with(store: EmbeddingStore) -> str:
+        nonlocal scored
+        scored = 0
+        job_vector = store.get(_job_text(job)[:MAX_INPUT_CHARS])
+        for chunk in _chunks(applicants.iterator(chunk_size=chunk_size), chunk_size):
+            similarities = similarity.one_to_many(job_vector, store.get_matrix(_candidate_texts(chunk)))
+            _save_scores(job_id, store.model, [
+                (candidate.pk, round(value * 100, 2))
+                for candidate, value in zip(chunk, similarities.tolist(), strict=True)
+            ])
+            scored += len(chunk)
+        return store.model
+
+    try:
+        model = _with_fallback(score_with)
+    except RateLimitedError:
+        raise  # let Celery retry with backoff
+    except RuntimeError as exc:
+        logger.warning("AI scoring skipped: %s", exc)
+        return {"error": str(exc), "job_id": job_id, "scored": scored}
+
+    logger.info("AI scores: job=%d, candidates=%d", job_id, scored)
+    return {"job_id": job_id, "model": model, "scored": scored}
+
+
+@shared_task
+def rebuild_match_index(company_id: int | None) -> dict[str, object]:
+    """Rebuild a company's candidate matching index from scratch."""
+    from . import matching
+
+    try:
+        indexed = matching.build_index(company_id)
+    except RuntimeError as exc:
+        logger.warning("Match index build skipped: %s", exc)
+        return {"error": str(exc), "company_id": company_id}
+    return {"company_id": company_id, "indexed": indexed}
+
+
+@shared_task(autoretry_for=(Exception,), max_retries=3, retry_backoff=True)
+def update_match_index(company_id: int | None, candidate_ids: list[int]) -> dict[str, object]:
+    """Apply candidate changes to a company's matching index incrementally."""
+    from . import matching
+
+    if matching.update_candidates(company_id, candidate_ids):
+        rebuild_match_index.delay(company_id)
+    return {"company_id": company_id, "updated": len(candidate_ids)}
+
+
+@shared_task(autoretry_for=(OSError,), max_retries=3, retry_backoff=True)
+def extract_resume_text(candidate_id: int) -> dict[str, object]:
+    """Extract a candidate's resume text and re-index the candidate.
+
+    Routed to the "resumes" queue (CELERY_TASK_ROUTES), so parsing runs
+    in its own worker pool. Text is cached by file hash (candidates.resumes):
+    unchanged or duplicate files are not parsed again. When the candidate's
+    resume text changes, its embedding is computed ahead of use, its
+    matching index entry is updated and its existing scores are redone;
+    nothing is stored when the resume was replaced during extraction.
+    """
+    from candidates.models import Candidate, CandidateScore
+
+    from . import matching, resumes
+
+    try:
+        candidate = Candidate.objects.get(pk=candidate_id)
+    except Candidate.DoesNotExist as exc:
+        logger.error("extract_resume_text: %s", exc)
+        return {"error": str(exc)}
+
+    resume_text, extracted = resumes.extract(candidate)
+    resume_hash = resume_text.sha256 if resume_text else ""
+    result = {"candidate_id": candidate_id, "sha256": resume_hash, "extracted": extracted}
+    if resume_hash == candidate.resume_hash:
+        return {**result, "changed": False}
+
+    # update() rather than save(): no post_save, so no new extraction. Only
+    # while the file extracted is still the resume: a replacement queued
+    # its own extraction, and this stale hash must not overwrite it
+    updated = Candidate.objects.filter(pk=candidate_id, resume=candidate.resume.name).update(resume_hash=resume_hash)
+    if not updated:
+        return {**result, "changed": False, "stale": True}
+    candidate.resume_hash = resume_hash
+    try:
+        _get_embedding(_candidate_texts([candidate])[0])
+    except RuntimeError as exc:
+        logger.warning("Resume embedding skipped: %s", exc)
+    if matching.has_index(candidate.company_id):
+        update_match_index.delay(candidate.company_id, [candidate_id])
+    for job_id in CandidateScore.objects.filter(candidate_id=candidate_id).values_list("job_id", flat=True).distinct():
+        score_candidate_for_job.delay(candidate_id, job_id)
+    return {**result, "changed": True}
+
+
+@shared_task
+def collect_resume_blobs() -> dict[str, int]:
+    """Delete resume files no candidate has referenced for the grace period.
+
+    Scheduled hourly by celery beat; see candidates.storage.collect_garbage.
+    """
+    from . import storage
+
+    return storage.collect_garbage()
+
+
+@shared_task(bind=True)
+def import_candidates_file(
+    self, path: str, file_format: str, company_id: int | None = None,
+    job_id: int | None = None, stage: str = "NEW",
+) -> dict[str, object]:
+    """Import an uploaded CSV/NDJSON file from default storage, then delete it.
+
+    Progress is published as the task's PROGRESS state (the running
+    import report), so GET /api/candidates/import/<task id>/ can show it.
+    Not retried: a partial import is kept and re-importing is safe.
+    """
+    from django.core.files.storage import default_storage
+
+    from jobs.models import Job
+    from tenants.models import Company
+
+    from .importer import import_candidates, read_rows
+
+    company = Company.objects.get(pk=company_id) if company_id else None
+    job = Job.objects.get(pk=job_id) if job_id else None
+
+    def progress(report):
+        self.update_state(state="PROGRESS", meta=report.as_dict())
+
+    try:
+        with default_storage.open(path, "rb") as stream:
+            report = import_candidates(
+                read_rows(stream, file_format), company=company, job=job, stage=stage, progress=progress,
+            )
+    finally:
+        default_storage.delete(path)
+    logger.info(
+        "Candidate import: rows=%d, created=%d, existing=%d, failed=%d",
+        report.rows, report.created, report.existing, report.failed,
+    )
+    return report.as_dict()
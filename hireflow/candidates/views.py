@@ -1,54 +1,242 @@
+import uuid
+
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from django.db.models import Q
+
+from celery.result import AsyncResult
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from hireflow.export import stream_export
+from hireflow.serializers import ValuesListMixin
+from tenants.mixins import TenantScopedMixin
+from . import board, matching, search
 from .models import Candidate
-from .serializers import CandidateSerializer
+from .serializers import CandidateImportSerializer, CandidateListSerializer, CandidateSerializer
+from .tasks import import_candidates_file, rebuild_match_index
+
+MAX_MATCHES = 100
+# Who queued an import, by task id; kept as long as Celery keeps the result
+IMPORT_OWNER_KEY = 'candidates:import-owner:{}'
+IMPORT_OWNER_TIMEOUT = 24 * 3600
+
+# Export column -> field lookup
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'email': 'email',
+    'phone': 'phone',
+    'linkedin_url': 'linkedin_url',
+    'company_id': 'company_id',
+    'created_at': 'created_at',
+}
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class IndexedSearchFilter(filters.SearchFilter):
+    """?search= through the candidate search index instead of icontains scans."""
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        return search.filter_candidates(queryset, text) if text.strip() else queryset
+
+
+class CandidateViewSet(TenantScopedMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Candidate.objects.all().order_by('-created_at')
     serializer_class = CandidateSerializer
+    list_serializer_class = CandidateListSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, IndexedSearchFilter]
     ordering_fields = ['created_at', 'last_name', 'email']
     ordering = ['-created_at']
+    # Indexed by candidates.search; listed for the schema
     search_fields = ['first_name', 'last_name', 'email']
 
     def get_queryset(self):
-        queryset = Candidate.objects.all()
+        queryset = super().get_queryset()
         job = self.request.query_params.get('job', None)
         stage = self.request.query_params.get('stage', None)
-        search = self.request.query_params.get('q', None)
+        search_text = self.request.query_params.get('q', None)
+        resume_text = self.request.query_params.get('resume', None)
 
         if job is not None:
             queryset = queryset.filter(applications__job_id=job)
         if stage is not None:
             queryset = queryset.filter(applications__stage=stage)
-        if search:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(email__icontains=search)
-            )
+        if search_text:
+            queryset = search.filter_candidates(queryset, search_text)
+        if resume_text:
+            queryset = search.filter_resumes(queryset, resume_text)
         return queryset.order_by('-created_at').distinct()
 
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """Ranked candidate search: ?q=<text>, ?limit= (default 20, max 100).
+
+        Every word matches the start of a word of the name or email; with
+        fewer hits than ``limit``, typo-tolerant matches on the name follow
+        (``fuzzy: true``) unless ?fuzzy=false.
+        """
+        text = request.query_params.get('q', '')
+        try:
+            limit = min(int(request.query_params.get('limit', search.DEFAULT_LIMIT)), search.MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not search.words(text):
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        fuzzy = request.query_params.get('fuzzy', 'true').lower() != 'false'
+
+        matches = search.search(text, company=request.company, limit=max(limit, 1), fuzzy=fuzzy)
+        found = Candidate.objects.in_bulk([match.candidate_id for match in matches])
+        ranked = [(found[match.candidate_id], match) for match in matches if match.candidate_id in found]
+        serialized = CandidateSerializer(
+            [candidate for candidate, _ in ranked], many=True, context=self.get_serializer_context(),
+        ).data
+        return Response({
+            'query': text,
+            'results': [
+                {'score': round(match.score, 4), 'fuzzy': match.fuzzy, 'candidate': data}
+                for (_, match), data in zip(ranked, serialized, strict=True)
+            ],
+        })
+
     @action(detail=False, methods=['get'], url_path='by-stage')
     def by_stage(self, request):
-        """Return candidates grouped by their current pipeline stage."""
+        """Return candidates grouped by their current pipeline stage.
+
+        Each stage is paginated on its own: ?limit=<n> caps every bucket
+        (max 200) and ?cursor=SCREENING:123,INTERVIEW:45 continues the
+        named buckets from their previous ``next_cursor``.
+        """
         from pipeline.models import Application
-        stages = Application.Stage.choices
-        result = {}
-        for stage_value, stage_label in stages:
-            candidates = Candidate.objects.filter(
-                applications__stage=stage_value
-            ).distinct()
-            result[stage_value] = CandidateSerializer(candidates, many=True).data
+        try:
+            limit = min(int(request.query_params.get('limit', board.DEFAULT_LIMIT)), board.MAX_LIMIT)
+            cursors = board.parse_cursors(request.query_params.get('cursor'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({'error': 'limit must be positive'}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = board.candidates_by_stage(
+            Application.objects.for_company(request.company),
+            stages=Application.Stage.values,
+            limit=limit,
+            cursors=cursors,
+            context=self.get_serializer_context(),
+        )
         return Response(result)
 
+    @action(detail=False, methods=['get'], url_path='match')
+    def match(self, request):
+        """Return the top-k candidates for ?job=<id> from the job company's ANN index.
+
+        ?k= caps the number of matches (default 10, max 100). Returns 503
+        and queues a build when the company has candidates but no index yet.
+        """
+        from jobs.models import Job
+        job_id = request.query_params.get('job')
+        if not job_id:
+            return Response({'error': 'job is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            job_id = int(job_id)
+        except ValueError:
+            return Response({'error': 'job must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            k = min(int(request.query_params.get('k', 10)), MAX_MATCHES)
+        except ValueError:
+            return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        job = get_object_or_404(Job.objects.for_company(request.company), pk=job_id)
+
+        try:
+            matches = matching.match_candidates(job, k=k)
+        except RuntimeError as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if matches is None:
+            rebuild_match_index.delay(job.company_id)
+            return Response(
+                {'error': 'Match index is being built, retry shortly'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        # Drop stale index entries (deleted or moved candidates) at read time
+        found = Candidate.objects.filter(company_id=job.company_id).in_bulk([pk for pk, _ in matches])
+        ranked = [(found[pk], score) for pk, score in matches if pk in found]
+        serialized = CandidateSerializer(
+            [candidate for candidate, _ in ranked], many=True, context=self.get_serializer_context(),
+        ).data
+        return Response({
+            'job': job.id,
+            'results': [
+                {'score': round(score * 100, 2), 'candidate': data}
+                for (_, score), data in zip(ranked, serialized, strict=True)
+            ],
+        })
+
+    @action(detail=False, methods=['get'], url_path=r'export/(?P<file_format>csv|ndjson)')
+    def export(self, request, file_format=None):
+        """Stream every matching candidate as CSV or NDJSON, unpaginated.
+
+        Takes the same filters as the list (?job, ?stage, ?q, ?search,
+        ?ordering).
+        """
+        return stream_export(self.filter_queryset(self.get_queryset()), EXPORT_COLUMNS, file_format, 'candidates')
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_file(self, request):
+        """Queue a bulk import of a CSV or NDJSON file (multipart ``file``).
+
+        Columns: first_name, last_name, email (required), phone,
+        linkedin_url. Optional ``job`` applies every candidate to that job
+        in ``stage`` (default NEW). Returns 202 with the import id; poll
+        ``status_url`` for progress and per-row errors.
+        """
+        serializer = CandidateImportSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+
+        path = default_storage.save(f"imports/{uuid.uuid4().hex}.{params['file_format']}", params['file'])
+        company = request.company
+        task = import_candidates_file.delay(
+            path, params['file_format'], company.pk if company else None, params.get('job'), params['stage'],
+        )
+        cache.set(
+            IMPORT_OWNER_KEY.format(task.id),
+            {'company': company.pk if company else None, 'user': request.user.pk},
+            IMPORT_OWNER_TIMEOUT,
+        )
+        return Response({
+            'id': task.id,
+            'status_url': request.build_absolute_uri(f'{task.id}/'),
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], url_path=r'import/(?P<task_id>[0-9a-f-]+)')
+    def import_status(self, request, task_id=None):
+        """State of an import: PENDING, PROGRESS or SUCCESS with its report, or FAILURE.
+
+        Only the company that queued the import (or, without a company, the
+        user who queued it) can read it; anyone else gets 404.
+        """
+        owner = cache.get(IMPORT_OWNER_KEY.format(task_id)) or {}
+        if request.company is not None:
+            allowed = owner.get('company') == request.company.pk
+        else:
+            allowed = owner.get('user') == request.user.pk
+        if not allowed:
+            raise Http404
+        result = AsyncResult(task_id)
+        data = {'id': task_id, 'state': result.state}
+        if result.state in ('PROGRESS', 'SUCCESS') and isinstance(result.info, dict):
+            data['report'] = result.info
+        elif result.state == 'FAILURE':
+            data['error'] = str(result.info)
+        return Response(data)
+
     @action(detail=False, methods=['post'], url_path='bulk-delete')
     def bulk_delete(self, request):
         """Delete multiple candidates by IDs."""
@@ -56,7 +244,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         if not ids:
             return Response({'error': 'No IDs provided'}, status=status.HTTP_400_BAD_REQUEST)
 
-        deleted_count, _ = Candidate.objects.filter(id__in=ids).delete()
+        deleted_count, _ = Candidate.objects.for_company(request.company).filter(id__in=ids).delete()
         return Response({'deleted': deleted_count})
 
     @action(detail=False, methods=['post'], url_path='bulk-tag')
@@ -68,7 +256,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
             return Response({'error': 'No IDs provided'}, status=status.HTTP_400_BAD_REQUEST)
 
         # basic: just return which candidates were targeted
-        candidates = Candidate.objects.filter(id__in=ids)
+        candidates = Candidate.objects.for_company(request.company).filter(id__in=ids)
         return Response({
             'updated': candidates.count(),
             'note': note,
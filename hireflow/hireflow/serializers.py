@@ -0,0 +1,129 @@
+"""Read-only list serialization straight from ``.values()`` rows.
+
+A ModelSerializer builds a model instance per row, then walks its bound
+fields per instance (attribute lookups, ``to_representation`` calls, an
+OrderedDict...). For a list page that is most of the response time.
+``ValuesSerializer`` reproduces the output of a ModelSerializer from the
+dicts of ``queryset.values()`` instead:
+
+- the columns and their names come from the ModelSerializer's own fields,
+  so ``fields = '__all__'`` and later field changes carry over;
+- a value is only converted when the field's representation differs from
+  what ``.values()`` returns (datetimes, decimals, files...); other
+  values are copied as is;
+- fields a row cannot provide (SerializerMethodField, nested serializers)
+  are declared in ``computed`` and filled by the subclass, typically from
+  data ``prefetch`` loads for the whole page in one grouped query.
+
+``ValuesListMixin`` makes a viewset serve ``list`` through its
+``list_serializer_class``; every other action keeps the ModelSerializer.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation must run on the values() value; other
+# leaf fields (char, integer, boolean, choice, JSON, primary key) return
+# the value unchanged
+CONVERTED = (
+    serializers.DateTimeField, serializers.DateField, serializers.TimeField,
+    serializers.DecimalField, serializers.DurationField, serializers.UUIDField,
+)
+
+
+class ValuesSerializer:
+    """Serialize ``.values()`` rows like ``serializer_class`` serializes instances.
+
+    Subclasses set ``serializer_class``, list in ``computed`` the fields
+    they fill themselves (and in ``extra_values`` what those need from the
+    row), and override ``prefetch`` and ``fill``.
+    """
+    serializer_class: type[serializers.ModelSerializer]
+    computed: tuple[str, ...] = ()
+    extra_values: tuple[str, ...] = ()
+
+    def __init__(self, context: dict | None = None):
+        self.context = context or {}
+        self.columns: list[tuple[str, str, Callable | None]] = []
+        for name, field in self.serializer_class(context=self.context).fields.items():
+            if name in self.computed or field.write_only:
+                continue
+            self.columns.append((name, field.source.replace('.', '__'), self._converter(field)))
+
+    def _converter(self, field) -> Callable | None:
+        if isinstance(field, serializers.FileField):
+            return self._file_url(field)
+        if isinstance(field, serializers.DateTimeField) and not hasattr(field, 'timezone'):
+            # Resolve the current timezone once, not per value
+            field.timezone = field.default_timezone()
+        if isinstance(field, CONVERTED):
+            return field.to_representation
+        if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField,
+                              serializers.SerializerMethodField)):
+            raise ImproperlyConfigured(
+                f'{type(self).__name__}: {field.field_name!r} cannot come from values(); list it in computed'
+            )
+        return None
+
+    def _file_url(self, field) -> Callable:
+        """FileField.to_representation for a stored name instead of a FieldFile."""
+        storage = self.serializer_class.Meta.model._meta.get_field(field.source).storage
+        request = self.context.get('request')
+        if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return lambda name: name or None
+        if isinstance(storage, FileSystemStorage) and storage.base_url is not None:
+            # Local URLs are base_url + quoted name: build the prefix once
+            prefix = request.build_absolute_uri(storage.base_url) if request is not None else storage.base_url
+            return lambda name: prefix + filepath_to_uri(name).lstrip('/') if name else None
+        if request is None:
+            return lambda name: storage.url(name) if name else None
+        return lambda name: request.build_absolute_uri(storage.url(name)) if name else None
+
+    def values(self) -> list[str]:
+        """Arguments for ``queryset.values()``."""
+        return list(dict.fromkeys([lookup for _, lookup, _ in self.columns] + list(self.extra_values)))
+
+    def prefetch(self, rows: list[dict]) -> None:
+        """Load what ``fill`` needs for the whole page (hook)."""
+
+    def fill(self, row: dict, data: dict) -> None:
+        """Set the ``computed`` fields of ``data`` (hook)."""
+
+    def to_representation(self, row: dict) -> dict:
+        data = {}
+        for name, lookup, convert in self.columns:
+            value = row[lookup]
+            data[name] = convert(value) if convert is not None and value is not None else value
+        self.fill(row, data)
+        return data
+
+    def serialize(self, rows: list[dict]) -> list[dict]:
+        self.prefetch(rows)
+        return [self.to_representation(row) for row in rows]
+
+
+class ValuesListMixin:
+    """Serve ``list`` from ``.values()`` through ``list_serializer_class``.
+
+    Filtering, ordering and pagination are unchanged (DRF's paginators
+    accept dict rows); prefetch_related lookups are dropped, the list
+    serializer loads related data itself.
+    """
+    list_serializer_class: type[ValuesSerializer] | None = None
+
+    def list(self, request, *args, **kwargs):
+        if self.list_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        serializer = self.list_serializer_class(self.get_serializer_context())
+        rows = self.filter_queryset(self.get_queryset()).prefetch_related(None).values(*serializer.values())
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(list(rows)))
@@ -75,11 +75,53 @@ else:
         }
     }
 
+# Cache: local memory per process by default, Redis when CACHE_URL is set
+CACHE_URL = os.environ.get('CACHE_URL')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Embedding provider for AI scoring and matching (see candidates.providers).
+# PROVIDER/FALLBACK: 'openai' or 'local' (offline feature hashing)
+EMBEDDINGS = {
+    'PROVIDER': os.environ.get('EMBEDDING_PROVIDER', 'openai'),
+    'MODEL': 'text-embedding-3-small',
+    'API_KEY': os.environ.get('OPENAI_API_KEY'),
+    'BATCH_SIZE': int(os.environ.get('EMBEDDING_BATCH_SIZE', 256)),
+    'MAX_CONCURRENCY': int(os.environ.get('EMBEDDING_MAX_CONCURRENCY', 4)),
+    'FALLBACK': os.environ.get('EMBEDDING_FALLBACK') or None,
+    'LOCAL_DIMENSIONS': 512,
+}
+
+# Candidate matching (ANN) indexes, one directory per company; must be shared
+# between web and worker processes
+MATCH_INDEX_ROOT = Path(os.environ.get('MATCH_INDEX_ROOT', BASE_DIR / 'var' / 'match_index'))
+
+# Cache alias used for analytics results (stage counts per tenant)
+ANALYTICS_CACHE = 'default'
+
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    # Candidate.resume: files named by content hash, stored once (candidates.storage)
+    'resumes': {'BACKEND': 'candidates.storage.ContentAddressedStorage'},
+}
+
 STATIC_URL = '/static/'
 
 # Django 5.2: BigAutoField is now the default; set explicitly for clarity
@@ -94,6 +136,9 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Keyset pagination: constant-cost deep pages, page size capped server-side
+    'DEFAULT_PAGINATION_CLASS': 'hireflow.pagination.KeysetCursorPagination',
+    'PAGE_SIZE': 50,
 }
 
 SPECTACULAR_SETTINGS = {
@@ -110,8 +155,72 @@ CELERY_RESULT_BACKEND = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_TASK_TRACK_STARTED = True  # Celery 5: track STARTED state for better monitoring
+CELERY_BEAT_SCHEDULE = {
+    'dispatch-interview-reminders': {
+        'task': 'notifications.tasks.dispatch_interview_reminders',
+        'schedule': float(os.environ.get('REMINDER_DISPATCH_INTERVAL', 300)),
+    },
+    # Drains the notification outbox when no `relay_outbox --loop` process
+    # runs; concurrent relays skip each other's locked rows
+    'relay-outbox': {
+        'task': 'notifications.tasks.relay_outbox',
+        'schedule': float(os.environ.get('OUTBOX_RELAY_INTERVAL', 10)),
+    },
+    # Same retention as `relay_outbox --purge-after-days` (7 days, hourly)
+    'purge-outbox': {
+        'task': 'notifications.tasks.purge_outbox',
+        'schedule': 3600.0,
+    },
+    'collect-resume-blobs': {
+        'task': 'candidates.tasks.collect_resume_blobs',
+        'schedule': 3600.0,
+    },
+}
+
+# Resume parsing is CPU-bound: keep it off the default queue, in its own
+# worker pool (docker-compose resume-worker)
+CELERY_TASK_ROUTES = {
+    'candidates.tasks.extract_resume_text': {'queue': 'resumes'},
+}
+
+# Reminders are queued for interviews starting within LEAD_TIME hours
+INTERVIEW_REMINDERS = {
+    'LEAD_TIME': int(os.environ.get('REMINDER_LEAD_TIME_HOURS', 24)),
+    'BATCH_SIZE': 500,
+}
 
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+# Resume text extraction (candidates.resumes): characters kept per resume
+# and bytes read per chunk while hashing and decoding
+RESUMES = {
+    'MAX_TEXT_CHARS': int(os.environ.get('RESUME_MAX_TEXT_CHARS', 100_000)),
+    'CHUNK_SIZE': 64 * 1024,
+}
+
+# Unreferenced resume blobs are deleted GRACE_PERIOD seconds after their
+# last reference went, GC_BATCH_SIZE per transaction
+RESUME_STORAGE = {
+    'GRACE_PERIOD': int(os.environ.get('RESUME_GC_GRACE_PERIOD', 3600)),
+    'GC_BATCH_SIZE': 500,
+}
+
+# Where the outbox relay hands notifications: 'celery' or 'tasks' (django.tasks)
+NOTIFICATIONS_OUTBOX_BACKEND = os.environ.get('NOTIFICATIONS_OUTBOX_BACKEND', 'celery')
+
+# Console by default; point at SMTP (or a local debugging server such as
+# `python -m aiosmtpd -n -l localhost:1025`) through the environment
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False') == 'True'
+
+# Batched notification mail (notifications.mailer): messages per connection
+# round and the longest a buffered message may wait, in seconds
+NOTIFICATIONS_MAIL = {
+    'BATCH_SIZE': int(os.environ.get('MAIL_BATCH_SIZE', 100)),
+    'FLUSH_INTERVAL': float(os.environ.get('MAIL_FLUSH_INTERVAL', 5)),
+}
 DEFAULT_FROM_EMAIL = 'noreply@hireflow.com'
 
 # Django 6.0: native background tasks (no broker for simple jobs)
@@ -127,4 +236,13 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': False,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    # Access tokens carry a company_id claim read by TenantMiddleware
+    'TOKEN_OBTAIN_SERIALIZER': 'tenants.tokens.TenantTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'tenants.tokens.TenantTokenRefreshSerializer',
+}
+
+# Tenant resolution cache (tenants.resolution): per-process and shared TTLs, in seconds
+TENANT_CACHE = {
+    'LOCAL_TTL': 5,
+    'SHARED_TTL': 300,
 }
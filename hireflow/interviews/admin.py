@@ -4,5 +4,5 @@ from .models import Interview
 
 @admin.register(Interview)
 class InterviewAdmin(admin.ModelAdmin):
-    list_display = ['application', 'interviewer', 'interview_type', 'scheduled_at', 'completed']
+    list_display = ['application', 'interviewer', 'interview_type', 'scheduled_at', 'completed', 'reminder_sent_at']
     list_filter = ['interview_type', 'completed']
@@ -0,0 +1,80 @@
+"""Free-slot search for interview panels.
+
+Every busy interval of every panel member is fetched in one indexed range
+query. A single sweep over the intervals, sorted by start time, merges
+them into the panel's combined busy time. The gaps long enough for the
+interview are the free slots: times when all interviewers are free.
+This costs O(n log n) in the number of interviews inside the window,
+however many interviewers there are.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+Interval = tuple[datetime, datetime]
+
+
+def merge_busy(intervals: Iterable[Interval]) -> list[Interval]:
+    """Union of possibly overlapping intervals, sorted by start."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_slots(
+    busy: Iterable[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    buffer: timedelta = timedelta(0),
+) -> list[Interval]:
+    """Gaps of at least ``duration`` inside the window that avoid every busy interval.
+
+    ``buffer`` is kept free before and after each busy interval.
+    """
+    padded = ((start - buffer, end + buffer) for start, end in busy) if buffer else busy
+    slots = []
+    cursor = window_start
+    for start, end in merge_busy(padded):
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start - cursor >= duration:
+            slots.append((cursor, start))
+        cursor = end
+    if window_end - cursor >= duration:
+        slots.append((cursor, window_end))
+    return slots
+
+
+def busy_intervals(interviewer_ids: Iterable[int], window_start: datetime, window_end: datetime) -> list[Interval]:
+    """Open interviews of any of ``interviewer_ids`` that touch the window, in one query."""
+    from .models import Interview
+
+    return list(
+        Interview.objects.filter(
+            interviewer_id__in=list(interviewer_ids),
+            completed=False,
+            scheduled_at__lt=window_end,
+            ends_at__gt=window_start,
+        ).values_list('scheduled_at', 'ends_at')
+    )
+
+
+def find_availability(
+    interviewer_ids: Iterable[int],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    buffer: timedelta = timedelta(0),
+) -> list[Interval]:
+    """Slots in which every interviewer in ``interviewer_ids`` is free."""
+    busy = busy_intervals(interviewer_ids, window_start - buffer, window_end + buffer)
+    return free_slots(busy, window_start, window_end, duration, buffer)
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_ends_at(apps, schema_editor):
+    Interview = apps.get_model('interviews', 'Interview')
+    batch = []
+    for interview in Interview.objects.only('id', 'scheduled_at', 'duration_minutes').iterator(chunk_size=BATCH_SIZE):
+        interview.ends_at = interview.scheduled_at + timedelta(minutes=interview.duration_minutes)
+        batch.append(interview)
+        if len(batch) >= BATCH_SIZE:
+            Interview.objects.bulk_update(batch, ['ends_at'])
+            batch = []
+    Interview.objects.bulk_update(batch, ['ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_interview_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_ends_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='interview',
+            name='ends_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.RemoveIndex(
+            model_name='interview',
+            name='intv_interviewer_sched_idx',
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(
+                fields=['interviewer', 'completed', 'scheduled_at', 'ends_at'],
+                name='intv_interviewer_slot_idx',
+            ),
+        ),
+    ]
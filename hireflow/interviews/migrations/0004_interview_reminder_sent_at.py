@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_interview_ends_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(
+                condition=models.Q(('completed', False), ('reminder_sent_at__isnull', True)),
+                fields=['scheduled_at'],
+                name='intv_reminder_due_idx',
+            ),
+        ),
+    ]
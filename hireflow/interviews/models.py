@@ -1,6 +1,19 @@
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
 from django.db import models
 from django.conf import settings
 from pipeline.models import Application
+from tenants.managers import TenantQuerySet
+
+# Proposed slots per query in find_conflicts; keeps the OR-ed WHERE clause
+# well inside SQLite's expression depth limit
+CONFLICT_BATCH_SIZE = 200
+
+
+class InterviewQuerySet(TenantQuerySet):
+    tenant_lookup = 'application__job__company'
 
 
 class Interview(models.Model):
@@ -17,14 +30,65 @@ class Interview(models.Model):
     interview_type = models.CharField(max_length=20, choices=InterviewType.choices, default=InterviewType.PHONE)
     scheduled_at = models.DateTimeField()
     duration_minutes = models.IntegerField(default=60)
+    # Denormalized scheduled_at + duration_minutes, maintained by save(), so
+    # overlap checks are a single indexed range query
+    ends_at = models.DateTimeField(editable=False)
     location = models.CharField(max_length=200, blank=True)
     notes = models.TextField(blank=True)
     completed = models.BooleanField(default=False)
+    # Set by notifications.reminders when the reminder is queued
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = InterviewQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['interviewer', 'completed', 'scheduled_at', 'ends_at'],
+                name='intv_interviewer_slot_idx',
+            ),
+            models.Index(fields=['scheduled_at', 'id'], name='intv_scheduled_idx'),
+            # Only interviews still waiting for a reminder, so the reminder
+            # scan stays small however many past interviews accumulate
+            models.Index(
+                fields=['scheduled_at'],
+                name='intv_reminder_due_idx',
+                condition=models.Q(reminder_sent_at__isnull=True, completed=False),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.application} - {self.interview_type} at {self.scheduled_at}"
 
+    def save(self, *args, **kwargs):
+        self.ends_at = self.end_time(self.scheduled_at, self.duration_minutes)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'scheduled_at', 'duration_minutes'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'ends_at'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def end_time(scheduled_at, duration_minutes):
+        return scheduled_at + timedelta(minutes=duration_minutes)
+
+    @classmethod
+    def overlapping(cls, interviewer, scheduled_at, duration_minutes, exclude_id=None):
+        """Uncompleted interviews of ``interviewer`` overlapping the slot.
+
+        Two intervals overlap when each starts before the other ends; both
+        bounds are columns of intv_interviewer_slot_idx.
+        """
+        qs = cls.objects.filter(
+            interviewer=interviewer,
+            completed=False,
+            scheduled_at__lt=cls.end_time(scheduled_at, duration_minutes),
+            ends_at__gt=scheduled_at,
+        )
+        if exclude_id:
+            qs = qs.exclude(id=exclude_id)
+        return qs
+
     @classmethod
     def check_conflict(cls, interviewer, scheduled_at, duration_minutes, exclude_id=None):
         """Check if the interviewer has a conflicting interview scheduled.
@@ -38,19 +102,61 @@ class Interview(models.Model):
         Returns:
             True if conflict exists, False otherwise.
         """
-        from datetime import timedelta
-        end_time = scheduled_at + timedelta(minutes=duration_minutes)
+        return cls.overlapping(interviewer, scheduled_at, duration_minutes, exclude_id).exists()
 
-        qs = cls.objects.filter(
-            interviewer=interviewer,
-            completed=False,
-        )
-        if exclude_id:
-            qs = qs.exclude(id=exclude_id)
+    @classmethod
+    def find_conflicts(cls, slots):
+        """Check a batch of proposed slots with one query per CONFLICT_BATCH_SIZE slots.
+
+        Args:
+            slots: Sequence of (interviewer_id, scheduled_at, duration_minutes).
+
+        Returns:
+            dict mapping the index of each conflicting slot to
+            ``{'interviews': [ids of existing interviews it overlaps],
+            'slots': [indexes of other proposed slots it overlaps]}``.
+            Slots without an interviewer never conflict.
+        """
+        proposed = [
+            (interviewer_id, start, cls.end_time(start, duration))
+            for interviewer_id, start, duration in slots
+        ]
+        conflicts = {}
+
+        def conflict(index):
+            return conflicts.setdefault(index, {'interviews': [], 'slots': []})
+
+        for offset in range(0, len(proposed), CONFLICT_BATCH_SIZE):
+            batch = [slot for slot in proposed[offset:offset + CONFLICT_BATCH_SIZE] if slot[0]]
+            if not batch:
+                continue
+            condition = reduce(or_, (
+                models.Q(interviewer_id=interviewer_id, scheduled_at__lt=end, ends_at__gt=start)
+                for interviewer_id, start, end in batch
+            ))
+            existing = list(
+                cls.objects.filter(condition, completed=False)
+                .values_list('id', 'interviewer_id', 'scheduled_at', 'ends_at')
+            )
+            for index in range(offset, min(offset + CONFLICT_BATCH_SIZE, len(proposed))):
+                interviewer_id, start, end = proposed[index]
+                hits = [pk for pk, other, other_start, other_end in existing
+                        if other == interviewer_id and start < other_end and end > other_start]
+                if hits:
+                    conflict(index)['interviews'].extend(hits)
 
-        for interview in qs:
-            from datetime import timedelta as td
-            interview_end = interview.scheduled_at + td(minutes=interview.duration_minutes)
-            if scheduled_at < interview_end and end_time > interview.scheduled_at:
-                return True
-        return False
+        # Overlaps inside the batch: sweep each interviewer's slots by start time
+        by_interviewer = {}
+        for index, (interviewer_id, start, end) in enumerate(proposed):
+            if interviewer_id:
+                by_interviewer.setdefault(interviewer_id, []).append((start, end, index))
+        for intervals in by_interviewer.values():
+            intervals.sort()
+            active = []
+            for start, end, index in intervals:
+                active = [(other_end, other) for other_end, other in active if other_end > start]
+                for _, other in active:
+                    conflict(index)['slots'].append(other)
+                    conflict(other)['slots'].append(index)
+                active.append((end, index))
+        return conflicts
@@ -1,21 +1,43 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from tenants.serializers import TenantScopedFieldsMixin
 from .models import Interview
 
 
-class InterviewSerializer(serializers.ModelSerializer):
+class InterviewSerializer(TenantScopedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Interview
         fields = [
             'id', 'application', 'interviewer', 'interview_type',
-            'scheduled_at', 'duration_minutes', 'location', 'notes',
-            'completed', 'created_at'
+            'scheduled_at', 'duration_minutes', 'ends_at', 'location', 'notes',
+            'completed', 'reminder_sent_at', 'created_at'
         ]
-        read_only_fields = ['created_at']
+        read_only_fields = ['ends_at', 'reminder_sent_at', 'created_at']
 
     def validate(self, attrs):
-        interviewer = attrs.get('interviewer')
-        scheduled_at = attrs.get('scheduled_at')
-        duration_minutes = attrs.get('duration_minutes', 60)
+        # InterviewViewSet checks under a lock when saving, and bulk
+        # scheduling checks the whole batch at once (Interview.find_conflicts)
+        if self.context.get('check_conflicts', True):
+            self.check_conflict(attrs)
+        return attrs
+
+    def check_conflict(self, attrs):
+        """Raise a ValidationError if the interviewer is booked over this slot.
+
+        Fields a partial update leaves out come from the instance; an update
+        that touches none of interviewer, time and duration is not checked.
+        """
+        slot_fields = ('interviewer', 'scheduled_at', 'duration_minutes')
+        if self.instance is not None and not any(name in attrs for name in slot_fields):
+            return
+        interviewer, scheduled_at, duration_minutes = (
+            attrs.get(name, getattr(self.instance, name, default))
+            for name, default in zip(slot_fields, (None, None, 60), strict=True)
+        )
         exclude_id = self.instance.id if self.instance else None
 
         if interviewer and scheduled_at:
@@ -26,7 +48,56 @@ class InterviewSerializer(serializers.ModelSerializer):
                 exclude_id=exclude_id,
             )
             if has_conflict:
-                raise serializers.ValidationError(
+                raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
                     "The interviewer already has an interview scheduled at this time."
-                )
+                ]})
+
+    def update(self, instance, validated_data):
+        # A rescheduled interview gets a fresh reminder for its new time
+        if 'scheduled_at' in validated_data and validated_data['scheduled_at'] != instance.scheduled_at:
+            instance.reminder_sent_at = None
+        return super().update(instance, validated_data)
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    """Query parameters of /api/interviews/availability/.
+
+    Interviewers must be members of ``request.company``; as in
+    TenantScopedFieldsMixin, requests without a company stay unscoped.
+    """
+    MAX_INTERVIEWERS = 50
+    MAX_WINDOW = timedelta(days=90)
+
+    interviewers = serializers.CharField(help_text='Comma-separated interviewer IDs')
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    duration_minutes = serializers.IntegerField(min_value=1, max_value=24 * 60, default=60)
+    buffer_minutes = serializers.IntegerField(min_value=0, max_value=240, default=0)
+
+    def validate_interviewers(self, value):
+        try:
+            ids = sorted({int(part) for part in value.split(',') if part.strip()})
+        except ValueError as e:
+            raise serializers.ValidationError("Must be a comma-separated list of IDs.") from e
+        if not ids:
+            raise serializers.ValidationError("At least one interviewer is required.")
+        if len(ids) > self.MAX_INTERVIEWERS:
+            raise serializers.ValidationError(f"At most {self.MAX_INTERVIEWERS} interviewers.")
+        users = get_user_model().objects.filter(pk__in=ids)
+        company = getattr(self.context.get('request'), 'company', None)
+        if company is not None:
+            users = users.filter(membership__company=company)
+        found = set(users.values_list('pk', flat=True))
+        missing = [pk for pk in ids if pk not in found]
+        if missing:
+            raise serializers.ValidationError(f"Unknown interviewers: {missing}")
+        return ids
+
+    def validate(self, attrs):
+        attrs.setdefault('start', timezone.now().replace(second=0, microsecond=0))
+        attrs.setdefault('end', attrs['start'] + timedelta(days=14))
+        if attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError("end must be after start.")
+        if attrs['end'] - attrs['start'] > self.MAX_WINDOW:
+            raise serializers.ValidationError(f"The window may span at most {self.MAX_WINDOW.days} days.")
         return attrs
@@ -1,13 +1,49 @@
-from rest_framework import viewsets
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from tenants.mixins import TenantScopedMixin
+from .availability import find_availability
 from .models import Interview
-from .serializers import InterviewSerializer
+from .serializers import AvailabilityQuerySerializer, InterviewSerializer
+
+MAX_BULK_INTERVIEWS = 500
 
 
-class InterviewViewSet(viewsets.ModelViewSet):
+class InterviewViewSet(TenantScopedMixin, viewsets.ModelViewSet):
     queryset = Interview.objects.select_related('application', 'interviewer').all()
     serializer_class = InterviewSerializer
     permission_classes = [IsAuthenticated]
+    ordering = ['scheduled_at']
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('create', 'update', 'partial_update'):
+            context['check_conflicts'] = False  # checked under the lock in _save
+        return context
+
+    def perform_create(self, serializer):
+        self._save(serializer, super().perform_create)
+
+    def perform_update(self, serializer):
+        self._save(serializer, super().perform_update)
+
+    def _save(self, serializer, save):
+        """Check conflicts and save with the interviewer row locked.
+
+        Every write path (this and bulk_schedule) takes the interviewer's
+        lock before checking, so no two bookings are checked concurrently.
+        """
+        interviewer = serializer.validated_data.get('interviewer', getattr(serializer.instance, 'interviewer', None))
+        with transaction.atomic():
+            if interviewer is not None:
+                list(get_user_model().objects.select_for_update().filter(pk=interviewer.pk).values_list('pk'))
+            serializer.check_conflict(serializer.validated_data)
+            save(serializer)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -21,3 +57,77 @@ class InterviewViewSet(viewsets.ModelViewSet):
         if completed is not None:
             qs = qs.filter(completed=completed.lower() == 'true')
         return qs.order_by('scheduled_at')
+
+    @action(detail=False, methods=['get'], url_path='availability')
+    def availability(self, request):
+        """Free slots shared by a panel of interviewers.
+
+        ?interviewers=1,2,3 (required), ?start and ?end (ISO 8601, default
+        now and two weeks later), ?duration_minutes (default 60) and
+        ?buffer_minutes kept free around existing interviews (default 0).
+        Each slot is a gap in which an interview can start anywhere from
+        ``start`` to ``latest_start``.
+        """
+        query = AvailabilityQuerySerializer(data=request.query_params, context={'request': request})
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        duration = timedelta(minutes=params['duration_minutes'])
+        slots = find_availability(
+            params['interviewers'], params['start'], params['end'], duration,
+            buffer=timedelta(minutes=params['buffer_minutes']),
+        )
+        return Response({
+            'interviewers': params['interviewers'],
+            'start': params['start'],
+            'end': params['end'],
+            'duration_minutes': params['duration_minutes'],
+            'slots': [
+                {'start': start, 'end': end, 'latest_start': end - duration}
+                for start, end in slots
+            ],
+        })
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_schedule(self, request):
+        """Schedule many interviews at once; all or nothing.
+
+        Conflicts with existing interviews and between the submitted
+        interviews are checked with one query per batch instead of one per
+        interview. Interviewers are row-locked until the insert commits, as
+        single creates and updates lock them, so a concurrent booking cannot
+        slip in between the check and the write.
+        """
+        items = request.data if isinstance(request.data, list) else request.data.get('interviews')
+        if not items:
+            return Response({'error': 'No interviews provided'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > MAX_BULK_INTERVIEWS:
+            return Response(
+                {'error': f'At most {MAX_BULK_INTERVIEWS} interviews per request'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        context = {**self.get_serializer_context(), 'check_conflicts': False}
+        serializer = InterviewSerializer(data=items, many=True, context=context)
+        serializer.is_valid(raise_exception=True)
+        slots = [
+            (attrs['interviewer'].pk if attrs.get('interviewer') else None,
+             attrs['scheduled_at'], attrs.get('duration_minutes', 60))
+            for attrs in serializer.validated_data
+        ]
+
+        with transaction.atomic():
+            interviewer_ids = sorted({slot[0] for slot in slots if slot[0]})
+            list(get_user_model().objects.select_for_update().filter(pk__in=interviewer_ids).values_list('pk'))
+            conflicts = Interview.find_conflicts(slots)
+            if conflicts:
+                return Response({
+                    'error': 'Some interviewers already have an interview scheduled at these times.',
+                    'conflicts': {str(index): conflict for index, conflict in sorted(conflicts.items())},
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            interviews = [Interview(**attrs) for attrs in serializer.validated_data]
+            for interview in interviews:
+                interview.ends_at = Interview.end_time(interview.scheduled_at, interview.duration_minutes)
+            Interview.objects.bulk_create(interviews)
+
+        return Response(InterviewSerializer(interviews, many=True).data, status=status.HTTP_201_CREATED)
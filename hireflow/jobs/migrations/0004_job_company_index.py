@@ -0,0 +1,26 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_indexes'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['company', 'is_active', '-created_at', '-id'], name='job_company_active_idx'),
+        ),
+        # The composite index leads with company, so the FK's own index is redundant
+        migrations.AlterField(
+            model_name='job',
+            name='company',
+            field=models.ForeignKey(
+                blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE,
+                related_name='jobs', to='tenants.company',
+            ),
+        ),
+    ]
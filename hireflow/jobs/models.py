@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from tenants.managers import TenantQuerySet
 from tenants.models import Company
 
 
@@ -21,7 +22,23 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     posted_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     # Multi-tenant isolation: every job belongs to one company
-    company = models.ForeignKey(Company, null=True, blank=True, on_delete=models.CASCADE, related_name='jobs')
+    company = models.ForeignKey(
+        Company, null=True, blank=True, on_delete=models.CASCADE, related_name='jobs', db_index=False,
+    )
+
+    objects = TenantQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Per-tenant listings: ?is_active filter, newest first; also
+            # serves company lookups, so company has no index of its own
+            models.Index(fields=['company', 'is_active', '-created_at', '-id'], name='job_company_active_idx'),
+            models.Index(fields=['is_active', 'job_type', '-created_at'], name='job_active_type_created_idx'),
+            # Default listing (?is_active=true, newest first) only ever reads open jobs
+            models.Index(
+                fields=['-created_at'], condition=models.Q(is_active=True), name='job_open_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
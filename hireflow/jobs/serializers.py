@@ -1,9 +1,16 @@
 from rest_framework import serializers
+from hireflow.serializers import ValuesSerializer
+from tenants.serializers import TenantScopedFieldsMixin
 from .models import Job
 
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(TenantScopedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Job
         fields = '__all__'
         read_only_fields = ['id', 'created_at']
+
+
+class JobListSerializer(ValuesSerializer):
+    """JobSerializer output from values() rows, for the list."""
+    serializer_class = JobSerializer
@@ -1,20 +1,24 @@
 from rest_framework import viewsets, filters
 from rest_framework.permissions import IsAuthenticated
+from hireflow.serializers import ValuesListMixin
+from tenants.mixins import TenantScopedMixin
 from .models import Job
-from .serializers import JobSerializer
+from .serializers import JobListSerializer, JobSerializer
 
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(TenantScopedMixin, ValuesListMixin, viewsets.ModelViewSet):
     """CRUD for job postings.
 
     Supports filtering by is_active, ordering by created_at.
-    Only authenticated users can access.
+    Only authenticated users can access; they see their company's jobs.
     """
     queryset = Job.objects.all().order_by('-created_at')
     serializer_class = JobSerializer
+    list_serializer_class = JobListSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['created_at', 'title', 'salary_min']
+    ordering = ['-created_at']
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -27,4 +31,4 @@ class JobViewSet(viewsets.ModelViewSet):
         return qs
 
     def perform_create(self, serializer):
-        serializer.save(posted_by=self.request.user)
+        serializer.save(posted_by=self.request.user, **self.tenant_save_kwargs())
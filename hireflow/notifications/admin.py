@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['dedupe_key', 'topic', 'created_at', 'attempts', 'available_at', 'sent_at']
+    list_filter = ['topic', ('sent_at', admin.EmptyFieldListFilter)]
+    search_fields = ['dedupe_key']
+    readonly_fields = ['created_at']
@@ -0,0 +1,156 @@
+"""Batched email delivery over a reused mail connection.
+
+``send_mail`` opens and closes a connection per message, which for SMTP
+means one TCP and TLS handshake per email. BatchMailer buffers messages
+and sends them in batches through one connection, kept open for the
+mailer's lifetime::
+
+    with BatchMailer() as mailer:
+        for message in messages:
+            mailer.add(message)
+
+A batch is flushed when it reaches ``batch_size`` messages, when the
+oldest buffered message has waited ``flush_interval`` seconds (checked on
+``add`` and ``flush_if_due``), and when the mailer is closed.
+
+Within a batch each message is handed to the backend on its own
+(``send_messages`` only reports a count), so every message the backend
+accepted is known: they are collected in ``mailer.delivered``. Every
+flush is logged with its size, delivered count and duration, and
+recorded in ``mailer.batches``. Any Django email backend works, so the
+locmem, console and file backends, or a local debugging SMTP server, can
+stand in for production SMTP.
+
+Defaults come from ``settings.NOTIFICATIONS_MAIL`` (BATCH_SIZE,
+FLUSH_INTERVAL).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 5.0,
+}
+
+
+@dataclass(frozen=True)
+class BatchStats:
+    size: int
+    sent: int
+    seconds: float
+
+    @property
+    def failed(self) -> int:
+        return self.size - self.sent
+
+
+class BatchMailer:
+    """Buffer EmailMessages and send them in batches over one connection.
+
+    Args:
+        batch_size: Messages per ``send_messages`` call.
+        flush_interval: Seconds a message may wait in the buffer.
+        connection: Email backend instance to use; by default one is
+            created with ``get_connection(fail_silently=...)``.
+        fail_silently: Passed to the default connection. With True (the
+            notification default) undeliverable messages are counted as
+            failed instead of raising.
+    """
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        connection=None,
+        fail_silently: bool = True,
+    ):
+        config = {**DEFAULTS, **getattr(settings, 'NOTIFICATIONS_MAIL', {})}
+        self.batch_size = max(1, batch_size or config['BATCH_SIZE'])
+        self.flush_interval = flush_interval if flush_interval is not None else config['FLUSH_INTERVAL']
+        self.connection = connection
+        self.fail_silently = fail_silently
+        self.batches: list[BatchStats] = []
+        self.delivered: list[EmailMessage] = []
+        self._buffer: list[EmailMessage] = []
+        self._oldest: float | None = None
+        self._opened = False
+
+    def add(self, message: EmailMessage) -> None:
+        if not self._buffer:
+            self._oldest = time.monotonic()
+        self._buffer.append(message)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        if self._buffer and time.monotonic() - self._oldest >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> BatchStats | None:
+        """Send everything buffered now; returns the batch's stats."""
+        if not self._buffer:
+            return None
+        batch, self._buffer, self._oldest = self._buffer, [], None
+
+        if self.connection is None:
+            self.connection = get_connection(fail_silently=self.fail_silently)
+        if not self._opened:
+            # Backends return None from open() when no new connection was needed
+            self.connection.open()
+            self._opened = True
+
+        started, sent = time.perf_counter(), 0
+        try:
+            for message in batch:
+                if self.connection.send_messages([message]):
+                    sent += 1
+                    self.delivered.append(message)
+        except Exception:
+            # The connection may be unusable now; reopen it for the next batch
+            self.connection.close()
+            self._opened = False
+            self._record(len(batch), sent, time.perf_counter() - started)
+            raise
+        return self._record(len(batch), sent, time.perf_counter() - started)
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self.connection is not None and self._opened:
+                self.connection.close()
+                self._opened = False
+
+    def _record(self, size: int, sent: int, seconds: float) -> BatchStats:
+        stats = BatchStats(size=size, sent=sent, seconds=seconds)
+        self.batches.append(stats)
+        log = logger.warning if stats.failed else logger.info
+        log("Mail batch: size=%d, sent=%d, failed=%d, %.1f ms", size, sent, stats.failed, seconds * 1e3)
+        return stats
+
+    @property
+    def sent(self) -> int:
+        return sum(batch.sent for batch in self.batches)
+
+    @property
+    def failed(self) -> int:
+        return sum(batch.failed for batch in self.batches)
+
+    def __enter__(self) -> BatchMailer:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self.connection is not None and self._opened:
+            self.connection.close()
@@ -0,0 +1,45 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import BATCH_SIZE, purge_sent, relay
+
+
+class Command(BaseCommand):
+    help = 'Hand pending notification outbox messages to the task queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help=f'Messages dispatched per transaction (default: {BATCH_SIZE}).',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running, polling for new messages (for a dedicated relay process).',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Seconds to wait when the outbox is empty, with --loop (default: 1).',
+        )
+        parser.add_argument(
+            '--purge-after-days', type=int, default=7,
+            help='Delete messages sent more than this many days ago (default: 7, 0 disables).',
+        )
+
+    def handle(self, *args, **options):
+        purge_after = timedelta(days=options['purge_after_days'])
+        if not options['loop']:
+            sent = relay(batch_size=options['batch_size'])
+            purged = purge_sent(purge_after) if options['purge_after_days'] else 0
+            self.stdout.write(self.style.SUCCESS(f'Relayed {sent} messages, purged {purged}.'))
+            return
+
+        last_purge = 0.0
+        while True:
+            sent = relay(batch_size=options['batch_size'], max_batches=10)
+            if options['purge_after_days'] and time.monotonic() - last_purge > 3600:
+                purge_sent(purge_after)
+                last_purge = time.monotonic()
+            if sent < options['batch_size']:
+                time.sleep(options['interval'])
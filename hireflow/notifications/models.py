@@ -0,0 +1,34 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """A notification waiting to be handed to the task queue.
+
+    Rows are written in the same transaction as the change they announce
+    and drained by the relay (notifications.outbox), so a broker outage
+    never fails or slows the request. ``dedupe_key`` makes enqueueing
+    idempotent and travels with the payload so consumers can drop
+    redeliveries.
+    """
+    topic = models.CharField(max_length=50)
+    payload = models.JSONField()
+    dedupe_key = models.CharField(max_length=200, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Earliest time the relay may (re)try; pushed back after failures
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The relay only ever reads pending rows
+            models.Index(
+                fields=['available_at', 'id'], condition=models.Q(sent_at__isnull=True),
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.topic}:{self.dedupe_key}"
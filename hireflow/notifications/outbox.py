@@ -0,0 +1,157 @@
+"""Transactional outbox for notifications.
+
+Producers call ``enqueue``/``enqueue_many`` inside the transaction that
+makes the change (a stage transition, ...), so the notification is
+recorded if and only if the change commits, and the request never talks
+to the broker. The relay (``manage.py relay_outbox --loop``, and
+the ``relay_outbox`` Celery task that beat runs every
+``OUTBOX_RELAY_INTERVAL`` seconds) drains pending rows in batches,
+hands each topic's batch to the task backend in one call, and marks the
+rows sent.
+
+Delivery is at-least-once: if the relay dies between dispatching and
+committing, the batch is dispatched again. Every payload carries its
+``dedupe_key`` so consumers can drop the repeat.
+
+The backend is ``settings.NOTIFICATIONS_OUTBOX_BACKEND``: ``celery``
+(default) or ``tasks`` (notifications.background_tasks).
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+STAGE_CHANGE = 'stage_change'
+INTERVIEW_REMINDER = 'interview_reminder'
+
+BATCH_SIZE = 100
+MAX_BACKOFF = timedelta(hours=1)
+# Failures after this many attempts are logged as errors (rows keep retrying)
+ALERT_AFTER_ATTEMPTS = 5
+
+Dispatcher = Callable[[list[dict]], None]
+
+
+def _celery_stage_change(payloads: list[dict]) -> None:
+    from .tasks import send_stage_change_emails
+    send_stage_change_emails.delay(payloads)
+
+
+def _celery_interview_reminder(payloads: list[dict]) -> None:
+    from .tasks import send_interview_reminders
+    send_interview_reminders.delay(payloads)
+
+
+def _tasks_stage_change(payloads: list[dict]) -> None:
+    from .background_tasks import send_stage_notification
+    for payload in payloads:
+        send_stage_notification(
+            payload['candidate_email'], payload['candidate_name'], payload['job_title'], payload['new_stage'],
+        )
+
+
+DISPATCHERS: dict[str, dict[str, Dispatcher]] = {
+    'celery': {STAGE_CHANGE: _celery_stage_change, INTERVIEW_REMINDER: _celery_interview_reminder},
+    # django.tasks has no batch reminder task; reminders always go through Celery
+    'tasks': {STAGE_CHANGE: _tasks_stage_change, INTERVIEW_REMINDER: _celery_interview_reminder},
+}
+
+
+def _dispatchers() -> dict[str, Dispatcher]:
+    return DISPATCHERS[getattr(settings, 'NOTIFICATIONS_OUTBOX_BACKEND', 'celery')]
+
+
+def enqueue(topic: str, payload: dict, dedupe_key: str) -> None:
+    """Record one message; a repeated ``dedupe_key`` is ignored."""
+    enqueue_many([(topic, payload, dedupe_key)])
+
+
+def enqueue_many(messages: Iterable[tuple[str, dict, str]]) -> None:
+    """Record ``(topic, payload, dedupe_key)`` messages with one INSERT."""
+    OutboxMessage.objects.bulk_create(
+        [OutboxMessage(topic=topic, payload=payload, dedupe_key=key) for topic, payload, key in messages],
+        ignore_conflicts=True,
+    )
+
+
+def _backoff(attempts: int) -> timedelta:
+    return min(timedelta(seconds=2 ** attempts), MAX_BACKOFF)
+
+
+def relay_batch(batch_size: int = BATCH_SIZE) -> int:
+    """Dispatch up to ``batch_size`` due messages; returns how many were sent.
+
+    Rows are locked with SKIP LOCKED, so several relays can run side by
+    side without dispatching the same row twice. A topic whose dispatch
+    fails is retried later with exponential backoff.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(sent_at__isnull=True, available_at__lte=now)
+            .order_by('available_at', 'id')[:batch_size]
+        )
+        if not messages:
+            return 0
+
+        by_topic: dict[str, list[OutboxMessage]] = defaultdict(list)
+        for message in messages:
+            by_topic[message.topic].append(message)
+
+        sent = 0
+        dispatchers = _dispatchers()
+        for topic, group in by_topic.items():
+            for message in group:
+                message.attempts += 1
+            try:
+                dispatch = dispatchers.get(topic)
+                if dispatch is None:
+                    raise LookupError(f"No dispatcher for topic {topic!r}")
+                dispatch([{**message.payload, 'dedupe_key': message.dedupe_key} for message in group])
+            except Exception as exc:
+                attempts = max(message.attempts for message in group)
+                log = logger.error if attempts >= ALERT_AFTER_ATTEMPTS else logger.warning
+                log("Outbox dispatch failed: topic=%s, messages=%d, attempts=%d: %s", topic, len(group), attempts, exc)
+                for message in group:
+                    message.last_error = str(exc)[:2000]
+                    message.available_at = now + _backoff(message.attempts)
+            else:
+                for message in group:
+                    message.sent_at = now
+                    message.last_error = ''
+                sent += len(group)
+
+        OutboxMessage.objects.bulk_update(messages, ['attempts', 'last_error', 'available_at', 'sent_at'])
+    return sent
+
+
+def relay(batch_size: int = BATCH_SIZE, max_batches: int | None = None) -> int:
+    """Drain due messages batch by batch until none are left; returns the number sent."""
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        sent = relay_batch(batch_size)
+        total += sent
+        batches += 1
+        if sent < batch_size:
+            break
+    return total
+
+
+def purge_sent(older_than: timedelta) -> int:
+    """Delete messages sent more than ``older_than`` ago.
+
+    Run hourly by ``relay_outbox --loop`` and by the ``purge_outbox`` beat task.
+    """
+    deleted, _ = OutboxMessage.objects.filter(sent_at__lt=timezone.now() - older_than).delete()
+    return deleted
@@ -0,0 +1,103 @@
+"""Periodic interview reminder dispatcher.
+
+Every beat tick (``dispatch_interview_reminders``) scans the interviews
+starting within the next ``LEAD_TIME`` whose reminder has not been sent,
+queues one INTERVIEW_REMINDER outbox message per interview and stamps
+``reminder_sent_at``, all in one transaction. The scan is a range query
+on ``intv_reminder_due_idx``, a partial index holding only interviews
+still waiting for a reminder, so its cost follows the number of due
+reminders rather than the size of the interview table.
+
+Each reminder goes out once:
+
+- rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so overlapping
+  ticks split the due interviews instead of both taking them;
+- the outbox ``dedupe_key`` (``interview_reminder:<id>:<start timestamp>``)
+  is unique, so a row queued twice is stored once;
+- the send task skips keys it delivered before.
+
+Interviews already started when they are first seen get no reminder.
+Rescheduling an interview clears ``reminder_sent_at``; the new start time
+gives its reminder a new dedupe key.
+
+Settings: ``INTERVIEW_REMINDERS`` (LEAD_TIME in hours, BATCH_SIZE).
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import outbox
+
+DEFAULTS = {
+    'LEAD_TIME': 24,
+    'BATCH_SIZE': 500,
+}
+
+
+def _config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'INTERVIEW_REMINDERS', {})}
+
+
+def reminder_message(interview) -> tuple[str, dict, str]:
+    """Outbox message for ``interview`` (uses the loaded candidate and job)."""
+    candidate = interview.application.candidate
+    payload = {
+        'candidate_email': candidate.email,
+        'candidate_name': f"{candidate.first_name} {candidate.last_name}",
+        'job_title': interview.application.job.title,
+        'interview_time': interview.scheduled_at.isoformat(),
+    }
+    dedupe_key = f"interview_reminder:{interview.pk}:{int(interview.scheduled_at.timestamp())}"
+    return outbox.INTERVIEW_REMINDER, payload, dedupe_key
+
+
+def due_reminders(now: datetime, lead_time: timedelta):
+    """Interviews starting in ``(now, now + lead_time]`` without a reminder yet."""
+    from interviews.models import Interview
+
+    return Interview.objects.filter(
+        reminder_sent_at__isnull=True,
+        completed=False,
+        scheduled_at__gt=now,
+        scheduled_at__lte=now + lead_time,
+    )
+
+
+def dispatch_batch(now: datetime | None = None, lead_time: timedelta | None = None,
+                   batch_size: int | None = None) -> int:
+    """Queue reminders for up to ``batch_size`` due interviews; returns how many."""
+    from interviews.models import Interview
+
+    config = _config()
+    now = now or timezone.now()
+    lead_time = lead_time or timedelta(hours=config['LEAD_TIME'])
+    batch_size = batch_size or config['BATCH_SIZE']
+
+    with transaction.atomic():
+        interviews = list(
+            due_reminders(now, lead_time)
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('application__candidate', 'application__job')
+            .order_by('scheduled_at')[:batch_size]
+        )
+        if not interviews:
+            return 0
+        outbox.enqueue_many(reminder_message(interview) for interview in interviews)
+        Interview.objects.filter(pk__in=[interview.pk for interview in interviews]).update(reminder_sent_at=now)
+    return len(interviews)
+
+
+def dispatch(now: datetime | None = None, lead_time: timedelta | None = None,
+             batch_size: int | None = None) -> int:
+    """Queue every due reminder, batch by batch; returns the number queued."""
+    batch_size = batch_size or _config()['BATCH_SIZE']
+    total = 0
+    while True:
+        queued = dispatch_batch(now, lead_time, batch_size)
+        total += queued
+        if queued < batch_size:
+            return total
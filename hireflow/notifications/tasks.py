@@ -1,7 +1,44 @@
+from datetime import timedelta
+
 from celery import shared_task
-from django.core.mail import send_mail, BadHeaderError
+from celery.utils.time import get_exponential_backoff_interval
+from django.core.cache import cache
+from django.core.mail import EmailMessage, send_mail, BadHeaderError
 from django.conf import settings
 
+from .mailer import BatchMailer
+
+# How long delivered outbox dedupe keys are remembered
+DEDUPE_TTL = 7 * 24 * 3600
+
+STAGE_MESSAGES = {
+    'SCREENING': "Your application is moving to the screening phase.",
+    'INTERVIEW': "Congratulations! You've been selected for an interview.",
+    'OFFER': "We are pleased to extend an offer for this position.",
+    'HIRED': "Welcome to the team! Your application has been accepted.",
+    'REJECTED': "Thank you for your interest. We will not be moving forward at this time.",
+}
+
+
+def _stage_change_content(candidate_name, job_title, new_stage):
+    """Subject and body of a stage change email."""
+    message = STAGE_MESSAGES.get(new_stage, f"Your application status has been updated to {new_stage}.")
+    return (
+        f"Application Update: {job_title}",
+        f"Dear {candidate_name},\n\n{message}\n\nBest regards,\nHireflow Team",
+    )
+
+
+def _interview_reminder_content(candidate_name, job_title, interview_time):
+    """Subject and body of an interview reminder email."""
+    return (
+        f"Interview Reminder: {job_title}",
+        f"Dear {candidate_name},\n\n"
+        f"This is a reminder of your interview for {job_title} "
+        f"scheduled for {interview_time}.\n\n"
+        "Best regards,\nHireflow Team",
+    )
+
 
 # Celery 5.0: autoretry_for replaces manual self.retry() boilerplate
 @shared_task(autoretry_for=(Exception,), max_retries=3, retry_backoff=True)
@@ -14,19 +51,10 @@ def send_stage_change_email(candidate_email, candidate_name, job_title, new_stag
         job_title: Title of the job position.
         new_stage: The new pipeline stage name.
     """
-    stage_messages = {
-        'SCREENING': "Your application is moving to the screening phase.",
-        'INTERVIEW': "Congratulations! You've been selected for an interview.",
-        'OFFER': "We are pleased to extend an offer for this position.",
-        'HIRED': "Welcome to the team! Your application has been accepted.",
-        'REJECTED': "Thank you for your interest. We will not be moving forward at this time.",
-    }
-
-    message = stage_messages.get(new_stage, f"Your application status has been updated to {new_stage}.")
-
+    subject, body = _stage_change_content(candidate_name, job_title, new_stage)
     send_mail(
-        subject=f"Application Update: {job_title}",
-        message=f"Dear {candidate_name},\n\n{message}\n\nBest regards,\nHireflow Team",
+        subject=subject,
+        message=body,
         from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@hireflow.com'),
         recipient_list=[candidate_email],
         fail_silently=True,
@@ -35,6 +63,92 @@ def send_stage_change_email(candidate_email, candidate_name, job_title, new_stag
     return {"sent": True, "to": candidate_email, "stage": new_stage}
 
 
+def _undelivered(items):
+    """Drop items whose outbox ``dedupe_key`` was delivered before."""
+    keys = [f"notifications:sent:{item['dedupe_key']}" for item in items if item.get('dedupe_key')]
+    delivered = {key.removeprefix('notifications:sent:') for key in cache.get_many(keys)}
+    return [item for item in items if item.get('dedupe_key') not in delivered]
+
+
+def _mark_delivered(items):
+    cache.set_many(
+        {f"notifications:sent:{item['dedupe_key']}": 1 for item in items if item.get('dedupe_key')},
+        timeout=DEDUPE_TTL,
+    )
+
+
+class DeliveryError(Exception):
+    """Some emails of a batched task were not delivered; ``failed`` lists their items."""
+
+    def __init__(self, failed, total):
+        super().__init__(failed, total)  # args as given, so results can pickle it
+        self.failed = failed
+
+    def __str__(self):
+        return f"{len(self.failed)} of {self.args[1]} emails were not delivered"
+
+
+def _send_batched(items, build_message):
+    """Send one email per item through a BatchMailer; returns the task result.
+
+    Every item the backend accepted is marked delivered, also when a later
+    send raises. If any item was not delivered, DeliveryError carries the
+    undelivered items for _retry_undelivered.
+    """
+    pending = _undelivered(items)
+    built = [(build_message(item), item) for item in pending]
+    mailer = BatchMailer()
+    try:
+        with mailer:
+            for message, _ in built:
+                mailer.add(message)
+    except Exception as exc:
+        error = exc
+    else:
+        error = None
+    delivered = {id(message) for message in mailer.delivered}
+    _mark_delivered([item for message, item in built if id(message) in delivered])
+    failed = [item for message, item in built if id(message) not in delivered]
+    if failed:
+        raise DeliveryError(failed, len(pending)) from error
+    return {
+        "sent": mailer.sent,
+        "requested": len(pending),
+        "duplicates": len(items) - len(pending),
+        "batches": len(mailer.batches),
+    }
+
+
+def _retry_undelivered(task, exc):
+    """Retry ``task`` with only the items of ``exc`` that were not delivered."""
+    countdown = get_exponential_backoff_interval(factor=1, retries=task.request.retries, maximum=600, full_jitter=True)
+    raise task.retry(args=[exc.failed], exc=exc, countdown=countdown)
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), max_retries=3, retry_backoff=True)
+def send_stage_change_emails(self, notifications):
+    """Send many stage change emails in batches over one mail connection.
+
+    Args:
+        notifications: List of dicts with the keyword arguments of
+            send_stage_change_email, plus an optional ``dedupe_key``
+            (from the outbox); keys delivered before are skipped.
+
+    Returns:
+        dict with the number of emails sent, duplicates skipped and batches.
+    """
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@hireflow.com')
+
+    def build(item):
+        subject, body = _stage_change_content(item['candidate_name'], item['job_title'], item['new_stage'])
+        return EmailMessage(subject, body, from_email, [item['candidate_email']])
+
+    try:
+        return _send_batched(notifications, build)
+    except DeliveryError as exc:
+        _retry_undelivered(self, exc)
+
+
 @shared_task(autoretry_for=(Exception,), max_retries=3, retry_backoff=True)
 def send_interview_reminder(candidate_email, candidate_name, job_title, interview_time):
     """Send interview reminder 24 hours before scheduled time.
@@ -45,17 +159,57 @@ def send_interview_reminder(candidate_email, candidate_name, job_title, intervie
         job_title: Position title.
         interview_time: ISO format datetime string.
     """
+    subject, body = _interview_reminder_content(candidate_name, job_title, interview_time)
     send_mail(
-        subject=f"Interview Reminder: {job_title}",
-        message=(
-            f"Dear {candidate_name},\n\n"
-            f"This is a reminder of your interview for {job_title} "
-            f"scheduled for {interview_time}.\n\n"
-            "Best regards,\nHireflow Team"
-        ),
+        subject=subject,
+        message=body,
         from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@hireflow.com'),
         recipient_list=[candidate_email],
         fail_silently=True,
     )
 
     return {"sent": True, "to": candidate_email}
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), max_retries=3, retry_backoff=True)
+def send_interview_reminders(self, reminders):
+    """Send many interview reminders in batches over one mail connection.
+
+    Args:
+        reminders: List of dicts with the keyword arguments of
+            send_interview_reminder, plus an optional ``dedupe_key``.
+
+    Returns:
+        dict with the number of emails sent, duplicates skipped and batches.
+    """
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@hireflow.com')
+
+    def build(item):
+        subject, body = _interview_reminder_content(item['candidate_name'], item['job_title'], item['interview_time'])
+        return EmailMessage(subject, body, from_email, [item['candidate_email']])
+
+    try:
+        return _send_batched(reminders, build)
+    except DeliveryError as exc:
+        _retry_undelivered(self, exc)
+
+
+@shared_task
+def dispatch_interview_reminders():
+    """Queue reminders for interviews starting soon; run periodically by beat."""
+    from .reminders import dispatch
+    return {"queued": dispatch()}
+
+
+@shared_task
+def relay_outbox(batch_size=100):
+    """Drain the notification outbox; run by beat (``relay-outbox``)."""
+    from .outbox import relay
+    return {"sent": relay(batch_size=batch_size)}
+
+
+@shared_task
+def purge_outbox(older_than_days=7):
+    """Delete outbox messages sent more than ``older_than_days`` ago; run by beat (``purge-outbox``)."""
+    from .outbox import purge_sent
+    return {"purged": purge_sent(timedelta(days=older_than_days))}
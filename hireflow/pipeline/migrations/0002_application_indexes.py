@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['stage'], name='app_stage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'stage'], name='app_job_stage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-applied_at', '-id'], name='app_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stagehistory',
+            index=models.Index(fields=['application', 'changed_at'], name='history_app_changed_idx'),
+        ),
+    ]
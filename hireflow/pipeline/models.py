@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from candidates.models import Candidate
 from jobs.models import Job
+from tenants.managers import TenantQuerySet
 
 
 ALLOWED_TRANSITIONS = {
@@ -14,6 +15,12 @@ ALLOWED_TRANSITIONS = {
 }
 
 
+class ApplicationQuerySet(TenantQuerySet):
+    # Applications belong to their job's company (job_company_active_idx
+    # finds the tenant's jobs, app_job_stage_idx their applications)
+    tenant_lookup = 'job__company'
+
+
 class Application(models.Model):
     class Stage(models.TextChoices):
         NEW = 'NEW', 'New'
@@ -34,19 +41,33 @@ class Application(models.Model):
         on_delete=models.SET_NULL, related_name='updated_applications'
     )
 
+    objects = ApplicationQuerySet.as_manager()
+
     class Meta:
         unique_together = [['candidate', 'job']]
+        indexes = [
+            models.Index(fields=['stage'], name='app_stage_idx'),
+            models.Index(fields=['job', 'stage'], name='app_job_stage_idx'),
+            models.Index(fields=['-applied_at', '-id'], name='app_applied_idx'),
+        ]
 
     def can_transition_to(self, new_stage):
         allowed = ALLOWED_TRANSITIONS.get(self.stage, [])
         return new_stage in allowed
 
+    def transition_error(self, new_stage):
+        """Why moving to ``new_stage`` is not allowed, or None if it is."""
+        if self.can_transition_to(new_stage):
+            return None
+        return (
+            f"Invalid transition: {self.stage} -> {new_stage}. "
+            f"Allowed: {ALLOWED_TRANSITIONS.get(self.stage, [])}"
+        )
+
     def transition_to(self, new_stage, user=None):
-        if not self.can_transition_to(new_stage):
-            raise ValueError(
-                f"Invalid transition: {self.stage} -> {new_stage}. "
-                f"Allowed: {ALLOWED_TRANSITIONS.get(self.stage, [])}"
-            )
+        error = self.transition_error(new_stage)
+        if error:
+            raise ValueError(error)
         self.stage = new_stage
         if user:
             self.updated_by = user
@@ -66,5 +87,10 @@ class StageHistory(models.Model):
     changed_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['application', 'changed_at'], name='history_app_changed_idx'),
+        ]
+
     def __str__(self):
         return f"{self.application} : {self.from_stage} -> {self.to_stage}"
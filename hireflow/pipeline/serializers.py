@@ -1,4 +1,8 @@
+from collections import defaultdict
+
 from rest_framework import serializers
+from hireflow.serializers import ValuesSerializer
+from tenants.serializers import TenantScopedFieldsMixin
 from .models import Application, StageHistory
 
 
@@ -8,14 +12,52 @@ class StageHistorySerializer(serializers.ModelSerializer):
         fields = ['id', 'from_stage', 'to_stage', 'changed_by', 'changed_at', 'notes']
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(TenantScopedFieldsMixin, serializers.ModelSerializer):
     history = StageHistorySerializer(many=True, read_only=True)
+    score = serializers.SerializerMethodField()
 
     class Meta:
         model = Application
-        fields = ['id', 'candidate', 'job', 'stage', 'notes', 'applied_at', 'updated_at', 'history']
+        fields = ['id', 'candidate', 'job', 'stage', 'notes', 'applied_at', 'updated_at', 'score', 'history']
         read_only_fields = ['applied_at', 'updated_at']
 
+    def get_score(self, obj) -> float | None:
+        # Annotated by ApplicationViewSet on reads; negative means not scored yet
+        score = getattr(obj, 'score', None)
+        return score if score is not None and score >= 0 else None
+
+
+class StageHistoryListSerializer(ValuesSerializer):
+    serializer_class = StageHistorySerializer
+    extra_values = ('application_id',)
+
+
+class ApplicationListSerializer(ValuesSerializer):
+    """ApplicationSerializer output from values() rows, for the list.
+
+    The history of the whole page is read in one query, ordered by
+    application, then grouped.
+    """
+    serializer_class = ApplicationSerializer
+    computed = ('score', 'history')
+    extra_values = ('score',)
+
+    def prefetch(self, rows):
+        history = StageHistoryListSerializer(self.context)
+        entries = (
+            StageHistory.objects.filter(application_id__in=[row['id'] for row in rows])
+            .order_by('application_id', 'changed_at', 'id')
+            .values(*history.values())
+        )
+        self.history = defaultdict(list)
+        for entry in entries:
+            self.history[entry['application_id']].append(history.to_representation(entry))
+
+    def fill(self, row, data):
+        score = row['score']
+        data['score'] = score if score is not None and score >= 0 else None
+        data['history'] = self.history.get(row['id'], [])
+
 
 class TransitionSerializer(serializers.Serializer):
     new_stage = serializers.CharField()
@@ -26,3 +68,14 @@ class TransitionSerializer(serializers.Serializer):
         if value not in valid:
             raise serializers.ValidationError(f"Invalid stage: {value}")
         return value
+
+
+class BulkTransitionSerializer(TransitionSerializer):
+    MAX_IDS = 1000
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_IDS,
+    )
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))  # de-duplicate, keep order
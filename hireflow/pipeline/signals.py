@@ -1,21 +1,43 @@
 from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.dispatch import Signal, receiver
 from .models import StageHistory
-from notifications.tasks import send_stage_change_email
+from notifications import outbox
+
+# Sent after a bulk transition wrote its rows with bulk_update/bulk_create,
+# which fire no post_save. Kwargs: history, the list of new StageHistory
+# entries with application, candidate and job loaded.
+applications_transitioned = Signal()
+
+# Sent after applications were inserted with bulk_create (candidate imports).
+# Kwargs: applications, the new Application rows with job loaded.
+applications_created = Signal()
+
+
+def _stage_change_message(entry):
+    """Outbox message for a StageHistory entry (uses the loaded candidate and job)."""
+    candidate = entry.application.candidate
+    payload = {
+        'candidate_email': candidate.email,
+        'candidate_name': f"{candidate.first_name} {candidate.last_name}",
+        'job_title': entry.application.job.title,
+        'new_stage': entry.to_stage,
+    }
+    return outbox.STAGE_CHANGE, payload, f"stage_change:{entry.pk}"
 
 
 @receiver(post_save, sender=StageHistory)
 def on_stage_change(sender, instance, created, **kwargs):
-    """Fire email notification when a stage history entry is created."""
+    """Queue an email notification when a stage history entry is created.
+
+    The message goes to the outbox in the caller's transaction; the relay
+    hands it to the task queue after commit.
+    """
     if not created:
         return
+    outbox.enqueue(*_stage_change_message(instance))
 
-    candidate = instance.application.candidate
-    job = instance.application.job
 
-    send_stage_change_email.delay(
-        candidate_email=candidate.email,
-        candidate_name=f"{candidate.first_name} {candidate.last_name}",
-        job_title=job.title,
-        new_stage=instance.to_stage,
-    )
+@receiver(applications_transitioned)
+def on_bulk_stage_change(sender, history, **kwargs):
+    """Queue the notifications of a whole bulk transition with one INSERT."""
+    outbox.enqueue_many(_stage_change_message(entry) for entry in history)
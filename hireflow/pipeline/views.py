@@ -1,26 +1,123 @@
-from rest_framework import viewsets, status
+from django.db import transaction
+from django.db.models import F, FilteredRelation, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from candidates import providers
+from hireflow.export import stream_export
+from hireflow.serializers import ValuesListMixin
+from tenants.mixins import TenantScopedMixin
 from .models import Application, StageHistory
-from .serializers import ApplicationSerializer, TransitionSerializer
+from .serializers import (
+    ApplicationListSerializer, ApplicationSerializer, BulkTransitionSerializer, TransitionSerializer,
+)
+from .signals import applications_transitioned
 
+# Export column -> field lookup
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'candidate_id': 'candidate_id',
+    'candidate_first_name': 'candidate__first_name',
+    'candidate_last_name': 'candidate__last_name',
+    'candidate_email': 'candidate__email',
+    'job_id': 'job_id',
+    'job_title': 'job__title',
+    'stage': 'stage',
+    # The joined score itself: NULL, not UNSCORED, when there is none
+    'score': 'model_score__score',
+    'applied_at': 'applied_at',
+    'updated_at': 'updated_at',
+}
 
-class ApplicationViewSet(viewsets.ModelViewSet):
-    queryset = Application.objects.select_related('candidate', 'job').all()
+# Sorts unscored applications after every real score (0-100) in '-score' order
+UNSCORED = -1.0
+
+
+def annotate_scores(queryset, model):
+    """Annotate applications with ``score``: the candidate's AI score for
+    the application's job under embedding ``model``, or UNSCORED.
+
+    The score is LEFT JOINed from candidates.CandidateScore on
+    (candidate, job, model), which is unique, so rows are not duplicated.
+    """
+    return queryset.annotate(
+        model_score=FilteredRelation(
+            'candidate__scores',
+            condition=Q(candidate__scores__job=F('job'), candidate__scores__model=model),
+        ),
+        score=Coalesce('model_score__score', Value(UNSCORED)),
+    )
+
+
+class ApplicationViewSet(TenantScopedMixin, ValuesListMixin, viewsets.ModelViewSet):
+    """CRUD and stage transitions for applications.
+
+    Filters: ?job, ?stage, ?min_score, ?max_score. Ordering: ?ordering=
+    applied_at, updated_at or score (e.g. ``?job=7&ordering=-score``).
+    Scores come from the configured embedding model unless ?score_model
+    names another one.
+    """
+    queryset = Application.objects.select_related('candidate', 'job').prefetch_related('history')
     serializer_class = ApplicationSerializer
+    list_serializer_class = ApplicationListSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['applied_at', 'updated_at', 'score']
+    ordering = ['-applied_at']
+    SCORE_ACTIONS = ('list', 'retrieve', 'export')
 
     def get_queryset(self):
         qs = super().get_queryset()
-        job_id = self.request.query_params.get('job')
-        stage = self.request.query_params.get('stage')
+        params = self.request.query_params
+        job_id = params.get('job')
+        stage = params.get('stage')
         if job_id:
             qs = qs.filter(job_id=job_id)
         if stage:
             qs = qs.filter(stage=stage)
+
+        if not self._uses_score():
+            return qs
+        qs = annotate_scores(qs, params.get('score_model') or providers.get_provider().name)
+        # Filter on the joined score, not the coalesced one: unscored rows
+        # (NULL) match neither bound instead of passing every max_score
+        for param, lookup in (('min_score', 'model_score__score__gte'), ('max_score', 'model_score__score__lte')):
+            value = params.get(param)
+            if value is None:
+                continue
+            try:
+                qs = qs.filter(**{lookup: float(value)})
+            except ValueError:
+                raise ValidationError({param: 'Must be a number.'}) from None
         return qs
 
+    def _uses_score(self) -> bool:
+        """Whether this request renders, filters or orders by ``score``.
+
+        Writes and transitions skip the score join (and the provider lookup).
+        """
+        if self.action in self.SCORE_ACTIONS:
+            return True
+        params = self.request.query_params
+        ordering = params.get(filters.OrderingFilter.ordering_param, '')
+        return (
+            'min_score' in params or 'max_score' in params
+            or 'score' in (field.strip().lstrip('-') for field in ordering.split(','))
+        )
+
+    @action(detail=False, methods=['get'], url_path=r'export/(?P<file_format>csv|ndjson)')
+    def export(self, request, file_format=None):
+        """Stream every matching application as CSV or NDJSON, unpaginated.
+
+        Takes the same filters and ordering as the list; ``score`` is empty
+        (CSV) or null (NDJSON) for applications without a score, as in the API.
+        """
+        return stream_export(self.filter_queryset(self.get_queryset()), EXPORT_COLUMNS, file_format, 'applications')
+
     @action(detail=True, methods=['post'], url_path='transition')
     def transition(self, request, pk=None):
         application = self.get_object()
@@ -33,17 +130,72 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         old_stage = application.stage
 
         try:
-            application.transition_to(new_stage, user=request.user)
+            with transaction.atomic():
+                application.transition_to(new_stage, user=request.user)
+                # Creating StageHistory fires the signal which queues the email
+                # notification in the outbox, in this same transaction
+                StageHistory.objects.create(
+                    application=application,
+                    from_stage=old_stage,
+                    to_stage=new_stage,
+                    changed_by=request.user,
+                    notes=notes,
+                )
         except ValueError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Creating StageHistory fires the signal which sends email notification
-        StageHistory.objects.create(
-            application=application,
-            from_stage=old_stage,
-            to_stage=new_stage,
-            changed_by=request.user,
-            notes=notes,
-        )
-
         return Response(ApplicationSerializer(application).data)
+
+    @action(detail=False, methods=['post'], url_path='bulk-transition')
+    def bulk_transition(self, request):
+        """Move many applications to one stage: {"ids": [...], "new_stage": ..., "notes": ...}.
+
+        Transitions are validated in memory; the valid ones are written in
+        one transaction with a single bulk_update and a single bulk_create
+        of history rows; candidate notifications go to the outbox in the
+        same transaction. Rows that are missing or not allowed to move are
+        reported in ``errors`` and left untouched.
+        """
+        serializer = BulkTransitionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = serializer.validated_data['ids']
+        new_stage = serializer.validated_data['new_stage']
+        notes = serializer.validated_data.get('notes', '')
+
+        with transaction.atomic():
+            # Row locks keep from_stage exact if another request moves the same rows
+            applications = Application.objects.for_company(request.company).select_related('candidate', 'job').select_for_update(
+                of=('self',),
+            ).in_bulk(ids)
+
+            now = timezone.now()
+            moved, history, errors = [], [], []
+            for pk in ids:
+                application = applications.get(pk)
+                if application is None:
+                    errors.append({'id': pk, 'error': 'Not found'})
+                    continue
+                error = application.transition_error(new_stage)
+                if error:
+                    errors.append({'id': pk, 'error': error})
+                    continue
+                history.append(StageHistory(
+                    application=application, from_stage=application.stage, to_stage=new_stage,
+                    changed_by=request.user, notes=notes,
+                ))
+                application.stage = new_stage
+                application.updated_by = request.user
+                application.updated_at = now
+                moved.append(application)
+
+            if moved:
+                Application.objects.bulk_update(moved, ['stage', 'updated_by', 'updated_at'], batch_size=500)
+                StageHistory.objects.bulk_create(history, batch_size=500)
+                applications_transitioned.send(sender=Application, history=history)
+
+        return Response({
+            'updated': [application.pk for application in moved],
+            'errors': errors,
+        })
@@ -1,4 +1,11 @@
 from django.contrib import admin
-from .models import Company
+from .models import Company, Membership
 
 admin.site.register(Company)
+
+
+@admin.register(Membership)
+class MembershipAdmin(admin.ModelAdmin):
+    list_display = ['user', 'company', 'created_at']
+    list_select_related = ['user', 'company']
+    raw_id_fields = ['user']
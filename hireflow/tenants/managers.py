@@ -0,0 +1,25 @@
+"""Tenant-scoped querysets.
+
+Models owned by a tenant use TenantQuerySet (or a subclass naming the
+path to their company) as their default manager::
+
+    objects = TenantQuerySet.as_manager()
+    Job.objects.for_company(request.company)
+
+``for_company(None)`` leaves the queryset unscoped: requests from users
+without a company (staff, single-tenant installs) see every tenant, as
+before tenants existed.
+"""
+from __future__ import annotations
+
+from django.db import models
+
+
+class TenantQuerySet(models.QuerySet):
+    # Lookup path from the model to its tenants.Company
+    tenant_lookup = 'company'
+
+    def for_company(self, company):
+        if company is None:
+            return self
+        return self.filter(**{f'{self.tenant_lookup}_id': company.pk})
@@ -1,21 +1,51 @@
-from .models import Company
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .resolution import company_for_user, get_company
+from .tokens import COMPANY_CLAIM
 
 
 class TenantMiddleware:
-    """Attach the current company tenant to the request based on user profile.
+    """Attach the current company tenant to the request.
+
+    Each user belongs to one company via their Membership. Querysets are
+    then filtered by request.company in views.
 
-    Simple approach: each user belongs to one company via their profile.
-    Querysets are then filtered by request.company in views.
+    API requests carry the company id in their access token, so only the
+    (cached) company is loaded. Session requests, and tokens issued before
+    the claim existed, resolve the user's membership through the tenant
+    cache (see tenants.resolution).
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.jwt = JWTAuthentication()
 
     def __call__(self, request):
-        request.company = None
-        if request.user.is_authenticated:
-            try:
-                request.company = request.user.profile.company
-            except Exception:
-                pass
+        request.company = self.resolve(request)
         return self.get_response(request)
+
+    def resolve(self, request):
+        token = self.access_token(request)
+        if token is not None:
+            if COMPANY_CLAIM in token:
+                return get_company(token[COMPANY_CLAIM])
+            return company_for_user(int(token[api_settings.USER_ID_CLAIM]))
+        if request.user.is_authenticated:
+            return company_for_user(request.user.pk)
+        return None
+
+    def access_token(self, request):
+        """The validated access token of the request, or None.
+
+        Invalid tokens are left for DRF authentication to reject.
+        """
+        header = self.jwt.get_header(request)
+        raw_token = self.jwt.get_raw_token(header) if header else None
+        if raw_token is None:
+            return None
+        try:
+            return self.jwt.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            return None
@@ -0,0 +1,19 @@
+class TenantScopedMixin:
+    """Scope a view's queryset to ``request.company`` (see TenantMiddleware).
+
+    Put it before the DRF base class; querysets must come from a
+    TenantQuerySet. Objects created through the view are assigned to the
+    request's company when the model has a ``company`` field.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().for_company(getattr(self.request, 'company', None))
+
+    def tenant_save_kwargs(self):
+        company = getattr(self.request, 'company', None)
+        if company is None or self.queryset.tenant_lookup != 'company':
+            return {}
+        return {'company': company}
+
+    def perform_create(self, serializer):
+        serializer.save(**self.tenant_save_kwargs())
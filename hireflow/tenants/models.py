@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 
 
@@ -13,3 +14,13 @@ class Company(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class Membership(models.Model):
+    """Links a user to the company (tenant) they work in."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='membership')
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='memberships')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user} @ {self.company}"
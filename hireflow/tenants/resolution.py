@@ -0,0 +1,124 @@
+"""Cached tenant resolution.
+
+Resolving a user's company used to cost a membership query and a company
+query on every request. Both lookups now go through two cache tiers:
+
+- a per-process LRU with a short TTL (``LOCAL_TTL``), which serves most
+  requests without any I/O; it holds at most ``LOCAL_MAX_ENTRIES``
+  entries and drops expired ones when they are read;
+- the shared Django cache (``SHARED_TTL``), so a fresh worker process
+  does not go to the database for users already seen elsewhere.
+
+Two maps are cached: user id -> company id (users without a membership
+are cached too, as None), and company id -> Company. Saving or deleting a
+Membership or a Company (``is_active`` included) invalidates its entry in
+the shared cache and in the current process. Other processes drop their
+local copy within ``LOCAL_TTL`` seconds.
+
+Settings: ``TENANT_CACHE`` (LOCAL_TTL, SHARED_TTL in seconds,
+LOCAL_MAX_ENTRIES).
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+DEFAULTS = {
+    'LOCAL_TTL': 5,
+    'SHARED_TTL': 300,
+    'LOCAL_MAX_ENTRIES': 10_000,
+}
+
+# Cached value for "no company", distinct from a cache miss
+NO_COMPANY = 0
+
+_local: OrderedDict[str, tuple[float, object]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'TENANT_CACHE', {})}
+
+
+def _user_key(user_id: int) -> str:
+    return f'tenants:user-company:{user_id}'
+
+
+def _company_key(company_id: int) -> str:
+    return f'tenants:company:{company_id}'
+
+
+def _cached(key: str, load):
+    """Look ``key`` up in the local tier, then the shared tier, then ``load()``."""
+    now = time.monotonic()
+    with _lock:
+        entry = _local.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _local.move_to_end(key)
+                return entry[1]
+            del _local[key]
+
+    config = _config()
+    value = cache.get(key)
+    if value is None:
+        value = load()
+        cache.set(key, value, timeout=config['SHARED_TTL'])
+    with _lock:
+        _local[key] = (now + config['LOCAL_TTL'], value)
+        _local.move_to_end(key)
+        while len(_local) > config['LOCAL_MAX_ENTRIES']:
+            _local.popitem(last=False)
+    return value
+
+
+def company_id_for_user(user_id: int) -> int | None:
+    """The id of the company ``user_id`` belongs to, or None."""
+    from .models import Membership
+
+    def load():
+        company_id = Membership.objects.filter(user_id=user_id).values_list('company_id', flat=True).first()
+        return company_id or NO_COMPANY
+
+    return _cached(_user_key(user_id), load) or None
+
+
+def get_company(company_id: int | None):
+    """The Company with ``company_id`` (a copy, safe to modify), or None."""
+    from .models import Company
+
+    if company_id is None:
+        return None
+    company = _cached(
+        _company_key(company_id),
+        lambda: Company.objects.filter(pk=company_id).first() or NO_COMPANY,
+    )
+    return copy.copy(company) if company else None
+
+
+def company_for_user(user_id: int):
+    """The Company ``user_id`` belongs to, or None."""
+    return get_company(company_id_for_user(user_id))
+
+
+def invalidate_user(user_id: int) -> None:
+    cache.delete(_user_key(user_id))
+    with _lock:
+        _local.pop(_user_key(user_id), None)
+
+
+def invalidate_company(company_id: int) -> None:
+    cache.delete(_company_key(company_id))
+    with _lock:
+        _local.pop(_company_key(company_id), None)
+
+
+def clear_local() -> None:
+    """Drop this process's cached entries (tests, or after bulk changes)."""
+    with _lock:
+        _local.clear()
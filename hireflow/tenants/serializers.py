@@ -0,0 +1,33 @@
+"""Tenant scoping of serializer relations."""
+from __future__ import annotations
+
+from .managers import TenantQuerySet
+from .models import Company
+
+
+class TenantScopedFieldsMixin:
+    """Limit a serializer's writable relations to ``request.company``.
+
+    Put it before ModelSerializer. A relation to a tenant-owned model only
+    accepts objects of the request's company, and a relation to Company
+    only that company, so a write can never point at another tenant's
+    rows. Requests without a company stay unscoped, as in
+    TenantScopedMixin.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        company = getattr(self.context.get('request'), 'company', None)
+        if company is None:
+            return fields
+        for field in fields.values():
+            field = getattr(field, 'child_relation', field)
+            queryset = getattr(field, 'queryset', None)
+            if queryset is None:
+                continue
+            queryset = queryset.all()  # ModelSerializer passes the default manager
+            if queryset.model is Company:
+                field.queryset = queryset.filter(pk=company.pk)
+            elif isinstance(queryset, TenantQuerySet):
+                field.queryset = queryset.for_company(company)
+        return fields
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import resolution
+from .models import Company, Membership
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def on_membership_changed(sender, instance, **kwargs):
+    """Drop the cached company of the member; it may have moved or left."""
+    resolution.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def on_company_changed(sender, instance, **kwargs):
+    """Drop the cached company, so is_active and renames are seen at once."""
+    resolution.invalidate_company(instance.pk)
@@ -0,0 +1,31 @@
+"""JWT tokens that carry the user's company.
+
+Access tokens get a ``company_id`` claim (null for users without a
+company), so TenantMiddleware resolves the tenant of API requests without
+looking the membership up. The claim is re-resolved whenever an access
+token is issued, at login and at every refresh, so a membership change is
+picked up within ACCESS_TOKEN_LIFETIME.
+"""
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .resolution import company_id_for_user
+
+COMPANY_CLAIM = 'company_id'
+
+
+class TenantRefreshToken(RefreshToken):
+    @property
+    def access_token(self):
+        access = super().access_token
+        access[COMPANY_CLAIM] = company_id_for_user(int(self[api_settings.USER_ID_CLAIM]))
+        return access
+
+
+class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = TenantRefreshToken
+
+
+class TenantTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = TenantRefreshToken
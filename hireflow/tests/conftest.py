@@ -1,6 +1,17 @@
 import pytest
 from rest_framework.test import APIClient
 from .factories import UserFactory, AdminUserFactory
+from candidates import embeddings, providers
+from candidates.providers import EmbeddingProvider
+from tenants import resolution
+
+
+@pytest.fixture(autouse=True)
+def tenant_cache():
+    """Rolled-back tests reuse ids, so cached tenants must not outlive a test."""
+    resolution.clear_local()
+    yield
+    resolution.clear_local()
 
 
 @pytest.fixture
@@ -32,3 +43,30 @@ def admin_client(db):
     user = AdminUserFactory()
     client.force_authenticate(user=user)
     return client, user
+
+
+class StubProvider(EmbeddingProvider):
+    """Deterministic offline stand-in for the embeddings API."""
+
+    name = 'stub'
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('batch_size', 10_000)
+        super().__init__(**kwargs)
+        self.calls = []
+
+    def embed_batch(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in texts]
+
+    @property
+    def texts_embedded(self):
+        return sum(len(batch) for batch in self.calls)
+
+
+@pytest.fixture
+def stub_embedder(monkeypatch):
+    embeddings._lru.clear()
+    stub = StubProvider()
+    monkeypatch.setattr(providers, 'get_provider', lambda: stub)
+    return stub
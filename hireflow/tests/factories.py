@@ -5,6 +5,7 @@ from accounts.models import CustomUser
 from jobs.models import Job
 from candidates.models import Candidate
 from pipeline.models import Application
+from tenants.models import Company, Membership
 
 User = get_user_model()
 
@@ -26,6 +27,22 @@ class AdminUserFactory(UserFactory):
     is_superuser = True
 
 
+class CompanyFactory(DjangoModelFactory):
+    class Meta:
+        model = Company
+
+    name = factory.Sequence(lambda n: f'Company {n}')
+    slug = factory.Sequence(lambda n: f'company-{n}')
+
+
+class MembershipFactory(DjangoModelFactory):
+    class Meta:
+        model = Membership
+
+    user = factory.SubFactory(UserFactory)
+    company = factory.SubFactory(CompanyFactory)
+
+
 class JobFactory(DjangoModelFactory):
     class Meta:
         model = Job
@@ -33,7 +50,7 @@ class JobFactory(DjangoModelFactory):
     title = factory.Sequence(lambda n: f'Software Engineer {n}')
     description = factory.Faker('paragraph')
     location = factory.Faker('city')
-    job_type = Job.JobType.FULL_TIME
+    job_type = "FULL_TIME"
     salary_min = 50000
     salary_max = 80000
     is_active = True
@@ -0,0 +1,173 @@
+"""Tests for analytics rollups and endpoints."""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+
+from analytics import funnel as stage_cache
+from analytics.models import HiringMetric, RecruitmentFunnel
+from analytics.rollups import week_start
+
+from .factories import ApplicationFactory, JobFactory
+
+
+def _transition(client, app, *stages):
+    for stage in stages:
+        response = client.post(
+            f'/api/applications/{app.id}/transition/',
+            {'new_stage': stage},
+            format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+
+def _snapshot():
+    metrics = list(HiringMetric.objects.order_by('job_id', 'date').values())
+    funnels = list(
+        RecruitmentFunnel.objects.order_by('recruiter_id', 'week_start')
+        .values('recruiter_id', 'week_start', 'applications_received', 'screened',
+                'interviewed', 'offered', 'hired', 'rejected')
+    )
+    return metrics, funnels
+
+
+@pytest.mark.django_db
+class TestHiringMetricRollups:
+    def test_new_application_bumps_counters(self):
+        app = ApplicationFactory()
+        today = timezone.localdate()
+        metric = HiringMetric.objects.get(job=app.job, date=today)
+        assert metric.applications_count == 1
+        funnel = RecruitmentFunnel.objects.get(recruiter=app.job.posted_by, week_start=week_start(today))
+        assert funnel.applications_received == 1
+
+    def test_transitions_bump_stage_counters(self, auth_client):
+        client, user = auth_client
+        job = JobFactory()
+        hired = ApplicationFactory(job=job)
+        rejected = ApplicationFactory(job=job)
+        _transition(client, hired, 'SCREENING', 'INTERVIEW', 'OFFER', 'HIRED')
+        _transition(client, rejected, 'SCREENING', 'REJECTED')
+
+        metric = HiringMetric.objects.get(job=job, date=timezone.localdate())
+        assert metric.applications_count == 2
+        assert metric.screening_count == 2
+        assert metric.interview_count == 1
+        assert metric.offer_count == 1
+        assert metric.hire_count == 1
+        assert metric.rejection_count == 1
+
+        funnel = RecruitmentFunnel.objects.get(recruiter=job.posted_by)
+        assert funnel.screened == 2
+        assert funnel.hired == 1
+        assert funnel.hire_rate == 0.5
+
+    def test_rebuild_matches_incremental(self, auth_client):
+        client, user = auth_client
+        job = JobFactory()
+        apps = ApplicationFactory.create_batch(4, job=job)
+        ApplicationFactory(stage='INTERVIEW')
+        _transition(client, apps[0], 'SCREENING', 'INTERVIEW')
+        _transition(client, apps[1], 'REJECTED')
+        incremental = _snapshot()
+
+        HiringMetric.objects.update(applications_count=0)
+        call_command('rebuild_hiring_metrics', chunk_size=2, stdout=StringIO())
+
+        assert _snapshot() == incremental
+
+
+@pytest.mark.django_db
+class TestAnalyticsAPI:
+    def test_job_stats_reads_rollups(self, auth_client):
+        client, user = auth_client
+        job = JobFactory()
+        app = ApplicationFactory(job=job)
+        ApplicationFactory(job=job)
+        _transition(client, app, 'REJECTED')
+
+        response = client.get('/api/analytics/jobs/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{
+            'job_id': job.id,
+            'title': job.title,
+            'total_applications': 2,
+            'hired': 0,
+            'rejected': 1,
+            'in_progress': 1,
+            'conversion_rate': 0.0,
+        }]
+
+    def test_recruiter_funnel(self, auth_client):
+        client, user = auth_client
+        app = ApplicationFactory()
+        _transition(client, app, 'SCREENING')
+        response = client.get(f'/api/analytics/recruiters/?recruiter={app.job.posted_by_id}')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+        assert response.data[0]['applications_received'] == 1
+        assert response.data[0]['screen_rate'] == 100.0
+
+    def test_recruiter_funnel_validates_params(self, auth_client):
+        client, user = auth_client
+        for params in ('recruiter=abc', 'weeks=two'):
+            response = client.get(f'/api/analytics/recruiters/?{params}')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestStageCounts:
+    def test_funnel_single_query(self, auth_client, django_assert_num_queries):
+        from django.core.cache import cache
+        cache.clear()
+        client, user = auth_client
+        ApplicationFactory.create_batch(2, stage='NEW')
+        ApplicationFactory(stage='SCREENING')
+        ApplicationFactory(stage='REJECTED')
+
+        with django_assert_num_queries(1):
+            response = client.get('/api/analytics/funnel/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['funnel'][0] == {'stage': 'NEW', 'count': 2, 'conversion_from_previous': None}
+        assert response.data['funnel'][1]['conversion_from_previous'] == 50.0
+        assert response.data['rejected_total'] == 1
+
+        # Second call is served from cache
+        with django_assert_num_queries(0):
+            client.get('/api/analytics/pipeline/')
+
+    def test_stage_change_invalidates_cache(self, auth_client, django_capture_on_commit_callbacks):
+        client, user = auth_client
+        with django_capture_on_commit_callbacks(execute=True):
+            app = ApplicationFactory(stage='NEW')
+        assert client.get('/api/analytics/pipeline/').data['NEW'] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            _transition(client, app, 'SCREENING')
+        response = client.get('/api/analytics/pipeline/')
+        assert response.data['NEW'] == 0
+        assert response.data['SCREENING'] == 1
+        assert response.data['total'] == 1
+
+    def test_invalidated_only_after_commit(self, django_capture_on_commit_callbacks):
+        from django.core.cache import cache
+        cache.clear()
+        assert stage_cache.stage_counts()['total'] == 0
+        with django_capture_on_commit_callbacks() as callbacks:
+            ApplicationFactory()
+            # Still inside the writer's transaction: the cached version is kept
+            assert stage_cache.stage_counts()['total'] == 0
+        for callback in callbacks:
+            callback()
+        assert stage_cache.stage_counts()['total'] == 1
+
+    def test_evicted_version_does_not_resurrect_old_counts(self):
+        from django.core.cache import cache
+        cache.clear()
+        cache.set(stage_cache._counts_key(None, 1), {'total': 99}, None)  # stale v1 entry
+        assert stage_cache.stage_counts()['total'] == 0
+        cache.delete(stage_cache._version_key(None))
+        stage_cache.invalidate(None)
+        assert stage_cache.stage_counts()['total'] == 0
@@ -130,3 +130,56 @@ class TestJobAPI:
         JobFactory(posted_by=user, is_active=False)
         response = client.get('/api/jobs/?is_active=true')
         assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestCandidatesByStage:
+    def test_groups_candidates_by_stage(self, auth_client):
+        client, user = auth_client
+        screening = ApplicationFactory(stage='SCREENING')
+        interview = ApplicationFactory(stage='INTERVIEW')
+        # Same candidate in two stages on different jobs
+        ApplicationFactory(candidate=screening.candidate, stage='OFFER')
+
+        response = client.get('/api/candidates/by-stage/')
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {'NEW', 'SCREENING', 'INTERVIEW', 'OFFER', 'HIRED', 'REJECTED'}
+        assert [c['id'] for c in response.data['SCREENING']['results']] == [screening.candidate.id]
+        assert [c['id'] for c in response.data['OFFER']['results']] == [screening.candidate.id]
+        assert [c['id'] for c in response.data['INTERVIEW']['results']] == [interview.candidate.id]
+        assert response.data['NEW'] == {'results': [], 'next_cursor': None}
+
+    def test_candidate_listed_once_per_stage(self, auth_client):
+        client, user = auth_client
+        app = ApplicationFactory(stage='SCREENING')
+        ApplicationFactory(candidate=app.candidate, stage='SCREENING')
+        response = client.get('/api/candidates/by-stage/')
+        assert len(response.data['SCREENING']['results']) == 1
+
+    def test_query_count_is_constant(self, auth_client, django_assert_num_queries):
+        client, user = auth_client
+        for stage in ['NEW', 'SCREENING', 'INTERVIEW', 'OFFER']:
+            ApplicationFactory.create_batch(3, stage=stage)
+        with django_assert_num_queries(2):
+            client.get('/api/candidates/by-stage/')
+
+    def test_per_stage_cursor_pagination(self, auth_client):
+        client, user = auth_client
+        apps = ApplicationFactory.create_batch(5, stage='NEW')
+        ApplicationFactory(stage='HIRED')
+        ids = sorted((a.candidate.id for a in apps), reverse=True)
+
+        first = client.get('/api/candidates/by-stage/?limit=2').data
+        assert [c['id'] for c in first['NEW']['results']] == ids[:2]
+        assert first['NEW']['next_cursor'] == ids[1]
+        assert first['HIRED']['next_cursor'] is None
+
+        cursor = f"NEW:{first['NEW']['next_cursor']}"
+        second = client.get(f'/api/candidates/by-stage/?limit=2&cursor={cursor}').data
+        assert [c['id'] for c in second['NEW']['results']] == ids[2:4]
+        assert len(second['HIRED']['results']) == 1
+
+    def test_invalid_cursor(self, auth_client):
+        client, user = auth_client
+        response = client.get('/api/candidates/by-stage/?cursor=NEW')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,80 @@
+"""Tests for the streaming CSV/NDJSON exports."""
+import csv
+import io
+import json
+
+import pytest
+
+from candidates import providers
+from candidates.models import CandidateScore
+
+from .factories import ApplicationFactory, CandidateFactory, JobFactory
+
+
+def _body(response):
+    assert response.status_code == 200
+    assert response.streaming
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestCandidateExport:
+    def test_csv(self, auth_client):
+        client, user = auth_client
+        candidates = CandidateFactory.create_batch(3)
+        rows = list(csv.DictReader(io.StringIO(_body(client.get('/api/candidates/export/csv/')))))
+        assert [int(row['id']) for row in rows] == [c.id for c in reversed(candidates)]
+        assert rows[0]['email'] == candidates[-1].email
+        assert rows[0]['company_id'] == ''
+
+    def test_ndjson_honours_filters(self, auth_client):
+        client, user = auth_client
+        job = JobFactory()
+        application = ApplicationFactory(job=job, stage='SCREENING')
+        ApplicationFactory(job=job)
+        CandidateFactory(first_name='Zed')
+        response = client.get('/api/candidates/export/ndjson/', {'job': job.id, 'stage': 'SCREENING'})
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in _body(response).splitlines()]
+        assert [row['id'] for row in rows] == [application.candidate_id]
+
+        rows = _body(client.get('/api/candidates/export/ndjson/', {'q': 'zed'})).splitlines()
+        assert [json.loads(row)['first_name'] for row in rows] == ['Zed']
+
+    def test_single_query_in_chunks(self, auth_client, django_assert_num_queries):
+        client, user = auth_client
+        CandidateFactory.create_batch(5)
+        response = client.get('/api/candidates/export/csv/')
+        with django_assert_num_queries(1):
+            assert len(_body(response).splitlines()) == 6
+
+    def test_unknown_format(self, auth_client):
+        client, user = auth_client
+        assert client.get('/api/candidates/export/xml/').status_code == 404
+
+
+@pytest.mark.django_db
+class TestApplicationExport:
+    def test_csv_with_related_columns(self, auth_client):
+        client, user = auth_client
+        application = ApplicationFactory(stage='INTERVIEW')
+        ApplicationFactory(stage='NEW')
+        response = client.get('/api/applications/export/csv/', {'stage': 'INTERVIEW'})
+        assert response['Content-Disposition'].startswith('attachment; filename="applications-')
+        rows = list(csv.DictReader(io.StringIO(_body(response))))
+        assert len(rows) == 1
+        assert rows[0]['job_title'] == application.job.title
+        assert rows[0]['candidate_email'] == application.candidate.email
+        assert rows[0]['score'] == ''
+
+    def test_unscored_is_null(self, auth_client):
+        client, user = auth_client
+        scored, unscored = ApplicationFactory(), ApplicationFactory()
+        CandidateScore.objects.create(
+            candidate=scored.candidate, job=scored.job, model=providers.get_provider().name, score=72.5,
+        )
+        response = client.get('/api/applications/export/ndjson/', {'ordering': '-score'})
+        rows = [json.loads(line) for line in _body(response).splitlines()]
+        assert [(row['id'], row['score']) for row in rows] == [(scored.id, 72.5), (unscored.id, None)]
+        api = client.get('/api/applications/', {'ordering': '-score'}).data['results']
+        assert [row['score'] for row in api] == [72.5, None]
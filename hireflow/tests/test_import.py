@@ -0,0 +1,158 @@
+"""Tests for the bulk candidate import (importer, endpoint, command)."""
+import io
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from analytics.models import HiringMetric
+from candidates import tasks, views
+from candidates.importer import import_candidates, read_rows
+from candidates.models import Candidate
+from pipeline.models import Application
+
+from .factories import CandidateFactory, CompanyFactory, JobFactory, MembershipFactory, UserFactory
+
+HEADER = 'first_name,last_name,email,phone,linkedin_url\n'
+
+
+def _csv(*lines):
+    return io.BytesIO((HEADER + ''.join(f'{line}\n' for line in lines)).encode())
+
+
+def _import(*lines, **kwargs):
+    return import_candidates(read_rows(_csv(*lines), 'csv'), **kwargs)
+
+
+@pytest.mark.django_db
+class TestImporter:
+    def test_counts_and_row_errors(self):
+        CandidateFactory(email='known@example.com')
+        report = _import(
+            'Ada,Lovelace,ada@example.com,,',
+            'Ada,Again,ada@example.com,,',
+            'Known,Person,known@example.com,,',
+            'No,Email,,,',
+            'Bad,Email,not-an-email,,',
+            'Bad,Url,url@example.com,,nope',
+        )
+        assert (report.rows, report.created, report.existing, report.duplicates, report.failed) == (6, 1, 1, 1, 3)
+        assert [error['row'] for error in report.errors] == [5, 6, 7]
+        assert set(report.errors[0]['errors']) == {'email'}
+        assert set(report.errors[2]['errors']) == {'linkedin_url'}
+        assert Candidate.objects.get(email='ada@example.com').last_name == 'Lovelace'
+
+    def test_queries_per_chunk(self, django_assert_max_num_queries):
+        lines = [f'C,{n},c{n}@example.com,,' for n in range(50)]
+        # Per chunk: savepoint, email lookup, insert, release
+        with django_assert_max_num_queries(5 * 4):
+            report = _import(*lines, chunk_size=10)
+        assert report.created == 50
+
+    def test_applications_for_job_and_reimport(self):
+        job = JobFactory()
+        lines = [f'C,{n},c{n}@example.com,,' for n in range(3)]
+        report = _import(*lines, job=job, stage='SCREENING')
+        assert (report.created, report.applications) == (3, 3)
+        assert set(Application.objects.filter(job=job).values_list('stage', flat=True)) == {'SCREENING'}
+        metric = HiringMetric.objects.get(job=job)
+        assert (metric.applications_count, metric.screening_count) == (3, 3)
+
+        report = _import(*lines, 'D,1,d1@example.com,,', job=job)
+        assert (report.created, report.existing, report.applications) == (1, 3, 1)
+
+    def test_email_of_another_company(self):
+        company = CompanyFactory()
+        CandidateFactory(email='taken@example.com', company=CompanyFactory())
+        report = _import('T,T,taken@example.com,,', 'N,N,new@example.com,,', company=company)
+        assert (report.created, report.failed) == (1, 1)
+        assert Candidate.objects.get(email='new@example.com').company == company
+
+    def test_ndjson(self):
+        stream = io.BytesIO(
+            b'{"first_name": "A", "last_name": "B", "email": "ab@example.com"}\n\n{oops\n[1]\n'
+        )
+        report = import_candidates(read_rows(stream, 'ndjson'))
+        assert (report.created, report.failed) == (1, 2)
+        assert [error['row'] for error in report.errors] == [3, 4]
+
+
+@pytest.mark.django_db
+class TestImportAPI:
+    def test_upload_queues_import(self, auth_client, settings, tmp_path, monkeypatch):
+        settings.MEDIA_ROOT = tmp_path
+        queued, states = [], []
+        monkeypatch.setattr(tasks.import_candidates_file, 'delay', lambda *args: queued.append(args) or _Task())
+        monkeypatch.setattr(tasks.import_candidates_file, 'update_state', lambda **kw: states.append(kw))
+        client, user = auth_client
+        job = JobFactory()
+
+        upload = _csv('Ada,Lovelace,ada@example.com,,')
+        upload.name = 'people.csv'
+        response = client.post('/api/candidates/import/', {'file': upload, 'job': job.id}, format='multipart')
+        assert response.status_code == 202
+        assert response.data['status_url'].endswith('/api/candidates/import/abc123/')
+        assert cache.get(views.IMPORT_OWNER_KEY.format('abc123')) == {'company': None, 'user': user.pk}
+
+        path, file_format, company_id, job_id, stage = queued[0]
+        assert (file_format, job_id, stage) == ('csv', job.id, 'NEW')
+        result = tasks.import_candidates_file.run(*queued[0])
+        assert (result['created'], result['applications']) == (1, 1)
+        assert states[-1]['meta']['rows'] == 1
+        assert not (tmp_path / path).exists()
+
+    def test_validation(self, auth_client):
+        client, user = auth_client
+        upload = io.BytesIO(b'x')
+        upload.name = 'people.xlsx'
+        response = client.post('/api/candidates/import/', {'file': upload}, format='multipart')
+        assert response.status_code == 400
+        assert 'file_format' in response.data
+
+    def test_status(self, auth_client, monkeypatch):
+        client, user = auth_client
+        cache.set(views.IMPORT_OWNER_KEY.format('abc123'), {'company': None, 'user': user.pk})
+        monkeypatch.setattr(views, 'AsyncResult', lambda task_id: _Task(state='PROGRESS', info={'rows': 10}))
+        response = client.get('/api/candidates/import/abc123/')
+        assert response.data == {'id': 'abc123', 'state': 'PROGRESS', 'report': {'rows': 10}}
+
+    def test_status_only_for_owner(self, auth_client, monkeypatch):
+        client, user = auth_client
+        monkeypatch.setattr(views, 'AsyncResult', lambda task_id: _Task(state='SUCCESS', info={'rows': 1}))
+        cache.delete(views.IMPORT_OWNER_KEY.format('abc123'))
+        assert client.get('/api/candidates/import/abc123/').status_code == 404
+        cache.set(views.IMPORT_OWNER_KEY.format('abc123'), {'company': None, 'user': UserFactory().pk})
+        assert client.get('/api/candidates/import/abc123/').status_code == 404
+
+    def test_status_scoped_to_company(self, api_client, monkeypatch):
+        monkeypatch.setattr(views, 'AsyncResult', lambda task_id: _Task(state='SUCCESS', info={'rows': 1}))
+        membership = MembershipFactory()
+        response = api_client.post(
+            '/api/auth/token/', {'username': membership.user.username, 'password': 'testpass123'},
+        )
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        teammate = MembershipFactory(company=membership.company).user
+        cache.set(views.IMPORT_OWNER_KEY.format('abc123'), {'company': membership.company_id, 'user': teammate.pk})
+        assert api_client.get('/api/candidates/import/abc123/').status_code == 200
+        cache.set(views.IMPORT_OWNER_KEY.format('abc123'), {'company': CompanyFactory().pk, 'user': membership.user.pk})
+        assert api_client.get('/api/candidates/import/abc123/').status_code == 404
+
+
+class _Task:
+    id = 'abc123'
+
+    def __init__(self, state='PENDING', info=None):
+        self.state, self.info = state, info
+
+
+@pytest.mark.django_db
+def test_import_command(tmp_path, capsys):
+    company = CompanyFactory()
+    path = tmp_path / 'people.ndjson'
+    path.write_text('\n'.join(
+        json.dumps({'first_name': 'C', 'last_name': str(n), 'email': f'c{n}@example.com'}) for n in range(5)
+    ))
+    call_command('import_candidates', str(path), '--company', company.slug, '--chunk-size', '2')
+    assert Candidate.objects.filter(company=company).count() == 5
+    assert '5 created' in capsys.readouterr().out
@@ -0,0 +1,258 @@
+"""Tests for interview scheduling and conflict detection."""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+
+from interviews.availability import free_slots, merge_busy
+from interviews.models import Interview
+from notifications import reminders
+from notifications.models import OutboxMessage
+
+from .factories import ApplicationFactory, UserFactory
+
+
+@pytest.fixture
+def start():
+    return timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+
+def _interview(interviewer, scheduled_at, minutes=60, **kwargs):
+    return Interview.objects.create(
+        application=ApplicationFactory(), interviewer=interviewer,
+        scheduled_at=scheduled_at, duration_minutes=minutes, **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestConflictCheck:
+    def test_ends_at_maintained(self, start):
+        interview = _interview(UserFactory(), start, minutes=45)
+        assert interview.ends_at == start + timedelta(minutes=45)
+        interview.duration_minutes = 30
+        interview.save(update_fields=['duration_minutes'])
+        interview.refresh_from_db()
+        assert interview.ends_at == start + timedelta(minutes=30)
+
+    @pytest.mark.parametrize('offset, minutes, expected', [
+        (-30, 60, True),    # overlaps the start
+        (30, 60, True),     # overlaps the end
+        (10, 20, True),     # inside
+        (-30, 120, True),   # contains
+        (60, 30, False),    # starts exactly when it ends
+        (-60, 60, False),   # ends exactly when it starts
+    ])
+    def test_overlap(self, start, offset, minutes, expected):
+        user = UserFactory()
+        _interview(user, start)
+        slot = start + timedelta(minutes=offset)
+        assert Interview.check_conflict(user, slot, minutes) is expected
+
+    def test_ignores_completed_excluded_and_other_interviewers(self, start):
+        user = UserFactory()
+        existing = _interview(user, start)
+        _interview(user, start, completed=True)
+        _interview(UserFactory(), start)
+        assert not Interview.check_conflict(user, start, 60, exclude_id=existing.id)
+
+    def test_single_query(self, start, django_assert_num_queries):
+        user = UserFactory()
+        for hour in range(5):
+            _interview(user, start + timedelta(hours=2 * hour))
+        with django_assert_num_queries(1):
+            assert Interview.check_conflict(user, start + timedelta(hours=4, minutes=30), 30)
+
+    def test_find_conflicts(self, start, django_assert_num_queries):
+        alice, bob = UserFactory(), UserFactory()
+        busy = _interview(alice, start)
+        slots = [
+            (alice.pk, start + timedelta(minutes=30), 60),  # 0: overlaps existing and slot 1
+            (alice.pk, start + timedelta(minutes=80), 30),  # 1: overlaps slot 0
+            (alice.pk, start + timedelta(hours=3), 30),     # 2: free
+            (bob.pk, start, 60),                            # 3: free
+            (None, start, 60),                              # 4: no interviewer
+        ]
+        with django_assert_num_queries(1):
+            conflicts = Interview.find_conflicts(slots)
+        assert conflicts == {
+            0: {'interviews': [busy.id], 'slots': [1]},
+            1: {'interviews': [], 'slots': [0]},
+        }
+
+
+@pytest.mark.django_db
+class TestInterviewAPI:
+    def _payload(self, interviewer, scheduled_at, minutes=60):
+        return {
+            'application': ApplicationFactory().id, 'interviewer': interviewer.id,
+            'scheduled_at': scheduled_at.isoformat(), 'duration_minutes': minutes,
+        }
+
+    def test_create_rejects_conflict(self, auth_client, start):
+        client, user = auth_client
+        _interview(user, start)
+        response = client.post('/api/interviews/', self._payload(user, start + timedelta(minutes=15)), format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_update_checks_conflicts_under_lock(self, auth_client, start, monkeypatch):
+        from django.db import connection
+        client, user = auth_client
+        _interview(user, start)
+        moved = _interview(user, start + timedelta(hours=3))
+        checked_in_atomic = []
+        check_conflict = Interview.check_conflict
+
+        def record(*args, **kwargs):
+            checked_in_atomic.append(len(connection.atomic_blocks) > 1)
+            return check_conflict(*args, **kwargs)
+
+        monkeypatch.setattr(Interview, 'check_conflict', record)
+        response = client.patch(
+            f'/api/interviews/{moved.id}/', {'scheduled_at': (start + timedelta(minutes=30)).isoformat()},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'non_field_errors' in response.data
+        assert checked_in_atomic == [True]
+        response = client.patch(f'/api/interviews/{moved.id}/', {'notes': 'Bring laptop'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert checked_in_atomic == [True]
+
+    def test_bulk_schedule(self, auth_client, start):
+        client, user = auth_client
+        payload = [self._payload(user, start + timedelta(hours=i)) for i in range(3)]
+        response = client.post('/api/interviews/bulk/', payload, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == 3
+        assert Interview.objects.filter(interviewer=user).count() == 3
+        assert response.data[2]['ends_at'] is not None
+
+    def test_bulk_schedule_is_all_or_nothing(self, auth_client, start):
+        client, user = auth_client
+        existing = _interview(user, start)
+        payload = [
+            self._payload(user, start + timedelta(hours=2)),
+            self._payload(user, start + timedelta(minutes=30)),
+        ]
+        response = client.post('/api/interviews/bulk/', {'interviews': payload}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['conflicts'] == {'1': {'interviews': [existing.id], 'slots': []}}
+        assert Interview.objects.count() == 1
+
+    def test_bulk_schedule_empty(self, auth_client):
+        client, user = auth_client
+        response = client.post('/api/interviews/bulk/', [], format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestFreeSlots:
+    def setup_method(self):
+        self.t0 = timezone.now().replace(hour=9, minute=0, second=0, microsecond=0)
+
+    def at(self, minutes):
+        return self.t0 + timedelta(minutes=minutes)
+
+    def test_merge_busy(self):
+        busy = [(self.at(60), self.at(90)), (self.at(0), self.at(30)), (self.at(20), self.at(45)), (self.at(45), self.at(50))]
+        assert merge_busy(busy) == [(self.at(0), self.at(50)), (self.at(60), self.at(90))]
+
+    def test_gaps_shorter_than_duration_are_skipped(self):
+        busy = [(self.at(30), self.at(60)), (self.at(80), self.at(120))]
+        slots = free_slots(busy, self.at(0), self.at(240), timedelta(minutes=30))
+        assert slots == [(self.at(0), self.at(30)), (self.at(120), self.at(240))]
+
+    def test_busy_intervals_outside_window(self):
+        busy = [(self.at(-60), self.at(15)), (self.at(200), self.at(300))]
+        slots = free_slots(busy, self.at(0), self.at(120), timedelta(minutes=60))
+        assert slots == [(self.at(15), self.at(120))]
+
+    def test_buffer(self):
+        busy = [(self.at(60), self.at(120))]
+        slots = free_slots(busy, self.at(0), self.at(240), timedelta(minutes=45), buffer=timedelta(minutes=15))
+        assert slots == [(self.at(0), self.at(45)), (self.at(135), self.at(240))]
+
+    def test_fully_booked(self):
+        assert free_slots([(self.at(0), self.at(60))], self.at(0), self.at(60), timedelta(minutes=1)) == []
+
+
+@pytest.mark.django_db
+class TestAvailabilityAPI:
+    def test_panel_slots(self, auth_client, start, django_assert_max_num_queries):
+        client, user = auth_client
+        alice, bob = UserFactory(), UserFactory()
+        _interview(alice, start + timedelta(hours=1))
+        _interview(bob, start + timedelta(hours=1, minutes=30))
+        _interview(bob, start + timedelta(hours=5), completed=True)
+        _interview(user, start + timedelta(hours=2))  # not on the panel
+
+        url = (
+            f'/api/interviews/availability/?interviewers={alice.id},{bob.id}'
+            f'&start={start.isoformat()}&end={(start + timedelta(hours=6)).isoformat()}&duration_minutes=60'
+        ).replace('+', '%2B')
+        with django_assert_max_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        slots = [(slot['start'], slot['end']) for slot in response.data['slots']]
+        assert slots == [
+            (start, start + timedelta(hours=1)),
+            (start + timedelta(hours=2, minutes=30), start + timedelta(hours=6)),
+        ]
+        assert response.data['slots'][0]['latest_start'] == start
+
+    def test_validation(self, auth_client):
+        client, user = auth_client
+        assert client.get('/api/interviews/availability/').status_code == status.HTTP_400_BAD_REQUEST
+        assert client.get('/api/interviews/availability/?interviewers=999999').status_code == status.HTTP_400_BAD_REQUEST
+        response = client.get(
+            f'/api/interviews/availability/?interviewers={user.id}&start=2030-01-01T00:00:00Z&end=2030-06-01T00:00:00Z'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_defaults_to_two_weeks_from_now(self, auth_client):
+        client, user = auth_client
+        response = client.get(f'/api/interviews/availability/?interviewers={user.id}')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['end'] - response.data['start'] == timedelta(days=14)
+        assert len(response.data['slots']) == 1
+
+
+@pytest.mark.django_db
+class TestReminderDispatch:
+    def test_queues_due_reminders_once(self, django_assert_max_num_queries):
+        now = timezone.now()
+        interviewer = UserFactory()
+        due = [_interview(interviewer, now + timedelta(hours=hours)) for hours in (1, 5, 23)]
+        _interview(interviewer, now + timedelta(hours=30))
+        _interview(interviewer, now - timedelta(hours=1))
+        _interview(interviewer, now + timedelta(hours=2, minutes=30), completed=True)
+
+        # Per batch: savepoint, select, outbox insert, update, release
+        with django_assert_max_num_queries(2 * 5):
+            assert reminders.dispatch(now=now, batch_size=2) == 3
+        assert reminders.dispatch(now=now) == 0
+
+        keys = set(OutboxMessage.objects.values_list('dedupe_key', flat=True))
+        assert keys == {reminders.reminder_message(interview)[2] for interview in due}
+        assert Interview.objects.filter(reminder_sent_at=now).count() == 3
+
+    def test_reschedule_sends_a_new_reminder(self, auth_client):
+        client, user = auth_client
+        now = timezone.now()
+        interview = _interview(user, now + timedelta(hours=2))
+        reminders.dispatch(now=now)
+        response = client.patch(
+            f'/api/interviews/{interview.id}/', {'scheduled_at': (now + timedelta(hours=4)).isoformat()},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['reminder_sent_at'] is None
+        assert reminders.dispatch(now=now) == 1
+        assert OutboxMessage.objects.count() == 2
+
+    def test_scan_uses_partial_index(self):
+        from django.db import connection
+        if connection.vendor != 'sqlite':
+            pytest.skip('plan check is SQLite specific')
+        now = timezone.now()
+        queryset = reminders.due_reminders(now, timedelta(hours=24)).order_by('scheduled_at')
+        assert 'intv_reminder_due_idx' in queryset.explain()
@@ -0,0 +1,109 @@
+"""Tests for the values()-based list serializers."""
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from hireflow.serializers import ValuesSerializer
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from candidates.models import Candidate
+from candidates.serializers import CandidateSerializer
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+from pipeline.models import Application, StageHistory
+from pipeline.serializers import ApplicationSerializer
+
+from .factories import ApplicationFactory, CandidateFactory, JobFactory
+
+
+def _context(path):
+    return {'request': APIRequestFactory().get(path)}
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.django_db
+class TestListParity:
+    def test_candidates(self, media, auth_client):
+        client, user = auth_client
+        CandidateFactory(resume=SimpleUploadedFile('cv.pdf', b'resume'))
+        CandidateFactory()
+        response = client.get('/api/candidates/')
+        expected = CandidateSerializer(
+            Candidate.objects.order_by('-created_at'), many=True, context=_context('/api/candidates/'),
+        ).data
+        assert response.data['results'] == expected
+        assert response.data['results'][1]['resume'].startswith('http://testserver/')
+
+    def test_jobs(self, auth_client):
+        client, user = auth_client
+        JobFactory.create_batch(2, salary_min=61000)
+        response = client.get('/api/jobs/')
+        expected = JobSerializer(Job.objects.order_by('-created_at'), many=True, context=_context('/api/jobs/')).data
+        assert response.data['results'] == expected
+
+    def test_applications_with_history(self, auth_client):
+        client, user = auth_client
+        application = ApplicationFactory()
+        ApplicationFactory()
+        for stage in ('SCREENING', 'INTERVIEW'):
+            client.post(f'/api/applications/{application.id}/transition/', {'new_stage': stage}, format='json')
+        response = client.get('/api/applications/')
+        expected = ApplicationSerializer(
+            Application.objects.order_by('-applied_at'), many=True, context=_context('/api/applications/'),
+        ).data
+        assert response.data['results'] == expected
+        assert [entry['to_stage'] for entry in response.data['results'][1]['history']] == ['SCREENING', 'INTERVIEW']
+        assert response.data['results'][0]['score'] is None
+
+
+@pytest.mark.django_db
+class TestApplicationList:
+    def _queries(self, client):
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get('/api/applications/').status_code == 200
+        return len(queries)
+
+    def test_history_in_one_query(self, auth_client):
+        client, user = auth_client
+        ApplicationFactory()
+        baseline = self._queries(client)
+        for application in ApplicationFactory.create_batch(5):
+            StageHistory.objects.create(application=application, from_stage='NEW', to_stage='SCREENING')
+        assert self._queries(client) == baseline
+
+    def test_cursor_pages(self, auth_client):
+        client, user = auth_client
+        applications = ApplicationFactory.create_batch(5)
+        response = client.get('/api/applications/?page_size=2&ordering=applied_at')
+        ids = [row['id'] for row in response.data['results']]
+        while response.data['next']:
+            response = client.get(response.data['next'])
+            ids.extend(row['id'] for row in response.data['results'])
+        assert ids == [application.id for application in applications]
+
+
+class TestValuesSerializer:
+    def test_method_field_must_be_computed(self):
+        class WithMethod(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Job
+                fields = ['id', 'label']
+
+        class Undeclared(ValuesSerializer):
+            serializer_class = WithMethod
+
+        class Declared(ValuesSerializer):
+            serializer_class = WithMethod
+            computed = ('label',)
+
+        with pytest.raises(ImproperlyConfigured, match='label'):
+            Undeclared()
+        assert Declared().values() == ['id']
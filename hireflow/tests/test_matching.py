@@ -0,0 +1,160 @@
+"""Tests for the ANN candidate matching index and endpoint."""
+import numpy as np
+import pytest
+from rest_framework import status
+
+from candidates import matching, tasks
+from candidates.ann import IVFIndex, current_version
+from candidates.similarity import normalize, one_to_many, top_k
+
+from .factories import CandidateFactory, CompanyFactory, JobFactory
+
+
+def _clustered(n, dims=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dims))
+    points = centers[rng.integers(clusters, size=n)] + 0.3 * rng.standard_normal((n, dims))
+    return normalize(points)
+
+
+class TestIVFIndex:
+    def test_recall_against_brute_force(self):
+        vectors = _clustered(2000)
+        index = IVFIndex.build(np.arange(2000), vectors, nlist=32)
+        queries = _clustered(20, seed=1)
+        hits = 0
+        for query in queries:
+            exact, _ = top_k(one_to_many(query, vectors), 10)
+            approx = [i for i, _ in index.search(query, k=10, nprobe=8)]
+            hits += len(set(exact.tolist()) & set(approx))
+        assert hits / (20 * 10) >= 0.9
+
+    def test_exact_match_ranks_first(self):
+        vectors = _clustered(500)
+        index = IVFIndex.build(np.arange(100, 600), vectors)
+        best_id, score = index.search(vectors[42], k=1)[0]
+        assert best_id == 142
+        assert score == pytest.approx(1.0, abs=1e-5)
+
+    def test_upsert_and_remove(self):
+        vectors = _clustered(200)
+        index = IVFIndex.build(np.arange(200), vectors)
+        index.upsert([7], vectors[100:101])
+        assert index.search(vectors[100], k=2)[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert {i for i, _ in index.search(vectors[100], k=2)} == {7, 100}
+        index.remove([100, 7])
+        assert not {7, 100} & {i for i, _ in index.search(vectors[100], k=5)}
+        assert len(index) == 198
+
+    def test_save_and_load_memory_mapped(self, tmp_path):
+        vectors = _clustered(300)
+        index = IVFIndex.build(np.arange(300), vectors)
+        index.save(tmp_path)
+        loaded = IVFIndex.load(tmp_path)
+        assert isinstance(loaded.vectors, np.memmap)
+        loaded.upsert([1000], vectors[:1])
+        loaded.save_delta()
+        # The delta is published as a new directory behind one pointer swap
+        assert current_version(tmp_path) == ('gen-000001', 'delta-000002')
+        assert not (tmp_path / 'gen-000001' / 'delta-000001').exists()
+
+        reloaded = IVFIndex.load(tmp_path)
+        assert {i for i, _ in reloaded.search(vectors[0], k=2)} == {0, 1000}
+
+        index.save(tmp_path)  # new generation replaces the old one
+        assert (tmp_path / 'CURRENT').read_text() == 'gen-000002'
+        assert not (tmp_path / 'gen-000001').exists()
+
+
+@pytest.fixture
+def index_root(settings, tmp_path):
+    settings.MATCH_INDEX_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestMatchEndpoint:
+    def test_returns_top_k_within_company(self, auth_client, index_root, stub_embedder):
+        client, user = auth_client
+        company = CompanyFactory()
+        CandidateFactory.create_batch(6, company=company)
+        outsider = CandidateFactory(company=CompanyFactory())
+        job = JobFactory(company=company)
+        assert matching.build_index(company.id) == 6
+
+        response = client.get(f'/api/candidates/match/?job={job.id}&k=3')
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['results']
+        assert len(results) == 3
+        assert outsider.id not in [r['candidate']['id'] for r in results]
+        scores = [r['score'] for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_index_missing_queues_build(self, auth_client, index_root, monkeypatch):
+        queued = []
+        monkeypatch.setattr(tasks.rebuild_match_index, 'delay', queued.append)
+        client, user = auth_client
+        job = JobFactory(company=CompanyFactory())
+        CandidateFactory(company=job.company)
+        response = client.get(f'/api/candidates/match/?job={job.id}')
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert queued == [job.company_id]
+
+    def test_company_without_candidates(self, auth_client, index_root, monkeypatch):
+        queued = []
+        monkeypatch.setattr(tasks.rebuild_match_index, 'delay', queued.append)
+        client, user = auth_client
+        job = JobFactory(company=CompanyFactory())
+        assert matching.build_index(job.company_id) == 0
+        response = client.get(f'/api/candidates/match/?job={job.id}')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == []
+        assert queued == []
+
+    def test_job_required(self, auth_client):
+        client, user = auth_client
+        response = client.get('/api/candidates/match/')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = client.get('/api/candidates/match/?job=abc')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_candidate_changes_update_index(
+        self, auth_client, index_root, stub_embedder, monkeypatch, django_capture_on_commit_callbacks,
+    ):
+        monkeypatch.setattr(
+            tasks.update_match_index, 'delay', lambda *args: tasks.update_match_index(*args),
+        )
+        client, user = auth_client
+        company = CompanyFactory()
+        first = CandidateFactory(company=company)
+        job = JobFactory(company=company)
+        matching.build_index(company.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            added = CandidateFactory(company=company)
+        ids = [r['candidate']['id'] for r in client.get(f'/api/candidates/match/?job={job.id}').data['results']]
+        assert set(ids) == {first.id, added.id}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.delete()
+        assert matching.get_index(company.id).search(np.ones(3), k=5)[0][0] == added.id
+        assert len(matching.get_index(company.id)) == 1
+
+    def test_updates_during_build_are_replayed(self, index_root, stub_embedder, monkeypatch):
+        company = CompanyFactory()
+        first = CandidateFactory(company=company)
+        late = []
+        candidate_vectors = matching._candidate_vectors
+
+        def concurrent_update(candidates):
+            # Another worker creates a candidate and applies it while the build embeds
+            if not late:
+                late.append(CandidateFactory(company=company))
+                assert matching.update_candidates(company.id, [late[0].id]) is False
+            return candidate_vectors(candidates)
+
+        monkeypatch.setattr(matching, '_candidate_vectors', concurrent_update)
+        assert matching.build_index(company.id) == 1
+        index = matching.get_index(company.id)
+        assert {pk for pk, _ in index.search(np.ones(3), k=5)} == {first.id, late[0].id}
+        assert not list(index_root.glob('company_*/pending-*'))
@@ -0,0 +1,257 @@
+"""Tests for the notification outbox and its relay."""
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+
+from notifications import outbox, tasks
+from notifications.mailer import BatchMailer
+from notifications.models import OutboxMessage
+
+from .factories import ApplicationFactory
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    """Capture what the relay hands to Celery instead of calling the broker."""
+    batches = []
+    monkeypatch.setattr(tasks.send_stage_change_emails, 'delay', batches.append)
+    return batches
+
+
+def _payload(n):
+    return {'candidate_email': f'c{n}@example.com', 'candidate_name': f'C {n}', 'job_title': 'Dev', 'new_stage': 'OFFER'}
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def test_transition_writes_outbox_without_broker(self, auth_client, monkeypatch):
+        def broker_down(*args, **kwargs):
+            raise ConnectionError('broker unavailable')
+        monkeypatch.setattr(tasks.send_stage_change_email, 'delay', broker_down)
+        monkeypatch.setattr(tasks.send_stage_change_emails, 'delay', broker_down)
+
+        client, user = auth_client
+        app = ApplicationFactory()
+        response = client.post(f'/api/applications/{app.id}/transition/', {'new_stage': 'SCREENING'})
+        assert response.status_code == status.HTTP_200_OK
+        message = OutboxMessage.objects.get()
+        assert message.payload['candidate_email'] == app.candidate.email
+        assert message.sent_at is None
+
+    def test_failed_transition_writes_nothing(self, auth_client):
+        client, user = auth_client
+        app = ApplicationFactory(stage='HIRED')
+        client.post(f'/api/applications/{app.id}/transition/', {'new_stage': 'SCREENING'})
+        assert not OutboxMessage.objects.exists()
+
+    def test_enqueue_is_idempotent(self):
+        outbox.enqueue(outbox.STAGE_CHANGE, _payload(1), 'stage_change:1')
+        outbox.enqueue_many([
+            (outbox.STAGE_CHANGE, _payload(1), 'stage_change:1'),
+            (outbox.STAGE_CHANGE, _payload(2), 'stage_change:2'),
+        ])
+        assert OutboxMessage.objects.count() == 2
+
+    def test_relay_dispatches_batches(self, dispatched, django_assert_max_num_queries):
+        outbox.enqueue_many((outbox.STAGE_CHANGE, _payload(n), f'stage_change:{n}') for n in range(5))
+        # Per batch: savepoint, SELECT ... FOR UPDATE, one bulk UPDATE, release
+        with django_assert_max_num_queries(3 * 4):
+            assert outbox.relay(batch_size=2) == 5
+        assert [len(batch) for batch in dispatched] == [2, 2, 1]
+        assert dispatched[0][0]['dedupe_key'] == 'stage_change:0'
+        assert not OutboxMessage.objects.filter(sent_at__isnull=True).exists()
+        assert outbox.relay() == 0
+
+    def test_failed_dispatch_backs_off(self, monkeypatch):
+        def broker_down(payloads):
+            raise ConnectionError('broker unavailable')
+        monkeypatch.setattr(tasks.send_stage_change_emails, 'delay', broker_down)
+        outbox.enqueue(outbox.STAGE_CHANGE, _payload(1), 'stage_change:1')
+
+        assert outbox.relay() == 0
+        message = OutboxMessage.objects.get()
+        assert message.attempts == 1
+        assert 'broker unavailable' in message.last_error
+        assert message.available_at > timezone.now()
+        assert outbox.relay() == 0  # not due yet
+        assert OutboxMessage.objects.get().attempts == 1
+
+    def test_unknown_topic_does_not_block_others(self, dispatched):
+        outbox.enqueue('carrier_pigeon', {}, 'pigeon:1')
+        outbox.enqueue(outbox.STAGE_CHANGE, _payload(1), 'stage_change:1')
+        assert outbox.relay() == 1
+        assert OutboxMessage.objects.get(topic='carrier_pigeon').sent_at is None
+
+    def test_command_relays_and_purges(self, dispatched):
+        outbox.enqueue(outbox.STAGE_CHANGE, _payload(1), 'stage_change:1')
+        old = OutboxMessage.objects.create(
+            topic=outbox.STAGE_CHANGE, payload=_payload(2), dedupe_key='stage_change:2',
+            sent_at=timezone.now() - timedelta(days=30),
+        )
+        call_command('relay_outbox')
+        assert len(dispatched) == 1
+        assert not OutboxMessage.objects.filter(pk=old.pk).exists()
+
+    def test_beat_purges_sent_messages(self, dispatched, settings):
+        outbox.enqueue(outbox.STAGE_CHANGE, _payload(1), 'stage_change:1')
+        old = OutboxMessage.objects.create(
+            topic=outbox.STAGE_CHANGE, payload=_payload(2), dedupe_key='stage_change:2',
+            sent_at=timezone.now() - timedelta(days=30),
+        )
+        assert settings.CELERY_BEAT_SCHEDULE['purge-outbox']['task'] == 'notifications.tasks.purge_outbox'
+        assert tasks.purge_outbox() == {'purged': 1}
+        assert not OutboxMessage.objects.filter(pk=old.pk).exists()
+        assert OutboxMessage.objects.filter(dedupe_key='stage_change:1').exists()
+
+
+@pytest.mark.django_db
+class TestBatchedStageEmails:
+    def test_redelivered_keys_are_skipped(self):
+        cache.clear()
+        batch = [{**_payload(n), 'dedupe_key': f'stage_change:{n}'} for n in range(3)]
+        assert tasks.send_stage_change_emails(batch)['sent'] == 3
+        result = tasks.send_stage_change_emails(batch + [{**_payload(9), 'dedupe_key': 'stage_change:9'}])
+        assert result == {'sent': 1, 'requested': 1, 'duplicates': 3, 'batches': 1}
+        assert len(mail.outbox) == 4
+
+    def test_large_batch_is_chunked(self, settings):
+        cache.clear()
+        settings.NOTIFICATIONS_MAIL = {'BATCH_SIZE': 2}
+        result = tasks.send_stage_change_emails([_payload(n) for n in range(5)])
+        assert result['sent'] == 5
+        assert result['batches'] == 3
+        assert len(mail.outbox) == 5
+
+    def test_only_delivered_messages_are_marked(self, settings):
+        cache.clear()
+        settings.NOTIFICATIONS_MAIL = {'BATCH_SIZE': 2}
+        settings.EMAIL_BACKEND = 'tests.test_notifications.DroppingBackend'
+        batch = [{**_payload(n), 'dedupe_key': f'stage_change:{n}'} for n in range(4)]
+        with pytest.raises(tasks.DeliveryError) as raised:
+            tasks.send_stage_change_emails(batch)
+        assert raised.value.failed == [batch[3]]
+        assert len(mail.outbox) == 3
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        result = tasks.send_stage_change_emails(batch)
+        assert result == {'sent': 1, 'requested': 1, 'duplicates': 3, 'batches': 1}
+        assert mail.outbox[3].to == ['c3@example.com']
+
+    def test_retries_resend_only_failed_messages(self, settings):
+        cache.clear()
+        settings.EMAIL_BACKEND = 'tests.test_notifications.DroppingBackend'
+        DroppingBackend.attempts = []
+        result = tasks.send_stage_change_emails.apply(args=[[_payload(n) for n in range(4)]])
+        assert isinstance(result.result, tasks.DeliveryError)
+        retries = tasks.send_stage_change_emails.max_retries
+        assert sorted(DroppingBackend.attempts) == ['c0', 'c1', 'c2'] + ['c3'] * (retries + 1)
+        assert len(mail.outbox) == 3
+
+    def test_raising_send_keeps_earlier_messages_marked(self, settings, monkeypatch):
+        cache.clear()
+        settings.NOTIFICATIONS_MAIL = {'BATCH_SIZE': 2}
+        send_messages = EmailBackend.send_messages
+        calls = []
+
+        def fail_third(backend, messages):
+            calls.append(messages)
+            if len(calls) == 3:
+                raise ConnectionError('smtp down')
+            return send_messages(backend, messages)
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail_third)
+        batch = [{**_payload(n), 'dedupe_key': f'stage_change:{n}'} for n in range(4)]
+        with pytest.raises(tasks.DeliveryError) as raised:
+            tasks.send_stage_change_emails(batch)
+        assert isinstance(raised.value.__cause__, ConnectionError)
+        assert raised.value.failed == batch[2:]
+        assert tasks._undelivered(batch) == batch[2:]
+
+    def test_interview_reminders_relayed_from_outbox(self, monkeypatch):
+        cache.clear()
+        monkeypatch.setattr(tasks.send_interview_reminders, 'delay', tasks.send_interview_reminders)
+        payload = {'candidate_email': 'c@example.com', 'candidate_name': 'C', 'job_title': 'Dev',
+                   'interview_time': '2026-01-05T10:00:00+00:00'}
+        outbox.enqueue(outbox.INTERVIEW_REMINDER, payload, 'interview_reminder:1')
+        assert outbox.relay() == 1
+        assert mail.outbox[0].subject == 'Interview Reminder: Dev'
+
+
+class CountingBackend(EmailBackend):
+    def __init__(self, fail=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail = fail
+        self.opened = self.closed = 0
+        self.calls = []
+
+    def open(self):
+        self.opened += 1
+
+    def close(self):
+        self.closed += 1
+
+    def send_messages(self, messages):
+        if self.fail:
+            raise ConnectionError('smtp down')
+        self.calls.append(len(messages))
+        return super().send_messages(messages)
+
+
+class DroppingBackend(EmailBackend):
+    """Silently drops mail to c3@example.com, like a fail_silently SMTP backend."""
+    attempts = []
+
+    def send_messages(self, messages):
+        self.attempts.extend(m.to[0].split('@')[0] for m in messages)
+        return super().send_messages([m for m in messages if m.to != ['c3@example.com']])
+
+
+def _message(n):
+    return EmailMessage(f'Subject {n}', 'Body', 'noreply@hireflow.com', [f'c{n}@example.com'])
+
+
+class TestBatchMailer:
+    def test_batches_share_one_connection(self):
+        backend = CountingBackend()
+        with BatchMailer(batch_size=3, connection=backend) as mailer:
+            for n in range(7):
+                mailer.add(_message(n))
+        assert backend.calls == [1] * 7  # one call per message, on the shared connection
+        assert (backend.opened, backend.closed) == (1, 1)
+        assert [batch.size for batch in mailer.batches] == [3, 3, 1]
+        assert mailer.sent == 7 and mailer.failed == 0
+        assert len(mail.outbox) == 7
+
+    def test_flush_interval(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr('notifications.mailer.time.monotonic', lambda: clock[0])
+        backend = CountingBackend()
+        mailer = BatchMailer(batch_size=10, flush_interval=5, connection=backend)
+        mailer.add(_message(1))
+        mailer.flush_if_due()
+        assert backend.calls == []
+        clock[0] += 5
+        mailer.add(_message(2))
+        assert [batch.size for batch in mailer.batches] == [2]
+        mailer.close()
+        assert [batch.size for batch in mailer.batches] == [2]
+
+    def test_failed_batch_is_recorded_and_reopens(self):
+        backend = CountingBackend(fail=True)
+        mailer = BatchMailer(batch_size=2, connection=backend)
+        mailer.add(_message(1))
+        with pytest.raises(ConnectionError):
+            mailer.add(_message(2))
+        assert mailer.failed == 2
+        backend.fail = False
+        mailer.add(_message(3))
+        mailer.close()
+        assert mailer.sent == 1
+        assert backend.opened == 2
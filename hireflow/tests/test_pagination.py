@@ -0,0 +1,93 @@
+"""Tests for keyset cursor pagination on list endpoints."""
+import pytest
+from rest_framework import status
+
+from .factories import ApplicationFactory, CandidateFactory, JobFactory
+
+
+def _collect(client, url):
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        ids.extend(row['id'] for row in response.data['results'])
+        url = response.data['next']
+    return ids
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_walks_all_pages_without_duplicates(self, auth_client):
+        client, user = auth_client
+        candidates = CandidateFactory.create_batch(7)
+        ids = _collect(client, '/api/candidates/?page_size=3')
+        assert sorted(ids) == sorted(c.id for c in candidates)
+        assert len(ids) == len(set(ids))
+
+    def test_default_order_newest_first(self, auth_client):
+        client, user = auth_client
+        candidates = CandidateFactory.create_batch(3)
+        response = client.get('/api/candidates/')
+        assert [c['id'] for c in response.data['results']] == [c.id for c in reversed(candidates)]
+        assert response.data['next'] is None
+
+    def test_ordering_param_respected(self, auth_client):
+        client, user = auth_client
+        for name in ['Carter', 'Adams', 'Baker']:
+            CandidateFactory(last_name=name)
+        response = client.get('/api/candidates/?ordering=last_name&page_size=2')
+        assert [c['last_name'] for c in response.data['results']] == ['Adams', 'Baker']
+        response = client.get(response.data['next'])
+        assert [c['last_name'] for c in response.data['results']] == ['Carter']
+
+    def test_page_size_capped(self, auth_client, monkeypatch):
+        from hireflow.pagination import KeysetCursorPagination
+        monkeypatch.setattr(KeysetCursorPagination, 'max_page_size', 2)
+        client, user = auth_client
+        ApplicationFactory.create_batch(3)
+        response = client.get('/api/applications/?page_size=100000')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+        assert response.data['next'] is not None
+
+    @pytest.mark.parametrize('ordering', ['salary_min', '-salary_min'])
+    def test_nullable_ordering_key(self, auth_client, ordering):
+        client, user = auth_client
+        salaries = [None, 60000, None, 50000, 70000, None, 50000]
+        jobs = [JobFactory(salary_min=salary) for salary in salaries]
+        ids = _collect(client, f'/api/jobs/?ordering={ordering}&page_size=2')
+        # NULLs sort last in both directions; ties fall back to id in the same direction
+        sign = -1 if ordering.startswith('-') else 1
+        expected = [job.id for job in sorted(
+            jobs, key=lambda job: (job.salary_min is None, sign * (job.salary_min or 0), sign * job.id),
+        )]
+        assert ids == expected
+
+    def test_previous_page_with_null_keys(self, auth_client):
+        client, user = auth_client
+        for salary in [None, 50000, None, None, 60000]:
+            JobFactory(salary_min=salary)
+        url, ids = '/api/jobs/?ordering=salary_min&page_size=2', []
+        while url:
+            response = client.get(url)
+            ids.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        response = client.get(response.data['previous'])
+        assert response.status_code == status.HTTP_200_OK
+        previous = [row['id'] for row in response.data['results']]
+        start = ids.index(previous[0])
+        assert ids[start:start + len(previous)] == previous
+
+    def test_long_runs_of_tied_keys(self, auth_client):
+        client, user = auth_client
+        candidates = [CandidateFactory(last_name='Smith') for _ in range(7)]
+        ids = _collect(client, '/api/candidates/?ordering=last_name&page_size=2')
+        assert ids == sorted(c.id for c in candidates)
+
+    def test_malformed_cursor(self, auth_client):
+        import base64
+        from urllib.parse import urlencode
+        client, user = auth_client
+        cursor = base64.b64encode(urlencode({'o': 0, 'p': '[1, 2, 3]'}).encode()).decode()
+        response = client.get(f'/api/candidates/?cursor={cursor}')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -2,6 +2,7 @@
 import pytest
 from rest_framework import status
 from .factories import UserFactory, ApplicationFactory, CandidateFactory, JobFactory
+from candidates.models import CandidateScore
 from pipeline.models import Application, StageHistory
 
 
@@ -40,6 +41,81 @@ class TestApplicationAPI:
         assert all(a['stage'] == 'SCREENING' for a in response.data['results'])
 
 
+@pytest.mark.django_db
+class TestApplicationScores:
+    MODEL = 'text-embedding-3-small'
+
+    def _scored_job(self, scores):
+        job = JobFactory()
+        apps = ApplicationFactory.create_batch(len(scores), job=job)
+        for app, score in zip(apps, scores, strict=True):
+            if score is not None:
+                CandidateScore.objects.create(candidate=app.candidate, job=job, model=self.MODEL, score=score)
+        return job, apps
+
+    def test_order_by_score(self, auth_client):
+        client, user = auth_client
+        job, apps = self._scored_job([40.0, None, 90.0, 65.5])
+        # A score for another job or model must not leak into this job's ranking
+        CandidateScore.objects.create(candidate=apps[1].candidate, job=JobFactory(), model=self.MODEL, score=99)
+        CandidateScore.objects.create(candidate=apps[1].candidate, job=job, model='other-model', score=99)
+
+        response = client.get(f'/api/applications/?job={job.id}&ordering=-score')
+        assert response.status_code == status.HTTP_200_OK
+        assert [a['score'] for a in response.data['results']] == [90.0, 65.5, 40.0, None]
+
+    def test_score_pages_are_stable(self, auth_client):
+        client, user = auth_client
+        job, apps = self._scored_job([50.0, 50.0, 70.0, 10.0, 50.0])
+        seen, url = [], f'/api/applications/?job={job.id}&ordering=-score&page_size=2'
+        while url:
+            response = client.get(url)
+            seen.extend(a['id'] for a in response.data['results'])
+            url = response.data['next']
+        assert sorted(seen) == sorted(app.id for app in apps)
+        assert seen[0] == apps[2].id
+
+    def test_filter_by_min_score(self, auth_client):
+        client, user = auth_client
+        job, apps = self._scored_job([40.0, None, 90.0])
+        response = client.get(f'/api/applications/?job={job.id}&min_score=50')
+        assert [a['id'] for a in response.data['results']] == [apps[2].id]
+
+    def test_filter_by_max_score(self, auth_client):
+        client, user = auth_client
+        job, apps = self._scored_job([40.0, None, 90.0])
+        response = client.get(f'/api/applications/?job={job.id}&max_score=50')
+        assert [a['id'] for a in response.data['results']] == [apps[0].id]
+        response = client.get(f'/api/applications/?job={job.id}&max_score=10')
+        assert response.data['results'] == []
+
+    def test_score_model_param(self, auth_client):
+        client, user = auth_client
+        app = ApplicationFactory()
+        CandidateScore.objects.create(candidate=app.candidate, job=app.job, model='local-hash-512', score=12.5)
+        default = client.get(f'/api/applications/{app.id}/')
+        local = client.get(f'/api/applications/{app.id}/?score_model=local-hash-512')
+        assert default.data['score'] is None
+        assert local.data['score'] == 12.5
+
+    def test_invalid_score_filter(self, auth_client):
+        client, user = auth_client
+        response = client.get('/api/applications/?min_score=high')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_writes_skip_score_join(self, auth_client, django_assert_max_num_queries):
+        client, user = auth_client
+        app = ApplicationFactory()
+        table = CandidateScore._meta.db_table
+        with django_assert_max_num_queries(20) as queries:
+            response = client.post(f'/api/applications/{app.id}/transition/', {'new_stage': 'SCREENING'})
+        assert response.status_code == status.HTTP_200_OK
+        assert not [q for q in queries.captured_queries if table in q['sql']]
+        with django_assert_max_num_queries(20) as queries:
+            client.get(f'/api/applications/{app.id}/')
+        assert [q for q in queries.captured_queries if table in q['sql']]
+
+
 @pytest.mark.django_db
 class TestApplicationTransition:
     def test_valid_transition(self, auth_client):
@@ -129,3 +205,60 @@ class TestApplicationTransition:
             format='json'
         )
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestBulkTransition:
+    URL = '/api/applications/bulk-transition/'
+
+    def test_moves_valid_rows_and_reports_errors(self, auth_client):
+        client, user = auth_client
+        movable = ApplicationFactory.create_batch(3, stage='SCREENING')
+        hired = ApplicationFactory(stage='HIRED')
+        response = client.post(self.URL, {
+            'ids': [a.id for a in movable] + [hired.id, 999999],
+            'new_stage': 'REJECTED',
+            'notes': 'Role closed',
+        }, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == [a.id for a in movable]
+        assert [e['id'] for e in response.data['errors']] == [hired.id, 999999]
+        assert 'Invalid transition' in response.data['errors'][0]['error']
+
+        assert Application.objects.filter(stage='REJECTED').count() == 3
+        hired.refresh_from_db()
+        assert hired.stage == 'HIRED'
+        history = StageHistory.objects.filter(to_stage='REJECTED')
+        assert history.count() == 3
+        assert {(h.from_stage, h.changed_by_id, h.notes) for h in history} == {('SCREENING', user.id, 'Role closed')}
+
+    def test_query_count_independent_of_batch_size(self, auth_client, django_assert_max_num_queries):
+        client, user = auth_client
+        job = JobFactory()
+        apps = ApplicationFactory.create_batch(40, job=job)
+        # Lock+load, bulk_update, bulk_create, rollup upserts, outbox and savepoints: no per-row queries
+        with django_assert_max_num_queries(13):
+            response = client.post(self.URL, {'ids': [a.id for a in apps], 'new_stage': 'REJECTED'}, format='json')
+        assert len(response.data['updated']) == 40
+
+    def test_notifications_queued_in_outbox(self, auth_client):
+        from notifications.models import OutboxMessage
+        client, user = auth_client
+        apps = ApplicationFactory.create_batch(3)
+        client.post(self.URL, {'ids': [a.id for a in apps], 'new_stage': 'SCREENING'}, format='json')
+        messages = OutboxMessage.objects.filter(topic='stage_change')
+        assert sorted(m.payload['candidate_email'] for m in messages) == sorted(a.candidate.email for a in apps)
+        assert {m.payload['new_stage'] for m in messages} == {'SCREENING'}
+
+    def test_updates_rollups(self, auth_client):
+        from analytics.models import HiringMetric
+        client, user = auth_client
+        job = JobFactory()
+        apps = ApplicationFactory.create_batch(4, job=job)
+        client.post(self.URL, {'ids': [a.id for a in apps], 'new_stage': 'REJECTED'}, format='json')
+        assert HiringMetric.objects.get(job=job).rejection_count == 4
+
+    def test_invalid_payload(self, auth_client):
+        client, user = auth_client
+        assert client.post(self.URL, {'ids': [], 'new_stage': 'REJECTED'}, format='json').status_code == 400
+        assert client.post(self.URL, {'ids': [1], 'new_stage': 'LOST'}, format='json').status_code == 400
@@ -0,0 +1,162 @@
+"""Query-plan regression tests for hot list/filter paths.
+
+Each test builds the queryset exactly as the viewset would for a request
+and asserts the database answers it from an index. On PostgreSQL
+sequential scans are disabled for the transaction so the planner picks
+an index whenever one is usable, regardless of how small the seeded
+tables are.
+"""
+import re
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from hireflow.pagination import KeysetCursorPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from candidates.views import CandidateViewSet
+from interviews.models import Interview
+from interviews.views import InterviewViewSet
+from jobs.views import JobViewSet
+from pipeline.models import StageHistory
+from pipeline.views import ApplicationViewSet
+
+from .factories import ApplicationFactory, CandidateFactory, CompanyFactory, JobFactory, UserFactory
+
+
+def _viewset_queryset(viewset_class, url, user, company=None):
+    """Return the page queryset a list request to ``url`` would execute."""
+    request = Request(APIRequestFactory().get(url))
+    request.user = user
+    request.company = company
+    view = viewset_class(request=request, format_kwarg=None, action='list')
+    queryset = view.filter_queryset(view.get_queryset())
+    ordering = KeysetCursorPagination().get_ordering(request, queryset, view)
+    return queryset.order_by(*ordering)[:KeysetCursorPagination.page_size + 1]
+
+
+def _plan(queryset):
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+def assert_uses_index(queryset, table, index=None):
+    """Assert no full scan of ``table``; on SQLite also that ``index`` is used."""
+    plan = _plan(queryset)
+    if connection.vendor == 'sqlite':
+        full_scan = re.search(rf'SCAN {table}\b(?! USING)', plan)
+        assert index is None or index in plan, f'{index} not used:\n{plan}'
+    elif connection.vendor == 'postgresql':
+        full_scan = re.search(rf'Seq Scan on {table}\b', plan)
+    else:
+        pytest.skip(f'No plan check for {connection.vendor}')
+    assert not full_scan, f'Full scan of {table}:\n{plan}'
+
+
+@pytest.fixture
+def seeded(db):
+    user = UserFactory()
+    jobs = JobFactory.create_batch(3, posted_by=user)
+    apps = []
+    for job in jobs:
+        for stage in ['NEW', 'SCREENING', 'INTERVIEW']:
+            apps.append(ApplicationFactory(job=job, stage=stage))
+    CandidateFactory.create_batch(5)
+    start = timezone.now()
+    for i, app in enumerate(apps):
+        Interview.objects.create(
+            application=app, interviewer=user, scheduled_at=start + timedelta(hours=i),
+        )
+        StageHistory.objects.create(application=app, from_stage='NEW', to_stage=app.stage)
+    return user, jobs, apps
+
+
+@pytest.fixture
+def tenants(db):
+    """Two companies with jobs, candidates and applications each."""
+    user = UserFactory()
+    companies = CompanyFactory.create_batch(2)
+    for company in companies:
+        for job in JobFactory.create_batch(2, posted_by=user, company=company):
+            for candidate in CandidateFactory.create_batch(3, company=company):
+                ApplicationFactory(job=job, candidate=candidate)
+    return user, companies
+
+
+@pytest.mark.django_db
+class TestHotQueryPlans:
+    def test_applications_by_stage(self, seeded):
+        user, jobs, apps = seeded
+        qs = _viewset_queryset(ApplicationViewSet, '/api/applications/?stage=SCREENING', user)
+        assert_uses_index(qs, 'pipeline_application')
+
+    def test_applications_by_job_and_stage(self, seeded):
+        user, jobs, apps = seeded
+        qs = _viewset_queryset(
+            ApplicationViewSet, f'/api/applications/?job={jobs[0].id}&stage=NEW', user,
+        )
+        assert_uses_index(qs, 'pipeline_application')
+
+    def test_applications_list(self, seeded):
+        user, jobs, apps = seeded
+        qs = _viewset_queryset(ApplicationViewSet, '/api/applications/', user)
+        assert_uses_index(qs, 'pipeline_application')
+
+    def test_candidates_list(self, seeded):
+        user, jobs, apps = seeded
+        qs = _viewset_queryset(CandidateViewSet, '/api/candidates/', user)
+        assert_uses_index(qs, 'candidates_candidate')
+
+    def test_jobs_active_by_type(self, seeded):
+        user, jobs, apps = seeded
+        qs = _viewset_queryset(JobViewSet, '/api/jobs/?is_active=true&job_type=FULL_TIME', user)
+        assert_uses_index(qs, 'jobs_job')
+
+    def test_jobs_active(self, seeded):
+        user, jobs, apps = seeded
+        qs = _viewset_queryset(JobViewSet, '/api/jobs/?is_active=true', user)
+        assert_uses_index(qs, 'jobs_job')
+
+    def test_interviews_upcoming_for_interviewer(self, seeded):
+        user, jobs, apps = seeded
+        qs = _viewset_queryset(
+            InterviewViewSet, f'/api/interviews/?interviewer={user.id}&completed=false', user,
+        )
+        assert_uses_index(qs, 'interviews_interview')
+
+    def test_interviews_list(self, seeded):
+        user, jobs, apps = seeded
+        qs = _viewset_queryset(InterviewViewSet, '/api/interviews/', user)
+        assert_uses_index(qs, 'interviews_interview')
+
+    def test_interview_conflict_check(self, seeded):
+        user, jobs, apps = seeded
+        qs = Interview.overlapping(user, timezone.now() + timedelta(hours=2), 60)
+        assert_uses_index(qs, 'interviews_interview')
+
+    def test_stage_history_for_application(self, seeded):
+        user, jobs, apps = seeded
+        qs = StageHistory.objects.filter(application=apps[0]).order_by('changed_at')
+        assert_uses_index(qs, 'pipeline_stagehistory')
+
+
+@pytest.mark.django_db
+class TestTenantQueryPlans:
+    def test_candidates_list(self, tenants):
+        user, companies = tenants
+        qs = _viewset_queryset(CandidateViewSet, '/api/candidates/', user, companies[0])
+        assert_uses_index(qs, 'candidates_candidate', 'cand_company_created_idx')
+
+    def test_jobs_active(self, tenants):
+        user, companies = tenants
+        qs = _viewset_queryset(JobViewSet, '/api/jobs/?is_active=true', user, companies[0])
+        assert_uses_index(qs, 'jobs_job', 'job_company_active_idx')
+
+    def test_applications_list(self, tenants):
+        user, companies = tenants
+        qs = _viewset_queryset(ApplicationViewSet, '/api/applications/', user, companies[0])
+        assert_uses_index(qs, 'jobs_job')
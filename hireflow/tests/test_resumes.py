@@ -0,0 +1,182 @@
+"""Tests for resume text extraction, its cache and what it feeds."""
+import io
+import zipfile
+
+import pytest
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from candidates import resumes, search, tasks
+from candidates.models import Candidate, CandidateScore, ResumeText
+
+from .factories import ApplicationFactory, CandidateFactory
+
+
+def _pdf(text):
+    """Single-page PDF showing ``text`` in Helvetica."""
+    content = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'.encode()
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R '
+        b'/Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length %d >>\nstream\n%s\nendstream' % (len(content), content),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    pdf, offsets = b'%PDF-1.4\n', []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    return pdf + b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+
+
+def _docx(*paragraphs):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            'word/document.xml',
+            f'<w:document xmlns:w="{resumes.WORD_NS[1:-1]}"><w:body>{body}</w:body></w:document>',
+        )
+    return buffer.getvalue()
+
+
+class _CountingIO(io.BytesIO):
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+class TestExtractText:
+    def test_plain_text(self):
+        text = resumes.extract_text(ContentFile(b'Python\n\n  Django   developer\n'), 'text')
+        assert text == 'Python\nDjango developer'
+
+    def test_docx(self):
+        text = resumes.extract_text(ContentFile(_docx('Grace Hopper', 'COBOL compilers')), 'docx')
+        assert text == 'Grace Hopper\nCOBOL compilers'
+
+    def test_pdf(self):
+        assert resumes.extract_text(ContentFile(_pdf('Kubernetes operator')), 'pdf') == 'Kubernetes operator'
+
+    def test_stops_reading_at_max_chars(self, settings):
+        settings.RESUMES = {'CHUNK_SIZE': 1024}
+        stream = _CountingIO(b'word ' * 200_000)
+        text = resumes.extract_text(File(stream), 'text', max_chars=5000)
+        assert len(text) <= 5000
+        assert stream.bytes_read < 10 * 1024
+
+    def test_kind_of(self):
+        assert resumes.kind_of('cv.bin', b'%PDF-1.7 ...') == 'pdf'
+        assert resumes.kind_of('cv.docx', b'PK\x03\x04...') == 'docx'
+        assert resumes.kind_of('cv', b'plain words') == 'text'
+        with pytest.raises(resumes.ExtractionError):
+            resumes.kind_of('cv.zip', b'PK\x03\x04...')
+        with pytest.raises(resumes.ExtractionError):
+            resumes.kind_of('cv.doc', b'\xd0\xcf\x11\xe0\x00\x00')
+
+
+@pytest.mark.django_db
+class TestExtractResumeTask:
+    def _candidate(self, data, name='cv.pdf', **kwargs):
+        return CandidateFactory(resume=SimpleUploadedFile(name, data), **kwargs)
+
+    def test_extracts_and_indexes(self, media, auth_client):
+        candidate = self._candidate(_pdf('Kubernetes operator'))
+        CandidateFactory()
+        result = tasks.extract_resume_text(candidate.id)
+        assert result['extracted'] and result['changed']
+
+        candidate.refresh_from_db()
+        assert ResumeText.objects.get(sha256=candidate.resume_hash).kind == 'pdf'
+        assert list(search.filter_resumes(Candidate.objects.all(), 'kubern')) == [candidate]
+
+        client, user = auth_client
+        response = client.get('/api/candidates/', {'resume': 'kubernetes operator'})
+        assert [row['id'] for row in response.data['results']] == [candidate.id]
+
+    def test_duplicates_are_parsed_once(self, media, monkeypatch):
+        parsed = []
+        extract_text = resumes.extract_text
+        monkeypatch.setattr(resumes, 'extract_text', lambda *args: parsed.append(args) or extract_text(*args))
+        first = self._candidate(_docx('Ada'), name='cv.docx')
+        second = self._candidate(_docx('Ada'), name='copy.docx')
+
+        assert tasks.extract_resume_text(first.id)['extracted']
+        assert not tasks.extract_resume_text(second.id)['extracted']
+        assert tasks.extract_resume_text(second.id)['changed'] is False
+        assert len(parsed) == 1
+        assert ResumeText.objects.count() == 1
+
+    def test_unreadable_file_is_recorded(self, media):
+        candidate = self._candidate(b'%PDF-1.4 truncated')
+        tasks.extract_resume_text(candidate.id)
+        resume_text = ResumeText.objects.get()
+        assert resume_text.text == '' and 'PDF' in resume_text.error
+        assert Candidate.objects.get(pk=candidate.id).resume_hash == resume_text.sha256
+
+    def test_removed_resume_clears_hash(self, media):
+        candidate = self._candidate(b'Python developer', name='cv.txt')
+        tasks.extract_resume_text(candidate.id)
+        candidate.refresh_from_db()
+        candidate.resume = None
+        candidate.save()
+        assert tasks.extract_resume_text(candidate.id)['changed']
+        assert Candidate.objects.get(pk=candidate.id).resume_hash == ''
+
+    def test_replaced_during_extraction_is_not_stored(self, media, monkeypatch):
+        candidate = self._candidate(b'Old resume', name='cv.txt')
+        extract = resumes.extract
+
+        def replaced_meanwhile(candidate):
+            result = extract(candidate)
+            newer = Candidate.objects.get(pk=candidate.pk)
+            newer.resume = SimpleUploadedFile('cv.txt', b'New resume')
+            newer.save()
+            return result
+
+        monkeypatch.setattr(resumes, 'extract', replaced_meanwhile)
+        result = tasks.extract_resume_text(candidate.id)
+        assert result['stale'] and not result['changed']
+        assert Candidate.objects.get(pk=candidate.id).resume_hash == ''
+
+    def test_feeds_embeddings_and_rescoring(self, media, stub_embedder, monkeypatch):
+        application = ApplicationFactory(candidate=self._candidate(b'Rust and Go', name='cv.txt'))
+        candidate = application.candidate
+        CandidateScore.objects.create(candidate=candidate, job=application.job, model='stub', score=10)
+        queued = []
+        monkeypatch.setattr(tasks.score_candidate_for_job, 'delay', lambda *args: queued.append(args))
+
+        tasks.extract_resume_text(candidate.id)
+        candidate.refresh_from_db()
+        [text] = tasks._candidate_texts([candidate])
+        assert text.endswith('Resume:\nRust and Go')
+        assert stub_embedder.calls == [[text]]
+        assert queued == [(candidate.id, application.job_id)]
+
+    def test_upload_queues_extraction(self, media, auth_client, monkeypatch, django_capture_on_commit_callbacks):
+        client, user = auth_client
+        candidate = CandidateFactory()
+        queued = []
+        monkeypatch.setattr(tasks.extract_resume_text, 'delay', queued.append)
+        with django_capture_on_commit_callbacks(execute=True):
+            candidate.first_name = 'Renamed'
+            candidate.save(update_fields=['first_name'])
+            response = client.patch(
+                f'/api/candidates/{candidate.id}/', {'resume': SimpleUploadedFile('cv.txt', b'SQL')},
+                format='multipart',
+            )
+        assert response.status_code == 200
+        assert queued == [candidate.id]
@@ -0,0 +1,276 @@
+"""Tests for candidate AI scoring and the embedding cache."""
+import numpy as np
+import pytest
+
+from candidates import embeddings, providers, similarity, tasks
+from candidates.models import CandidateScore, Embedding
+
+from .factories import ApplicationFactory, CandidateFactory, JobFactory
+
+
+@pytest.mark.django_db
+class TestEmbeddingCache:
+    def test_job_embedded_once_for_all_candidates(self, stub_embedder):
+        job = JobFactory()
+        candidates = CandidateFactory.create_batch(3)
+        for candidate in candidates:
+            result = tasks.score_candidate_for_job(candidate.id, job.id)
+            assert 'score' in result
+        # 3 candidate texts + 1 job text
+        assert stub_embedder.texts_embedded == 4
+        assert Embedding.objects.count() == 4
+
+    def test_rescoring_hits_cache(self, stub_embedder):
+        app = ApplicationFactory()
+        tasks.score_candidate_for_job(app.candidate_id, app.job_id)
+        tasks.score_candidate_for_job(app.candidate_id, app.job_id)
+        assert stub_embedder.texts_embedded == 2
+
+    def test_database_tier_survives_lru_eviction(self, stub_embedder):
+        app = ApplicationFactory()
+        first = tasks.score_candidate_for_job(app.candidate_id, app.job_id)
+        embeddings._lru.clear()
+        second = tasks.score_candidate_for_job(app.candidate_id, app.job_id)
+        assert stub_embedder.texts_embedded == 2
+        assert first['score'] == second['score']
+
+    def test_vectors_stored_as_float32(self, stub_embedder):
+        store = embeddings.EmbeddingStore('stub', stub_embedder)
+        vector = store.get('hello')
+        row = Embedding.objects.get(model='stub')
+        assert row.dimensions == 3
+        assert len(bytes(row.vector)) == 3 * 4
+        stored = embeddings.unpack(row.vector)
+        assert stored.dtype == np.float32
+        assert np.array_equal(stored, vector)
+        assert np.linalg.norm(stored) == pytest.approx(1.0)
+
+    def test_lru_evicts_oldest(self):
+        lru = embeddings.LRUCache(maxsize=2)
+        lru.put(('m', 'a'), 1)
+        lru.put(('m', 'b'), 2)
+        lru.get(('m', 'a'))
+        lru.put(('m', 'c'), 3)
+        assert lru.get(('m', 'b')) is None
+        assert lru.get(('m', 'a')) == 1
+
+
+@pytest.mark.django_db
+class TestBatchScoring:
+    def test_scores_all_applicants(self, stub_embedder):
+        job = JobFactory()
+        apps = ApplicationFactory.create_batch(5, job=job)
+        ApplicationFactory()  # other job, not scored
+
+        result = tasks.score_job_applicants(job.id, chunk_size=2)
+        assert result['scored'] == 5
+
+        # Same scores as the single-pair task, which reuses the cached vectors
+        for app in apps:
+            batch_score = CandidateScore.objects.get(candidate=app.candidate, job=job).score
+            single = tasks.score_candidate_for_job(app.candidate_id, job.id)
+            assert batch_score == pytest.approx(single['score'], abs=0.01)
+
+    def test_rescoring_upserts_rows(self, stub_embedder):
+        job = JobFactory()
+        apps = ApplicationFactory.create_batch(3, job=job)
+        tasks.score_job_applicants(job.id)
+        CandidateScore.objects.update(score=0)
+        tasks.score_job_applicants(job.id)
+        tasks.score_candidate_for_job(apps[0].candidate_id, job.id)
+        assert CandidateScore.objects.filter(job=job, model='stub').count() == 3
+        assert not CandidateScore.objects.filter(score=0).exists()
+        apps[0].candidate.refresh_from_db()
+        assert apps[0].candidate.metadata == {}
+
+    def test_embeddings_requested_in_batches(self, stub_embedder):
+        job = JobFactory()
+        ApplicationFactory.create_batch(5, job=job)
+        tasks.score_job_applicants(job.id, chunk_size=2)
+        # job text, then one call per chunk of candidates
+        assert [len(batch) for batch in stub_embedder.calls] == [1, 2, 2, 1]
+
+    def test_query_count_bounded_by_chunks(self, stub_embedder, django_assert_max_num_queries):
+        job = JobFactory()
+        ApplicationFactory.create_batch(6, job=job)
+        tasks.score_job_applicants(job.id, chunk_size=3)  # warm the embedding cache
+        with django_assert_max_num_queries(6):
+            tasks.score_job_applicants(job.id, chunk_size=3)
+
+    def test_missing_job(self, stub_embedder):
+        assert 'error' in tasks.score_job_applicants(999999)
+
+
+@pytest.fixture
+def embeddings_settings(settings):
+    """Apply EMBEDDINGS overrides to the cached provider factories."""
+    factories = (providers.get_provider, providers.get_fallback_provider)
+
+    def configure(**overrides):
+        settings.EMBEDDINGS = {**settings.EMBEDDINGS, **overrides}
+        for factory in factories:
+            factory.cache_clear()
+
+    embeddings._lru.clear()
+    yield configure
+    for factory in factories:
+        factory.cache_clear()
+
+
+class RateLimitedProvider(providers.EmbeddingProvider):
+    name = 'limited'
+
+    def embed_batch(self, texts):
+        raise providers.RateLimitedError('429 Too Many Requests')
+
+
+class TestProviders:
+    def test_hashing_is_deterministic_and_lexical(self):
+        provider = providers.HashingProvider(dimensions=256)
+        a, b, c = provider.embed([
+            'Senior Python developer, Django', 'Python Django engineer', 'Registered nurse, night shifts',
+        ])
+        assert provider.embed(['Senior Python developer, Django'])[0].tolist() == a.tolist()
+        assert a.shape == (256,) and a.dtype == np.float32
+        assert similarity.cosine(a, b) > similarity.cosine(a, c)
+
+    def test_batches_keep_order_under_concurrency(self):
+        provider = providers.HashingProvider(dimensions=64, batch_size=2, max_concurrency=3)
+        texts = [f'text {i}' for i in range(7)]
+        assert np.array_equal(provider.embed(texts), providers.HashingProvider(dimensions=64).embed(texts))
+
+    def test_unknown_backend(self):
+        with pytest.raises(providers.ProviderError):
+            providers.build_provider('word2vec')
+
+    def test_registry_builds_from_config(self, monkeypatch):
+        local = providers.build_provider('local', {'LOCAL_DIMENSIONS': 32, 'BATCH_SIZE': 8, 'MAX_CONCURRENCY': 3})
+        assert (local.name, local.batch_size, local.max_concurrency) == ('local-hash-32', 8, 3)
+        monkeypatch.setitem(providers.PROVIDERS, 'limited', RateLimitedProvider)
+        assert isinstance(providers.build_provider('limited'), RateLimitedProvider)
+
+    def test_embed_batch_is_abstract(self):
+        class Incomplete(providers.EmbeddingProvider):
+            name = 'incomplete'
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_missing_api_key(self):
+        with pytest.raises(providers.ProviderError):
+            providers.build_provider('openai', {'API_KEY': None}).embed(['hello'])
+
+
+@pytest.mark.django_db
+class TestProviderSelection:
+    def test_local_provider_runs_pipeline_offline(self, embeddings_settings):
+        embeddings_settings(PROVIDER='local', LOCAL_DIMENSIONS=128)
+        job = JobFactory()
+        ApplicationFactory.create_batch(3, job=job)
+        result = tasks.score_job_applicants(job.id)
+        assert result == {'job_id': job.id, 'model': 'local-hash-128', 'scored': 3}
+        assert Embedding.objects.filter(model='local-hash-128', dimensions=128).count() == 4
+
+    def test_falls_back_when_rate_limited(self, embeddings_settings, monkeypatch):
+        embeddings_settings(FALLBACK='local')
+        monkeypatch.setattr(providers, 'get_provider', RateLimitedProvider)
+        app = ApplicationFactory()
+        result = tasks.score_candidate_for_job(app.candidate_id, app.job_id)
+        assert result['model'] == 'local-hash-512'
+        assert not Embedding.objects.filter(model='limited').exists()
+
+    def test_rate_limit_without_fallback_is_retried(self, embeddings_settings, monkeypatch):
+        embeddings_settings(FALLBACK=None)
+        monkeypatch.setattr(providers, 'get_provider', RateLimitedProvider)
+        app = ApplicationFactory()
+        with pytest.raises(providers.RateLimitedError):
+            tasks.score_job_applicants(app.job_id)
+
+    def test_unconfigured_provider_reports_error(self, embeddings_settings):
+        embeddings_settings(PROVIDER='openai', API_KEY=None)
+        app = ApplicationFactory()
+        assert 'OPENAI_API_KEY' in tasks.score_candidate_for_job(app.candidate_id, app.job_id)['error']
+
+
+def _legacy_cosine(a, b):
+    import math
+    dot = sum(x * y for x, y in zip(a, b, strict=True))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+class TestSimilarity:
+    def setup_method(self):
+        rng = np.random.default_rng(42)
+        self.query = rng.standard_normal(16)
+        self.matrix = rng.standard_normal((10, 16))
+
+    def test_one_to_many_matches_legacy(self):
+        scores = similarity.one_to_many(self.query, self.matrix, normalized=False)
+        expected = [_legacy_cosine(row, self.query) for row in self.matrix]
+        assert scores.dtype == np.float32
+        assert scores == pytest.approx(expected, abs=1e-5)
+
+    def test_prenormalized_is_dot_product(self):
+        query = similarity.normalize(self.query)[0]
+        matrix = similarity.normalize(self.matrix)
+        assert similarity.one_to_many(query, matrix) == pytest.approx(
+            similarity.one_to_many(self.query, self.matrix, normalized=False), abs=1e-6,
+        )
+
+    def test_many_to_many_chunked_equals_whole(self):
+        a = similarity.normalize(self.matrix[:7])
+        b = similarity.normalize(self.matrix)
+        whole = similarity.many_to_many(a, b)
+        chunked = similarity.many_to_many(a, b, chunk_size=3)
+        assert whole.shape == (7, 10)
+        assert np.allclose(whole, chunked)
+
+    def test_zero_vector_scores_zero(self):
+        assert similarity.cosine([0, 0, 0], [1, 2, 3]) == 0.0
+        assert not similarity.normalize([[0.0, 0.0]]).any()
+
+    def test_top_k(self):
+        indices, values = similarity.top_k(np.array([0.1, 0.9, 0.5, 0.7]), 2)
+        assert indices.tolist() == [1, 3]
+        assert values.tolist() == pytest.approx([0.9, 0.7])
+
+
+@pytest.mark.django_db
+class TestScoreMigration:
+    def test_metadata_scores_move_to_table(self):
+        import importlib
+
+        from django.apps import apps as registry
+        migration = importlib.import_module('candidates.migrations.0007_move_metadata_scores')
+
+        job = JobFactory()
+        candidate = CandidateFactory(metadata={
+            f'ai_score_job_{job.id}': {'score': 81.5, 'model': 'text-embedding-3-small', 'job_id': job.id},
+            'ai_score_job_999999': {'score': 10.0, 'model': 'text-embedding-3-small'},  # job deleted
+            'ai_score_job_abc': {'score': 50.0},  # malformed, kept
+            f'ai_score_job_{job.id + 1}x': 'free text',  # malformed, kept
+            'source': 'referral',
+        })
+        other = CandidateFactory(metadata={f'ai_score_job_{job.id}': {'score': 'high'}})
+        listed = CandidateFactory(metadata=['ai_score_job_1'])
+        migration.metadata_to_table(registry, None)
+
+        candidate.refresh_from_db()
+        assert candidate.metadata == {
+            'ai_score_job_abc': {'score': 50.0}, f'ai_score_job_{job.id + 1}x': 'free text', 'source': 'referral',
+        }
+        other.refresh_from_db()
+        listed.refresh_from_db()
+        assert other.metadata == {} and listed.metadata == ['ai_score_job_1']
+        row = CandidateScore.objects.get()
+        assert (row.candidate_id, row.job_id, row.model, row.score) == (
+            candidate.id, job.id, 'text-embedding-3-small', 81.5,
+        )
+
+        migration.table_to_metadata(registry, None)
+        candidate.refresh_from_db()
+        assert candidate.metadata[f'ai_score_job_{job.id}']['score'] == 81.5
@@ -0,0 +1,128 @@
+"""Tests for the candidate full-text search index."""
+import pytest
+
+from candidates import search
+from candidates.models import Candidate
+
+from .factories import CandidateFactory, CompanyFactory
+
+
+def _ids(matches):
+    return [match.candidate_id for match in matches]
+
+
+@pytest.fixture
+def people(db):
+    return {
+        'ada': CandidateFactory(first_name='Ada', last_name='Lovelace', email='ada@analytical.org'),
+        'alan': CandidateFactory(first_name='Alan', last_name='Turing', email='alan.turing@bletchley.uk'),
+        'grace': CandidateFactory(first_name='Grace', last_name='Hopper', email='ghopper@navy.mil'),
+    }
+
+
+@pytest.mark.django_db
+class TestSearchService:
+    def test_prefix_of_any_word(self, people):
+        assert _ids(search.search('lov')) == [people['ada'].id]
+        assert _ids(search.search('TURING')) == [people['alan'].id]
+        assert set(_ids(search.search('a'))) == {people['ada'].id, people['alan'].id}
+
+    def test_every_word_must_match(self, people):
+        assert _ids(search.search('ada love')) == [people['ada'].id]
+        assert search.search('ada turing', fuzzy=False) == []
+
+    def test_email_words(self, people):
+        assert _ids(search.search('bletchley')) == [people['alan'].id]
+        assert _ids(search.search('ghopper@navy')) == [people['grace'].id]
+
+    def test_query_syntax_is_not_interpreted(self, people):
+        assert search.search('"ada" OR NOT *', fuzzy=False) == []
+        assert search.search('  --  ') == []
+
+    def test_name_ranks_above_email(self, db):
+        by_name = CandidateFactory(first_name='Navy', last_name='Seal', email='seal@example.com')
+        by_email = CandidateFactory(first_name='Grace', last_name='Hopper', email='ghopper@navy.mil')
+        assert _ids(search.search('navy')) == [by_name.id, by_email.id]
+
+    def test_fuzzy_matches_typos(self, people):
+        matches = search.search('lovelase')
+        assert _ids(matches) == [people['ada'].id]
+        assert matches[0].fuzzy
+        assert search.search('lovelase', fuzzy=False) == []
+        assert search.search('zzyzx') == []
+
+    def test_fuzzy_fills_after_prefix_matches(self, db):
+        exact = CandidateFactory(first_name='Grace', last_name='Hopper')
+        typo = CandidateFactory(first_name='Grace', last_name='Hoper')
+        matches = search.search('hopper')
+        assert _ids(matches) == [exact.id, typo.id]
+        assert [match.fuzzy for match in matches] == [False, True]
+
+    def test_limit(self, db):
+        CandidateFactory.create_batch(5, first_name='Sam')
+        assert len(search.search('sam', limit=3)) == 3
+
+    def test_index_follows_writes(self, people):
+        Candidate.objects.filter(pk=people['ada'].pk).update(last_name='Byron')
+        assert search.search('lovelace') == []
+        assert _ids(search.search('byron')) == [people['ada'].id]
+
+        people['alan'].delete()
+        assert search.search('turing') == []
+
+        Candidate.objects.bulk_create([Candidate(first_name='Edsger', last_name='Dijkstra', email='ewd@example.com')])
+        assert len(search.search('dijk')) == 1
+
+    def test_company_scope(self, db):
+        company, other = CompanyFactory(), CompanyFactory()
+        own = CandidateFactory(first_name='Linus', company=company)
+        CandidateFactory(first_name='Linus', company=other)
+        assert _ids(search.search('linus', company=company)) == [own.id]
+        assert len(search.search('linus')) == 2
+
+    def test_filter_candidates(self, people):
+        queryset = search.filter_candidates(Candidate.objects.all(), 'grace hop')
+        assert list(queryset) == [people['grace']]
+        assert search.filter_candidates(Candidate.objects.all(), '').count() == 3
+
+
+@pytest.mark.django_db
+class TestPostgresSearch:
+    """The tsvector/pg_trgm queries; the rest of the suite runs them only on PostgreSQL CI."""
+
+    @pytest.fixture(autouse=True)
+    def postgres_only(self):
+        from django.db import connection
+        if connection.vendor != 'postgresql':
+            pytest.skip('PostgreSQL full-text search')
+
+    def test_ranked(self, people):
+        matches = search.PostgresSearch().ranked(['lov'], None, 10)
+        assert _ids(matches) == [people['ada'].id]
+        company = CompanyFactory()
+        assert search.PostgresSearch().ranked(['lov'], company.id, 10) == []
+
+    def test_fuzzy(self, people):
+        assert _ids(search.PostgresSearch().fuzzy(['lovelase'], None, 10)) == [people['ada'].id]
+
+
+@pytest.mark.django_db
+class TestSearchEndpoints:
+    def test_ranked_search(self, auth_client, people):
+        client, user = auth_client
+        response = client.get('/api/candidates/search/', {'q': 'lovelase'})
+        assert response.status_code == 200
+        [result] = response.data['results']
+        assert result['fuzzy'] is True
+        assert result['candidate']['id'] == people['ada'].id
+
+    def test_ranked_search_validation(self, auth_client):
+        client, user = auth_client
+        assert client.get('/api/candidates/search/').status_code == 400
+        assert client.get('/api/candidates/search/', {'q': 'ada', 'limit': 'x'}).status_code == 400
+
+    def test_list_filters_use_index(self, auth_client, people):
+        client, user = auth_client
+        for params in ({'q': 'hop'}, {'search': 'navy'}):
+            response = client.get('/api/candidates/', params)
+            assert [row['id'] for row in response.data['results']] == [people['grace'].id]
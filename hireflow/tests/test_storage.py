@@ -0,0 +1,142 @@
+"""Tests for content-addressed resume storage and blob garbage collection."""
+import hashlib
+import io
+import os
+import time
+
+import pytest
+from django.core.files import File
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from candidates import resumes, storage, tasks
+from candidates.models import Candidate, ResumeBlob, ResumeText
+
+from .factories import CandidateFactory
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _stored_files(root):
+    return sorted(
+        os.path.relpath(os.path.join(dirpath, name), root)
+        for dirpath, _, names in os.walk(root / 'resumes') for name in names
+    )
+
+
+class _ReadSizes(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.sizes = []
+
+    def read(self, size=-1):
+        self.sizes.append(size)
+        return super().read(size)
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _candidate(data, name='cv.pdf'):
+    return CandidateFactory(resume=SimpleUploadedFile(name, data))
+
+
+@pytest.mark.django_db
+class TestContentAddressedStorage:
+    def test_named_by_content(self, media):
+        candidate = _candidate(b'resume bytes', name='My CV.PDF')
+        sha = _sha(b'resume bytes')
+        assert candidate.resume.name == f'resumes/{sha[:2]}/{sha}.pdf'
+        assert storage.sha256_of(candidate.resume.name) == sha
+        assert (media / candidate.resume.name).read_bytes() == b'resume bytes'
+        assert ResumeBlob.objects.get(name=candidate.resume.name).ref_count == 1
+
+    def test_duplicates_share_one_file(self, media):
+        first, second = _candidate(b'same'), _candidate(b'same', name='copy.pdf')
+        assert first.resume.name == second.resume.name
+        assert _stored_files(media) == [first.resume.name]
+        assert ResumeBlob.objects.get().ref_count == 2
+
+    def test_upload_is_streamed_in_chunks(self, media):
+        stream = _ReadSizes(os.urandom(3 * storage.CHUNK_SIZE + 10))
+        name = storage.resume_storage().save('resumes/big.bin', File(stream))
+        assert max(stream.sizes) == storage.CHUNK_SIZE
+        assert name.endswith(f'{_sha(stream.getvalue())}.bin')
+        assert not os.listdir(media / storage.TMP_DIR)
+
+    def test_replace_and_delete_release_references(self, media):
+        candidate = _candidate(b'v1')
+        old_name = candidate.resume.name
+        candidate.resume = SimpleUploadedFile('cv.pdf', b'v2')
+        candidate.save()
+        old = ResumeBlob.objects.get(name=old_name)
+        assert old.ref_count == 0 and old.released_at is not None
+        assert ResumeBlob.objects.get(name=candidate.resume.name).ref_count == 1
+
+        Candidate.objects.get(pk=candidate.pk).save(update_fields=['first_name'])
+        assert ResumeBlob.objects.get(name=candidate.resume.name).ref_count == 1
+        candidate.delete()
+        assert ResumeBlob.objects.get(name=candidate.resume.name).ref_count == 0
+
+    def test_bulk_delete_releases_references(self, media, auth_client):
+        client, user = auth_client
+        candidates = [_candidate(b'shared'), _candidate(b'shared'), _candidate(b'own')]
+        response = client.post('/api/candidates/bulk-delete/', {'ids': [c.id for c in candidates[:2]]}, format='json')
+        assert response.data['deleted'] == 2
+        assert ResumeBlob.objects.get(name=candidates[0].resume.name).ref_count == 0
+        assert ResumeBlob.objects.get(name=candidates[2].resume.name).ref_count == 1
+
+    def test_extraction_takes_hash_from_name(self, media, monkeypatch):
+        candidate = _candidate(b'Python developer', name='cv.txt')
+        monkeypatch.setattr(resumes, 'file_hash', lambda file: pytest.fail('file was hashed'))
+        tasks.extract_resume_text(candidate.id)
+        assert Candidate.objects.get(pk=candidate.id).resume_hash == _sha(b'Python developer')
+
+
+@pytest.mark.django_db
+class TestGarbageCollection:
+    def test_collects_after_grace_period(self, media):
+        kept = _candidate(b'kept')
+        gone = [_candidate(b'gone 1'), _candidate(b'gone 2', name='cv.txt')]
+        tasks.extract_resume_text(gone[1].id)
+        Candidate.objects.filter(pk__in=[c.pk for c in gone]).delete()
+
+        assert storage.collect_garbage(grace=3600)['deleted'] == 0
+        stats = storage.collect_garbage(grace=0, batch_size=1)
+        assert stats['deleted'] == 2 and stats['batches'] == 2
+        assert stats['freed_bytes'] == len(b'gone 1') + len(b'gone 2')
+        assert _stored_files(media) == [kept.resume.name]
+        assert list(ResumeBlob.objects.values_list('name', flat=True)) == [kept.resume.name]
+        assert not ResumeText.objects.exists()
+
+    def test_drifted_count_is_repaired_not_collected(self, media):
+        candidate = _candidate(b'resume')
+        # queryset.update() sends no signals
+        Candidate.objects.filter(pk=candidate.pk).update(resume='')
+        other = CandidateFactory()
+        storage.release([candidate.resume.name])
+        Candidate.objects.filter(pk=other.pk).update(resume=candidate.resume.name)
+
+        stats = storage.collect_garbage(grace=0)
+        assert stats == {'deleted': 0, 'repaired': 1, 'freed_bytes': 0, 'batches': 1}
+        assert ResumeBlob.objects.get().ref_count == 1
+        assert _stored_files(media) == [candidate.resume.name]
+
+    def test_sweep_removes_files_without_blob(self, media):
+        candidate = _candidate(b'tracked')
+        orphan = storage.resume_storage().save('resumes/orphan.pdf', File(io.BytesIO(b'orphan')))
+        ResumeBlob.objects.filter(name=orphan).delete()
+        stale_tmp = media / storage.TMP_DIR / 'tmp123'
+        stale_tmp.write_bytes(b'partial')
+        an_hour_ago = time.time() - 3600
+        for path in (media / orphan, stale_tmp):
+            os.utime(path, (an_hour_ago, an_hour_ago))
+
+        assert storage.sweep_orphans(grace=7200) == 0
+        assert storage.sweep_orphans(grace=60) == 2
+        assert _stored_files(media) == [candidate.resume.name]
+        assert not stale_tmp.exists()
@@ -0,0 +1,217 @@
+"""Tests for cached tenant resolution and the company JWT claim."""
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from candidates.models import Candidate
+from tenants import resolution
+from tenants.middleware import TenantMiddleware
+
+from .factories import (
+    ApplicationFactory,
+    CandidateFactory,
+    CompanyFactory,
+    JobFactory,
+    MembershipFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture
+def membership(db):
+    cache.clear()
+    return MembershipFactory()
+
+
+def _resolve(user=None, token=None):
+    request = RequestFactory().get('/', **({'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}))
+    request.user = user or AnonymousUser()
+    TenantMiddleware(lambda request: None)(request)
+    return request.company
+
+
+def _access_token(client, user):
+    response = client.post('/api/auth/token/', {'username': user.username, 'password': 'testpass123'})
+    assert response.status_code == 200
+    return response.data
+
+
+@pytest.mark.django_db
+class TestResolution:
+    def test_cached_after_first_lookup(self, membership, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            assert _resolve(membership.user) == membership.company
+        with django_assert_num_queries(0):
+            assert _resolve(membership.user) == membership.company
+
+    def test_shared_tier_serves_a_fresh_process(self, membership, django_assert_num_queries):
+        _resolve(membership.user)
+        resolution.clear_local()
+        with django_assert_num_queries(0):
+            assert _resolve(membership.user) == membership.company
+
+    def test_user_without_membership_is_cached(self, django_assert_num_queries):
+        cache.clear()
+        user = UserFactory()
+        with django_assert_num_queries(1):
+            assert _resolve(user) is None
+        with django_assert_num_queries(0):
+            assert _resolve(user) is None
+
+    def test_anonymous(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert _resolve() is None
+
+    def test_local_tier_is_bounded(self, settings, monkeypatch):
+        settings.TENANT_CACHE = {'LOCAL_MAX_ENTRIES': 2, 'LOCAL_TTL': 5}
+        clock = [100.0]
+        monkeypatch.setattr(resolution.time, 'monotonic', lambda: clock[0])
+        for user_id in (1, 2, 3):
+            resolution._cached(f'test:{user_id}', lambda user_id=user_id: user_id)
+        resolution._cached('test:2', lambda: 0)  # refreshes 2
+        resolution._cached('test:4', lambda: 4)
+        assert list(resolution._local) == ['test:2', 'test:4']
+
+        clock[0] += 10
+        assert resolution._cached('test:2', lambda: 'reloaded') == 2  # shared tier
+        cache.delete_many(['test:1', 'test:2', 'test:3', 'test:4'])
+        assert list(resolution._local) == ['test:4', 'test:2']
+
+    def test_membership_change_invalidates(self, membership):
+        _resolve(membership.user)
+        other = CompanyFactory()
+        membership.company = other
+        membership.save()
+        assert _resolve(membership.user) == other
+        membership.delete()
+        assert _resolve(membership.user) is None
+
+    def test_company_deactivation_invalidates(self, membership):
+        assert _resolve(membership.user).is_active
+        membership.company.is_active = False
+        membership.company.save()
+        assert not _resolve(membership.user).is_active
+
+
+@pytest.mark.django_db
+class TestCompanyClaim:
+    def test_token_carries_company(self, api_client, membership):
+        tokens = _access_token(api_client, membership.user)
+        assert AccessToken(tokens['access'])['company_id'] == membership.company_id
+
+    def test_token_skips_membership_lookup(self, api_client, membership, django_assert_num_queries):
+        access = _access_token(api_client, membership.user)['access']
+        cache.clear()
+        resolution.clear_local()
+        with django_assert_num_queries(1):  # the company row only
+            assert _resolve(token=access) == membership.company
+
+    def test_refresh_picks_up_new_company(self, api_client, membership):
+        refresh = _access_token(api_client, membership.user)['refresh']
+        other = CompanyFactory()
+        membership.company = other
+        membership.save()
+        response = api_client.post('/api/auth/token/refresh/', {'refresh': refresh})
+        assert AccessToken(response.data['access'])['company_id'] == other.pk
+
+    def test_user_without_company_gets_null_claim(self, api_client):
+        cache.clear()
+        access = _access_token(api_client, UserFactory())['access']
+        assert AccessToken(access)['company_id'] is None
+        assert _resolve(token=access) is None
+
+    def test_invalid_token_is_ignored(self):
+        assert _resolve(token='not-a-token') is None
+
+
+@pytest.fixture
+def tenant_client(membership):
+    """API client logged in with a JWT of a member of ``membership.company``."""
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {_access_token(client, membership.user)['access']}")
+    return client, membership.company
+
+
+@pytest.fixture
+def other_tenant(db):
+    company = CompanyFactory()
+    job = JobFactory(company=company)
+    application = ApplicationFactory(job=job, candidate=CandidateFactory(company=company))
+    return company, application
+
+
+def _ids(response):
+    assert response.status_code == 200, response.data
+    return {row['id'] for row in response.data['results']}
+
+
+@pytest.mark.django_db
+class TestTenantScoping:
+    def test_lists_only_show_own_company(self, tenant_client, other_tenant):
+        client, company = tenant_client
+        job = JobFactory(company=company)
+        application = ApplicationFactory(job=job, candidate=CandidateFactory(company=company))
+        assert _ids(client.get('/api/jobs/')) == {job.id}
+        assert _ids(client.get('/api/candidates/')) == {application.candidate_id}
+        assert _ids(client.get('/api/applications/')) == {application.id}
+
+    def test_other_company_objects_are_not_found(self, tenant_client, other_tenant):
+        client, company = tenant_client
+        _, application = other_tenant
+        assert client.get(f'/api/applications/{application.id}/').status_code == 404
+        assert client.get(f'/api/candidates/{application.candidate_id}/').status_code == 404
+        response = client.post('/api/candidates/bulk-delete/', {'ids': [application.candidate_id]}, format='json')
+        assert response.status_code == 200
+        assert Candidate.objects.filter(pk=application.candidate_id).exists()
+
+    def test_created_objects_belong_to_company(self, tenant_client):
+        client, company = tenant_client
+        data = {
+            'title': 'Dev', 'description': 'x', 'location': 'Remote',
+            'posted_by': company.memberships.get().user_id,
+        }
+        response = client.post('/api/jobs/', data)
+        assert response.status_code == 201
+        assert response.data['company'] == company.pk
+
+    def test_analytics_are_scoped(self, tenant_client, other_tenant):
+        client, company = tenant_client
+        CandidateFactory(company=company)
+        assert client.get('/api/analytics/candidates/').data['total_candidates'] == 1
+
+    def test_availability_only_for_own_members(self, tenant_client, other_tenant):
+        client, company = tenant_client
+        own = company.memberships.get().user_id
+        outsider = MembershipFactory(company=other_tenant[0]).user_id
+        assert client.get(f'/api/interviews/availability/?interviewers={own}').status_code == 200
+        response = client.get(f'/api/interviews/availability/?interviewers={own},{outsider}')
+        assert response.status_code == 400
+        assert response.data['interviewers'] == [f'Unknown interviewers: [{outsider}]']
+
+    def test_writes_cannot_reference_other_company(self, tenant_client, other_tenant):
+        client, company = tenant_client
+        other_company, other_application = other_tenant
+        job = JobFactory(company=company)
+        candidate = CandidateFactory(company=company)
+        interviewer = company.memberships.get().user_id
+        slot = {'interviewer': interviewer, 'scheduled_at': '2030-01-07T10:00:00Z'}
+
+        response = client.post('/api/applications/', {'candidate': candidate.id, 'job': other_application.job_id})
+        assert response.status_code == 400 and 'job' in response.data
+        response = client.post('/api/applications/', {'candidate': other_application.candidate_id, 'job': job.id})
+        assert response.status_code == 400 and 'candidate' in response.data
+        response = client.post('/api/interviews/', {**slot, 'application': other_application.id})
+        assert response.status_code == 400 and 'application' in response.data
+        response = client.post(
+            '/api/interviews/bulk/', [{**slot, 'application': other_application.id}], format='json',
+        )
+        assert response.status_code == 400
+        response = client.patch(f'/api/candidates/{candidate.id}/', {'company': other_company.id})
+        assert response.status_code == 400 and 'company' in response.data
+
+        own = ApplicationFactory(job=job, candidate=candidate)
+        response = client.post('/api/interviews/', {**slot, 'application': own.id})
+        assert response.status_code == 201, response.data